@@ -0,0 +1,128 @@
+"""Background thread for wallet encryption and decryption."""
+
+from functools import lru_cache
+from typing import Optional
+
+from PyQt6.QtWidgets import QProgressDialog
+from PyQt6.QtCore import Qt, pyqtSignal, QCoreApplication, QThread
+
+from plm_wallet.crypto.encryption import WalletEncryption, KeySession
+from plm_wallet.crypto.exceptions import InvalidPasswordError
+
+# Unlock time targeted by the KDF of newly encrypted wallets
+KDF_TARGET_MS = 500
+
+
+@lru_cache(maxsize=1)
+def calibrated_kdf() -> dict:
+    """KDF parameters calibrated for this host, measured once per run."""
+    return WalletEncryption.calibrate(KDF_TARGET_MS)
+
+
+class WalletEncryptionThread(QThread):
+    """
+    Thread for running WalletEncryption without blocking the UI.
+
+    The key derivation is a single OpenSSL scrypt or PBKDF2 call, whichever
+    the file's KDF header names (new files use calibrated_kdf(), scrypt
+    tuned to about KDF_TARGET_MS here). It releases the GIL, so the event
+    loop keeps running, but it cannot report partial progress or be
+    interrupted. The progress dialog therefore shows a busy bar, and
+    cancelling closes it at once and drops the result when the call returns.
+    """
+
+    completed = pyqtSignal(dict)
+    invalid_password = pyqtSignal()
+    error = pyqtSignal(str)
+
+    # Worker-side result, re-emitted from the UI thread unless cancelled
+    _result = pyqtSignal(str, object)
+
+    def __init__(self, mode: str, data: dict, password: str, parent,
+                 session: Optional[KeySession] = None, file_path: Optional[str] = None):
+        """
+        Initialize thread.
+
+        Args:
+            mode: 'encrypt' or 'decrypt'
+            data: Wallet data to encrypt, or encrypted wallet to decrypt
+            password: Wallet password
+            parent: Parent widget (owns the thread until it finishes)
+            session: Key session caching derived keys, if any
+            file_path: Wallet file being written or read (with session)
+        """
+        super().__init__(parent)
+        self.mode = mode
+        self.data = data
+        self.password = password
+        self.session = session
+        self.file_path = file_path
+        self.cancelled = False
+        self.progress_dialog = None
+        self._result.connect(self._deliver)
+        self.finished.connect(self._release)
+        # A key derivation cannot be interrupted; let it end before the app exits
+        QCoreApplication.instance().aboutToQuit.connect(self.wait)
+
+    def start_with_progress(self, label: str):
+        """
+        Start the thread behind a window-modal progress dialog.
+
+        Args:
+            label: Text shown in the dialog
+        """
+        self.progress_dialog = QProgressDialog(label, "Cancel", 0, 0, self.parent())
+        self.progress_dialog.setWindowTitle("Please Wait")
+        self.progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.progress_dialog.setMinimumDuration(0)
+        self.progress_dialog.canceled.connect(self.cancel)
+        self.start()
+        self.progress_dialog.show()
+
+    def cancel(self):
+        """Stop waiting for the result; it is discarded when the thread ends."""
+        self.cancelled = True
+        self._close_progress()
+
+    def run(self):
+        """Encrypt or decrypt in background thread."""
+        try:
+            if self.mode == 'encrypt':
+                result = WalletEncryption.encrypt_wallet(self.data, self.password,
+                                                         self.session, self.file_path,
+                                                         calibrated_kdf())
+            else:
+                result = WalletEncryption.decrypt_wallet(self.data, self.password,
+                                                         self.session, self.file_path)
+            self._result.emit('completed', result)
+        except InvalidPasswordError:
+            self._result.emit('invalid_password', None)
+        except Exception as e:
+            self._result.emit('error', str(e))
+        finally:
+            self.password = None
+
+    def _deliver(self, kind: str, value):
+        """Forward the worker's result from the UI thread."""
+        if self.cancelled:
+            return
+        self._close_progress()
+        if kind == 'completed':
+            self.completed.emit(value)
+        elif kind == 'invalid_password':
+            self.invalid_password.emit()
+        else:
+            self.error.emit(value)
+
+    def _release(self):
+        """Drop the exit hook and delete the finished thread."""
+        QCoreApplication.instance().aboutToQuit.disconnect(self.wait)
+        self.deleteLater()
+
+    def _close_progress(self):
+        """Close the progress dialog without reporting a cancel."""
+        if self.progress_dialog is not None:
+            self.progress_dialog.canceled.disconnect(self.cancel)
+            self.progress_dialog.close()
+            self.progress_dialog.deleteLater()
+            self.progress_dialog = None
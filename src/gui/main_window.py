@@ -9,6 +9,7 @@ from pathlib import Path
 from .wallet_generator_widget import WalletGeneratorWidget
 from .wallet_display_widget import WalletDisplayWidget
 from .wallet_loader_widget import WalletLoaderWidget
+from plm_wallet.crypto.encryption import KeySession
 
 
 class MainWindow(QMainWindow):
@@ -16,6 +17,8 @@ class MainWindow(QMainWindow):
 
     def __init__(self):
         super().__init__()
+        # Derived wallet keys, so opening and re-saving a wallet runs the KDF once
+        self.key_session = KeySession()
         self.init_ui()
 
     def init_ui(self):
@@ -45,11 +48,11 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.generator_widget, "Generate Wallet")
 
         # Loader tab
-        self.loader_widget = WalletLoaderWidget()
+        self.loader_widget = WalletLoaderWidget(self.key_session)
         self.tabs.addTab(self.loader_widget, "Open Wallet")
 
         # Display tab
-        self.display_widget = WalletDisplayWidget()
+        self.display_widget = WalletDisplayWidget(self.key_session)
         self.tabs.addTab(self.display_widget, "Wallet Details")
 
         # Connect signals
@@ -83,3 +86,8 @@ class MainWindow(QMainWindow):
     def on_wallet_saved(self):
         """Handle wallet save event to refresh the loader list."""
         self.loader_widget.load_wallet_list()
+
+    def closeEvent(self, event):
+        """Wipe cached wallet keys when the window closes."""
+        self.key_session.close()
+        super().closeEvent(event)
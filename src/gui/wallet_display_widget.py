@@ -10,10 +10,11 @@ from PyQt6.QtGui import QFont, QClipboard
 from PyQt6.QtWidgets import QApplication
 import json
 from pathlib import Path
+from typing import Optional
 
 from .password_dialog import PasswordDialog
-from plm_wallet.crypto.encryption import WalletEncryption
-from plm_wallet.crypto.exceptions import EncryptionError
+from .encryption_thread import WalletEncryptionThread
+from plm_wallet.crypto.encryption import KeySession
 from plm_wallet.config.constants import WALLETS_DIR
 
 
@@ -22,9 +23,16 @@ class WalletDisplayWidget(QWidget):
 
     wallet_saved = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, key_session: Optional[KeySession] = None):
+        """
+        Initialize widget.
+
+        Args:
+            key_session: Session caching derived wallet keys, shared with the loader widget
+        """
         super().__init__()
         self.wallet_data = None
+        self.key_session = key_session
         self.init_ui()
 
     def init_ui(self):
@@ -634,41 +642,62 @@ class WalletDisplayWidget(QWidget):
             if reply == QMessageBox.StandardButton.Cancel:
                 return
 
-            try:
-                data_to_save = self.wallet_data
-
-                # If user wants encryption, show password dialog
-                if reply == QMessageBox.StandardButton.Yes:
-                    password_dialog = PasswordDialog(self, mode='encrypt')
-                    if password_dialog.exec() == QDialog.DialogCode.Accepted:
-                        password = password_dialog.get_password()
-                        if password:
-                            # Encrypt the wallet data
-                            data_to_save = WalletEncryption.encrypt_wallet(self.wallet_data, password)
-                    else:
-                        # User cancelled the password dialog
-                        return
-
-                # Save to file
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data_to_save, f, indent=2)
-
-                # Set secure permissions on Unix/Linux
-                import os
-                import stat
-                if os.name != 'nt':
-                    os.chmod(file_path, stat.S_IRUSR | stat.S_IWUSR)
-
-                encryption_status = "encrypted " if reply == QMessageBox.StandardButton.Yes else ""
-                QMessageBox.information(
-                    self,
-                    "Success",
-                    f"Wallet {encryption_status}saved to:\n{file_path}"
-                )
-                self.wallet_saved.emit()  # Notify that wallet was saved
-
-            except EncryptionError as e:
-                QMessageBox.critical(self, "Encryption Error", f"Failed to encrypt wallet:\n{str(e)}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save wallet:\n{str(e)}")
+            # If user wants encryption, show password dialog
+            if reply == QMessageBox.StandardButton.Yes:
+                password_dialog = PasswordDialog(self, mode='encrypt')
+                if password_dialog.exec() != QDialog.DialogCode.Accepted:
+                    # User cancelled the password dialog
+                    return
+                password = password_dialog.get_password()
+                if password:
+                    # Encrypt in a background thread, then write the result
+                    thread = WalletEncryptionThread('encrypt', self.wallet_data, password, self,
+                                                    self.key_session, file_path)
+                    thread.completed.connect(
+                        lambda encrypted: self.write_wallet_file(file_path, encrypted, True)
+                    )
+                    thread.error.connect(self.on_encryption_error)
+                    thread.start_with_progress("Encrypting wallet...")
+                    return
+
+            self.write_wallet_file(file_path, self.wallet_data, False)
+
+    def write_wallet_file(self, file_path: str, data_to_save: dict, encrypted: bool):
+        """
+        Write wallet data to a file readable only by the owner.
 
+        Args:
+            file_path: Destination path
+            data_to_save: Wallet dictionary, encrypted or not
+            encrypted: Whether data_to_save is encrypted
+        """
+        try:
+            # Save to file
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data_to_save, f, indent=2)
+
+            # Set secure permissions on Unix/Linux
+            import os
+            import stat
+            if os.name != 'nt':
+                os.chmod(file_path, stat.S_IRUSR | stat.S_IWUSR)
+
+            encryption_status = "encrypted " if encrypted else ""
+            QMessageBox.information(
+                self,
+                "Success",
+                f"Wallet {encryption_status}saved to:\n{file_path}"
+            )
+            self.wallet_saved.emit()  # Notify that wallet was saved
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save wallet:\n{str(e)}")
+
+    def on_encryption_error(self, error_msg: str):
+        """
+        Handle wallet encryption error.
+
+        Args:
+            error_msg: Error message
+        """
+        QMessageBox.critical(self, "Encryption Error", f"Failed to encrypt wallet:\n{error_msg}")
@@ -7,11 +7,12 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 from pathlib import Path
+from typing import Optional
 import json
 
 from .password_dialog import PasswordDialog
-from plm_wallet.crypto.encryption import WalletEncryption
-from plm_wallet.crypto.exceptions import InvalidPasswordError, DecryptionError
+from .encryption_thread import WalletEncryptionThread
+from plm_wallet.crypto.encryption import WalletEncryption, KeySession
 from plm_wallet.config.constants import WALLETS_DIR
 
 
@@ -20,9 +21,19 @@ class WalletLoaderWidget(QWidget):
 
     wallet_loaded = pyqtSignal(dict)
 
-    def __init__(self):
+    # Password attempts allowed when opening an encrypted wallet
+    MAX_PASSWORD_ATTEMPTS = 3
+
+    def __init__(self, key_session: Optional[KeySession] = None):
+        """
+        Initialize widget.
+
+        Args:
+            key_session: Session caching derived wallet keys, shared with the display widget
+        """
         super().__init__()
         self.wallets_dir = WALLETS_DIR
+        self.key_session = key_session
         self.init_ui()
 
     def init_ui(self):
@@ -174,6 +185,9 @@ class WalletLoaderWidget(QWidget):
         """
         Open and load a wallet file.
 
+        Encrypted wallets are decrypted in a background thread, see
+        request_password().
+
         Args:
             file_path: Path to the wallet JSON file
         """
@@ -183,52 +197,9 @@ class WalletLoaderWidget(QWidget):
 
             # Check if wallet is encrypted
             if WalletEncryption.is_encrypted(wallet_data):
-                # Show password dialog
-                filename = Path(file_path).name
-                max_attempts = 3
-
-                for attempt in range(max_attempts):
-                    password_dialog = PasswordDialog(self, mode='decrypt', filename=filename)
-                    if password_dialog.exec() == QDialog.DialogCode.Accepted:
-                        password = password_dialog.get_password()
-                        if password:
-                            try:
-                                # Decrypt the wallet
-                                wallet_data = WalletEncryption.decrypt_wallet(wallet_data, password)
-                                break  # Successfully decrypted
-                            except InvalidPasswordError:
-                                remaining = max_attempts - attempt - 1
-                                if remaining > 0:
-                                    QMessageBox.warning(
-                                        self,
-                                        "Invalid Password",
-                                        f"Incorrect password. {remaining} attempt(s) remaining."
-                                    )
-                                else:
-                                    QMessageBox.critical(
-                                        self,
-                                        "Access Denied",
-                                        "Maximum password attempts reached. Cannot open wallet."
-                                    )
-                                    return
-                            except DecryptionError as e:
-                                QMessageBox.critical(
-                                    self,
-                                    "Decryption Error",
-                                    f"Failed to decrypt wallet:\n{str(e)}"
-                                )
-                                return
-                    else:
-                        # User cancelled password dialog
-                        return
-
-            # Validate wallet data
-            required_fields = ['mnemonic', 'standard', 'derivation_path', 'addresses']
-            if not all(field in wallet_data for field in required_fields):
-                raise ValueError("Invalid wallet file format")
-
-            # Emit signal with wallet data
-            self.wallet_loaded.emit(wallet_data)
+                self.request_password(file_path, wallet_data, self.MAX_PASSWORD_ATTEMPTS)
+            else:
+                self.load_wallet_data(wallet_data)
 
         except json.JSONDecodeError:
             QMessageBox.critical(
@@ -236,18 +207,95 @@ class WalletLoaderWidget(QWidget):
                 "Error",
                 f"Invalid JSON file:\n{file_path}"
             )
-        except ValueError as e:
+        except Exception as e:
             QMessageBox.critical(
                 self,
                 "Error",
-                f"Invalid wallet file:\n{str(e)}"
+                f"Failed to open wallet:\n{str(e)}"
             )
-        except Exception as e:
+
+    def request_password(self, file_path: str, encrypted_wallet: dict, attempts_left: int):
+        """
+        Ask for the wallet password and decrypt in a background thread.
+
+        Args:
+            file_path: Path to the wallet JSON file
+            encrypted_wallet: Encrypted wallet dictionary
+            attempts_left: Password attempts remaining, including this one
+        """
+        filename = Path(file_path).name
+        password_dialog = PasswordDialog(self, mode='decrypt', filename=filename)
+        if password_dialog.exec() != QDialog.DialogCode.Accepted:
+            # User cancelled password dialog
+            return
+        password = password_dialog.get_password()
+        if not password:
+            return
+
+        thread = WalletEncryptionThread('decrypt', encrypted_wallet, password, self,
+                                        self.key_session, file_path)
+        thread.completed.connect(self.load_wallet_data)
+        thread.invalid_password.connect(
+            lambda: self.on_invalid_password(file_path, encrypted_wallet, attempts_left - 1)
+        )
+        thread.error.connect(self.on_decryption_error)
+        thread.start_with_progress(f"Decrypting {filename}...")
+
+    def on_invalid_password(self, file_path: str, encrypted_wallet: dict, remaining: int):
+        """
+        Handle a wrong password: ask again or give up.
+
+        Args:
+            file_path: Path to the wallet JSON file
+            encrypted_wallet: Encrypted wallet dictionary
+            remaining: Password attempts remaining
+        """
+        if remaining > 0:
+            QMessageBox.warning(
+                self,
+                "Invalid Password",
+                f"Incorrect password. {remaining} attempt(s) remaining."
+            )
+            self.request_password(file_path, encrypted_wallet, remaining)
+        else:
+            QMessageBox.critical(
+                self,
+                "Access Denied",
+                "Maximum password attempts reached. Cannot open wallet."
+            )
+
+    def on_decryption_error(self, error_msg: str):
+        """
+        Handle wallet decryption error.
+
+        Args:
+            error_msg: Error message
+        """
+        QMessageBox.critical(
+            self,
+            "Decryption Error",
+            f"Failed to decrypt wallet:\n{error_msg}"
+        )
+
+    def load_wallet_data(self, wallet_data: dict):
+        """
+        Validate decrypted wallet data and emit it.
+
+        Args:
+            wallet_data: Wallet dictionary
+        """
+        # Validate wallet data
+        required_fields = ['mnemonic', 'standard', 'derivation_path', 'addresses']
+        if not all(field in wallet_data for field in required_fields):
             QMessageBox.critical(
                 self,
                 "Error",
-                f"Failed to open wallet:\n{str(e)}"
+                "Invalid wallet file:\nInvalid wallet file format"
             )
+            return
+
+        # Emit signal with wallet data
+        self.wallet_loaded.emit(wallet_data)
 
     def delete_selected_wallet(self):
         """Delete the currently selected wallet file."""
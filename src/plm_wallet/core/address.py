@@ -17,9 +17,20 @@ def private_key_to_address(private_key: bytes, hrp: str = HRP) -> str:
     Returns:
         Bech32 encoded address
     """
-    # Get compressed public key
-    pubkey = private_to_public(private_key)
+    return pubkey_to_address(private_to_public(private_key), hrp)
 
+
+def pubkey_to_address(pubkey: bytes, hrp: str = HRP) -> str:
+    """
+    Generate bech32 address from a compressed public key.
+
+    Args:
+        pubkey: 33-byte compressed public key
+        hrp: Human-readable part (default: 'plm')
+
+    Returns:
+        Bech32 encoded address
+    """
     # Generate witness program (hash160 of pubkey)
     witprog = hash160(pubkey)
 
@@ -1,11 +1,11 @@
 """HD key derivation (BIP32)."""
 
-import ecdsa
-from typing import Tuple
-from ..crypto.hashing import hmac_sha512
-from ..crypto.ecc import private_to_public
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from ..crypto.hashing import HmacSha512, hmac_sha512
+from ..crypto.ecc import private_to_public, private_to_public_batch, pubkey_tweak_add_batch, N
 from ..config.constants import BIP84_PATH
-from .keys import serialize_extended_key, get_pubkey_fingerprint
+from .keys import ExtendedKey
 
 
 def derive_master_keys(seed: bytes) -> Tuple[bytes, bytes]:
@@ -42,14 +42,15 @@ def derive_hardened_child(parent_key: bytes, parent_chain_code: bytes, index: in
     data = b'\x00' + parent_key + index.to_bytes(4, 'big')
     I = hmac_sha512(parent_chain_code, data)
 
-    child_key_int = (int.from_bytes(I[:32], 'big') + int.from_bytes(parent_key, 'big')) % ecdsa.SECP256k1.order
+    child_key_int = (int.from_bytes(I[:32], 'big') + int.from_bytes(parent_key, 'big')) % N
     child_key = child_key_int.to_bytes(32, 'big')
     child_chain_code = I[32:]
 
     return child_key, child_chain_code
 
 
-def derive_normal_child(parent_key: bytes, parent_chain_code: bytes, index: int) -> Tuple[bytes, bytes]:
+def derive_normal_child(parent_key: bytes, parent_chain_code: bytes, index: int,
+                        parent_pubkey: Optional[bytes] = None) -> Tuple[bytes, bytes]:
     """
     Derive normal (non-hardened) child key.
 
@@ -57,68 +58,262 @@ def derive_normal_child(parent_key: bytes, parent_chain_code: bytes, index: int)
         parent_key: Parent private key (32 bytes)
         parent_chain_code: Parent chain code (32 bytes)
         index: Child index (< 0x80000000)
+        parent_pubkey: Parent compressed public key, if already known
 
     Returns:
         Tuple of (child_key, child_chain_code)
     """
     # Calculate parent public key
-    parent_pubkey = private_to_public(parent_key)
+    if parent_pubkey is None:
+        parent_pubkey = private_to_public(parent_key)
 
     data = parent_pubkey + index.to_bytes(4, 'big')
     I = hmac_sha512(parent_chain_code, data)
 
-    child_key_int = (int.from_bytes(I[:32], 'big') + int.from_bytes(parent_key, 'big')) % ecdsa.SECP256k1.order
+    child_key_int = (int.from_bytes(I[:32], 'big') + int.from_bytes(parent_key, 'big')) % N
     child_key = child_key_int.to_bytes(32, 'big')
     child_chain_code = I[32:]
 
     return child_key, child_chain_code
 
 
-def derive_path(seed: bytes, path: str = BIP84_PATH) -> dict:
+def derive_normal_children(parent_key: bytes, parent_chain_code: bytes, indexes: List[int],
+                           parent_pubkey: Optional[bytes] = None) -> List[Tuple[bytes, bytes, bytes]]:
     """
-    Derive keys from seed using specified path.
+    Derive several normal child keys of the same parent, with their pubkeys.
+
+    The parent public key is computed (at most) once, the HMAC is keyed
+    with the parent chain code once, and the child public keys are
+    computed once, as a batch, so callers never recompute them.
 
     Args:
-        seed: 64-byte seed
-        path: Derivation path (e.g., "m/84h/746h/0h")
+        parent_key: Parent private key (32 bytes)
+        parent_chain_code: Parent chain code (32 bytes)
+        indexes: Child indexes (each < 0x80000000)
+        parent_pubkey: Parent compressed public key, if already known
+
+    Returns:
+        List of (child_key, child_pubkey, child_chain_code) tuples, in the same order
+    """
+    if parent_pubkey is None:
+        parent_pubkey = private_to_public(parent_key)
+
+    # Key the HMAC with the parent chain code once for all siblings
+    mac = HmacSha512(parent_chain_code)
+    parent_int = int.from_bytes(parent_key, 'big')
+    children = []
+    for index in indexes:
+        I = mac.digest(parent_pubkey + index.to_bytes(4, 'big'))
+        child_key = ((int.from_bytes(I[:32], 'big') + parent_int) % N).to_bytes(32, 'big')
+        children.append((child_key, I[32:]))
+
+    child_pubkeys = private_to_public_batch([key for key, _ in children])
+    return [(key, pubkey, chain_code) for (key, chain_code), pubkey in zip(children, child_pubkeys)]
+
+
+def derive_public_child(parent_pubkey: bytes, parent_chain_code: bytes, index: int) -> Tuple[bytes, bytes]:
+    """
+    Derive normal child public key from a parent public key (CKD_pub).
+
+    Args:
+        parent_pubkey: Parent compressed public key (33 bytes)
+        parent_chain_code: Parent chain code (32 bytes)
+        index: Child index (< 0x80000000)
+
+    Returns:
+        Tuple of (child_pubkey, child_chain_code)
+    """
+    return derive_public_children(parent_pubkey, parent_chain_code, [index])[0]
+
+
+def derive_public_children(parent_pubkey: bytes, parent_chain_code: bytes,
+                           indexes: List[int]) -> List[Tuple[bytes, bytes]]:
+    """
+    Derive several normal child public keys from the same parent (CKD_pub).
+
+    Each child point is parent point + IL*G, so no private key is needed.
+    The HMAC is keyed with the parent chain code once for all siblings.
+
+    Args:
+        parent_pubkey: Parent compressed public key (33 bytes)
+        parent_chain_code: Parent chain code (32 bytes)
+        indexes: Child indexes (each < 0x80000000)
+
+    Returns:
+        List of (child_pubkey, child_chain_code) tuples, in the same order
+
+    Raises:
+        ValueError: If an index is hardened
+    """
+    mac = HmacSha512(parent_chain_code)
+    tweaks = []
+    chain_codes = []
+    for index in indexes:
+        if index & 0x80000000:
+            raise ValueError("Cannot derive hardened child from a public key")
+        I = mac.digest(parent_pubkey + index.to_bytes(4, 'big'))
+        tweaks.append(I[:32])
+        chain_codes.append(I[32:])
+
+    child_pubkeys = pubkey_tweak_add_batch(parent_pubkey, tweaks)
+    return list(zip(child_pubkeys, chain_codes))
+
+
+def derive_child_node(parent: ExtendedKey, index: int) -> ExtendedKey:
+    """
+    Derive a child node.
+
+    Private parents use CKDpriv, public-only parents use CKDpub (normal
+    indexes only). The parent's cached public key is reused.
+
+    Args:
+        parent: Parent node
+        index: Child index (>= 0x80000000 for hardened)
+
+    Returns:
+        Child node
+
+    Raises:
+        ValueError: If a hardened child is requested from a public-only node
+    """
+    if index & 0x80000000:
+        if not parent.is_private:
+            raise ValueError("Cannot derive hardened child from a public key")
+        key, chain_code = derive_hardened_child(parent.key, parent.chain_code, index)
+    elif parent.is_private:
+        key, chain_code = derive_normal_child(parent.key, parent.chain_code, index, parent.pubkey)
+    else:
+        key, chain_code = derive_public_child(parent.key, parent.chain_code, index)
+
+    return ExtendedKey(key, chain_code, parent.depth + 1, parent.fingerprint, index)
+
+
+def parse_path(path: str) -> Tuple[int, ...]:
+    """
+    Parse a BIP32 path into child indexes.
+
+    Hardened segments are marked with 'h', 'H' or an apostrophe; other
+    segments are normal. "m" alone is the root.
+
+    Args:
+        path: Derivation path (e.g., "m/84h/746h/0h/0/5")
 
     Returns:
-        Dictionary with master and derived keys
+        Tuple of child indexes (hardened ones include 0x80000000)
+
+    Raises:
+        ValueError: If the path is malformed
+    """
+    parts = path.strip().split("/")
+    if parts[0] not in ("m", "M"):
+        raise ValueError(f"Derivation path must start with 'm': {path}")
+
+    indexes = []
+    for part in parts[1:]:
+        if not part:
+            continue
+        hardened = part[-1] in "hH'"
+        digits = part[:-1] if hardened else part
+        if not digits.isdigit() or int(digits) >= 0x80000000:
+            raise ValueError(f"Invalid path segment '{part}' in {path}")
+        indexes.append(int(digits) | 0x80000000 if hardened else int(digits))
+    return tuple(indexes)
+
+
+class DerivationCache:
+    """
+    Bounded LRU cache of derived nodes keyed by path prefix.
+
+    Deriving m/84h/746h/0h/0/5 caches every node on the way, so a later
+    m/84h/746h/0h/1/7 starts from the cached m/84h/746h/0h node instead of
+    repeating the HMAC-SHA512 and public key work from the root.
     """
-    master_key, master_chain_code = derive_master_keys(seed)
 
-    # Serialize master keys
-    master_xprv = serialize_extended_key(master_key, master_chain_code, 0, b'\x00\x00\x00\x00', 0, True)
-    master_xpub = serialize_extended_key(master_key, master_chain_code, 0, b'\x00\x00\x00\x00', 0, False)
+    def __init__(self, root: ExtendedKey, max_nodes: int = 1024):
+        """
+        Initialize cache.
+
+        Args:
+            root: Root node (usually the master key)
+            max_nodes: Maximum number of cached nodes (the root is not counted)
+        """
+        self.root = root
+        self.max_nodes = max_nodes
+        self.hits = 0
+        self.misses = 0
+        self._nodes: OrderedDict = OrderedDict()
+
+    def derive(self, path: str) -> ExtendedKey:
+        """
+        Derive the node at a path, reusing the longest cached prefix.
+
+        Args:
+            path: Derivation path with hardened and/or normal segments
+
+        Returns:
+            Node at the given path
+        """
+        indexes = parse_path(path)
+
+        # Find the longest cached prefix
+        node = self.root
+        depth = len(indexes)
+        while depth > 0:
+            cached = self._nodes.get(indexes[:depth])
+            if cached is not None:
+                self._nodes.move_to_end(indexes[:depth])
+                self.hits += 1
+                node = cached
+                break
+            depth -= 1
+
+        # Derive and cache the remaining segments
+        for i in range(depth, len(indexes)):
+            node = derive_child_node(node, indexes[i])
+            self.misses += 1
+            self._nodes[indexes[:i + 1]] = node
+            if len(self._nodes) > self.max_nodes:
+                self._nodes.popitem(last=False)
 
-    # Parse path
-    parts = path.replace("m/", "").split("/")
+        return node
 
-    current_key = master_key
-    current_chain_code = master_chain_code
-    parent_fingerprint = b'\x00\x00\x00\x00'
-    depth = 0
-    child_number = 0
+    def clear(self):
+        """Drop all cached nodes and reset the counters."""
+        self._nodes.clear()
+        self.hits = 0
+        self.misses = 0
 
-    for part in parts:
-        if part.endswith("h") or part.endswith("'"):
-            index = int(part[:-1])
-        else:
-            index = int(part)
+    def stats(self) -> dict:
+        """Return cache hit/miss counters and current size."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._nodes)}
 
-        parent_fingerprint = get_pubkey_fingerprint(current_key)
-        current_key, current_chain_code = derive_hardened_child(current_key, current_chain_code, index)
-        child_number = index | 0x80000000
-        depth += 1
 
-    xprv = serialize_extended_key(current_key, current_chain_code, depth, parent_fingerprint, child_number, True)
-    xpub = serialize_extended_key(current_key, current_chain_code, depth, parent_fingerprint, child_number, False)
+def derive_path(seed: bytes, path: str = BIP84_PATH) -> dict:
+    """
+    Derive keys from seed using specified path.
+
+    Args:
+        seed: 64-byte seed
+        path: Derivation path (e.g., "m/84h/746h/0h"), hardened and normal
+              segments may be mixed
+
+    Returns:
+        Dictionary with master and derived keys ('master' and 'account'
+        hold the corresponding ExtendedKey nodes, 'cache' a DerivationCache
+        rooted at the master that already holds every node on the path)
+    """
+    master = ExtendedKey(*derive_master_keys(seed))
+    cache = DerivationCache(master)
+    node = cache.derive(path)
 
     return {
-        'master_zprv': master_xprv,
-        'master_zpub': master_xpub,
-        'zprv': xprv,
-        'zpub': xpub,
-        'key': current_key,
-        'chain_code': current_chain_code
+        'master_zprv': master.zprv,
+        'master_zpub': master.zpub,
+        'zprv': node.zprv,
+        'zpub': node.zpub,
+        'key': node.key,
+        'chain_code': node.chain_code,
+        'master': master,
+        'account': node,
+        'cache': cache
     }
@@ -1,7 +1,8 @@
 """Key management and serialization."""
 
-from ..crypto.ecc import private_to_public
-from ..crypto.encoding import base58_encode_check
+from typing import Optional
+from ..crypto.ecc import private_to_public, decompress_pubkey, N
+from ..crypto.encoding import base58_encode_check, base58_decode_check
 from ..crypto.hashing import hash160
 from ..config.constants import ZPRV_VERSION, ZPUB_VERSION
 
@@ -12,7 +13,7 @@ def serialize_extended_key(key: bytes, chain_code: bytes, depth: int, fingerprin
     Serialize extended key in base58check format (zprv/zpub).
 
     Args:
-        key: Private or public key (32 bytes)
+        key: Private key (32 bytes) or compressed public key (33 bytes)
         chain_code: Chain code (32 bytes)
         depth: Depth in derivation path
         fingerprint: Parent fingerprint (4 bytes)
@@ -26,9 +27,8 @@ def serialize_extended_key(key: bytes, chain_code: bytes, depth: int, fingerprin
         version = ZPRV_VERSION.to_bytes(4, 'big')
         key_data = b'\x00' + key
     else:
-        # Calculate compressed public key
-        pubkey = private_to_public(key)
-        key_data = pubkey
+        # Calculate compressed public key unless one was given
+        key_data = key if len(key) == 33 else private_to_public(key)
         version = ZPUB_VERSION.to_bytes(4, 'big')
 
     raw = (version +
@@ -41,6 +41,51 @@ def serialize_extended_key(key: bytes, chain_code: bytes, depth: int, fingerprin
     return base58_encode_check(raw)
 
 
+def parse_extended_key(extended_key: str) -> 'ExtendedKey':
+    """
+    Parse and validate a serialized extended key (zprv/zpub).
+
+    Args:
+        extended_key: Base58check encoded extended key
+
+    Returns:
+        ExtendedKey with the version's key type (private for zprv,
+        public-only for zpub), depth, parent fingerprint, child number
+        and chain code
+
+    Raises:
+        ValueError: If the checksum, version, length, key or metadata is invalid
+    """
+    raw = base58_decode_check(extended_key.strip())
+    if len(raw) != 78:
+        raise ValueError("Extended key must be 78 bytes")
+
+    version = int.from_bytes(raw[0:4], 'big')
+    depth = raw[4]
+    fingerprint = raw[5:9]
+    child_number = int.from_bytes(raw[9:13], 'big')
+    chain_code = raw[13:45]
+    key_data = raw[45:78]
+
+    if depth == 0 and (fingerprint != b'\x00\x00\x00\x00' or child_number != 0):
+        raise ValueError("Master extended key with non-zero parent fingerprint or child number")
+
+    if version == ZPRV_VERSION:
+        if key_data[0] != 0:
+            raise ValueError("Private extended key must start with 0x00")
+        key = key_data[1:]
+        if not 0 < int.from_bytes(key, 'big') < N:
+            raise ValueError("Private key out of range")
+    elif version == ZPUB_VERSION:
+        # Raises ValueError unless the key is a valid compressed point
+        decompress_pubkey(key_data)
+        key = key_data
+    else:
+        raise ValueError(f"Unsupported extended key version: {version:#010x}")
+
+    return ExtendedKey(key, chain_code, depth, fingerprint, child_number, extended_key.strip())
+
+
 def get_pubkey_fingerprint(private_key: bytes) -> bytes:
     """
     Calculate public key fingerprint (first 4 bytes of hash160).
@@ -53,3 +98,92 @@ def get_pubkey_fingerprint(private_key: bytes) -> bytes:
     """
     pubkey = private_to_public(private_key)
     return hash160(pubkey)[:4]
+
+
+class ExtendedKey:
+    """
+    BIP32 node (key, chain code and position in the tree).
+
+    The key is either a 32-byte private key or, for watch-only nodes, a
+    33-byte compressed public key. The public key, fingerprint and zprv/zpub
+    serializations are computed lazily and at most once per node.
+    """
+
+    __slots__ = ('key', 'chain_code', 'depth', 'parent_fingerprint', 'child_number',
+                 '_pubkey', '_fingerprint', '_zprv', '_zpub')
+
+    def __init__(self, key: bytes, chain_code: bytes, depth: int = 0,
+                 parent_fingerprint: bytes = b'\x00\x00\x00\x00', child_number: int = 0,
+                 serialized: Optional[str] = None):
+        """
+        Initialize node.
+
+        Args:
+            key: Private key (32 bytes) or compressed public key (33 bytes)
+            chain_code: Chain code (32 bytes)
+            depth: Depth in derivation path
+            parent_fingerprint: Parent fingerprint (4 bytes)
+            child_number: Child number (hardened indexes include 0x80000000)
+            serialized: Known serialization of this node (zprv for a private
+                key, zpub for a public one), kept instead of re-encoding it
+        """
+        if len(key) not in (32, 33):
+            raise ValueError("Key must be a 32-byte private key or 33-byte public key")
+        self.key = key
+        self.chain_code = chain_code
+        self.depth = depth
+        self.parent_fingerprint = parent_fingerprint
+        self.child_number = child_number
+        self._pubkey: Optional[bytes] = key if len(key) == 33 else None
+        self._fingerprint: Optional[bytes] = None
+        self._zprv: Optional[str] = serialized if self._pubkey is None else None
+        self._zpub: Optional[str] = serialized if self._pubkey is not None else None
+
+    @property
+    def is_private(self) -> bool:
+        """True if the node holds a private key."""
+        return len(self.key) == 32
+
+    @property
+    def pubkey(self) -> bytes:
+        """Compressed public key (33 bytes)."""
+        if self._pubkey is None:
+            self._pubkey = private_to_public(self.key)
+        return self._pubkey
+
+    @property
+    def fingerprint(self) -> bytes:
+        """Fingerprint of this node (first 4 bytes of hash160 of the pubkey)."""
+        if self._fingerprint is None:
+            self._fingerprint = hash160(self.pubkey)[:4]
+        return self._fingerprint
+
+    @property
+    def zprv(self) -> str:
+        """Serialized extended private key."""
+        if self._zprv is None:
+            if not self.is_private:
+                raise ValueError("Public-only node has no zprv")
+            self._zprv = serialize_extended_key(self.key, self.chain_code, self.depth,
+                                                self.parent_fingerprint, self.child_number, True)
+        return self._zprv
+
+    @property
+    def zpub(self) -> str:
+        """Serialized extended public key."""
+        if self._zpub is None:
+            self._zpub = serialize_extended_key(self.pubkey, self.chain_code, self.depth,
+                                                self.parent_fingerprint, self.child_number, False)
+        return self._zpub
+
+    def neuter(self) -> 'ExtendedKey':
+        """
+        Return the public-only version of this node.
+
+        Returns:
+            ExtendedKey holding the compressed public key
+        """
+        node = ExtendedKey(self.pubkey, self.chain_code, self.depth,
+                           self.parent_fingerprint, self.child_number, self._zpub)
+        node._fingerprint = self._fingerprint
+        return node
@@ -1,12 +1,22 @@
 """Mnemonic generation (BIP39 and Electrum)."""
 
+import os
 import secrets
 import hashlib
-import hmac
+from functools import lru_cache
+from typing import List, Optional
 from mnemonic import Mnemonic
 from ..config.constants import VALID_WORD_COUNTS
+from ..crypto.hashing import HmacSha512
+from ..utils.pool import ordered_pool_map
 from ..utils.text import normalize_text
 
+# Keyed once: every Electrum candidate is checked with the same HMAC key
+_SEED_VERSION_MAC = HmacSha512(b"Seed version")
+
+# Electrum seeds generated per task by generate_electrum_batch
+ELECTRUM_BATCH_CHUNK = 16
+
 
 def entropy_bits_for_words(word_count: int) -> int:
     """
@@ -23,6 +33,35 @@ def entropy_bits_for_words(word_count: int) -> int:
     return {12: 128, 15: 160, 18: 192, 21: 224, 24: 256}[word_count]
 
 
+@lru_cache(maxsize=None)
+def get_mnemo(language: str = "english") -> Mnemonic:
+    """
+    Return a shared Mnemonic instance (the wordlist is read from disk once).
+
+    Args:
+        language: Wordlist language
+
+    Returns:
+        Mnemonic instance
+    """
+    return Mnemonic(language)
+
+
+def is_electrum_segwit(mnemonic: str) -> bool:
+    """
+    Check whether a mnemonic is an Electrum native segwit seed (version "100").
+
+    Args:
+        mnemonic: Mnemonic phrase
+
+    Returns:
+        True if HMAC-SHA512("Seed version", mnemonic) starts with hex "100"
+    """
+    digest = _SEED_VERSION_MAC.digest(normalize_text(mnemonic).encode('utf-8'))
+    # Hex prefix "100" is byte 0x10 followed by a byte below 0x10
+    return digest[0] == 0x10 and digest[1] < 0x10
+
+
 def generate_bip39(word_count: int) -> str:
     """
     Generate BIP39 mnemonic.
@@ -33,7 +72,7 @@ def generate_bip39(word_count: int) -> str:
     Returns:
         BIP39 mnemonic phrase
     """
-    mnemo = Mnemonic("english")
+    mnemo = get_mnemo()
     entropy_bits = entropy_bits_for_words(word_count)
     return mnemo.generate(entropy_bits)
 
@@ -42,33 +81,64 @@ def generate_electrum(word_count: int) -> str:
     """
     Generate Electrum-compatible mnemonic (segwit native).
 
+    Candidates are drawn until the seed version HMAC starts with "100"
+    (about 1 in 4096). The words are lowercase ASCII joined by single
+    spaces, which Electrum normalization leaves unchanged, so each
+    candidate is hashed as-is.
+
     Args:
         word_count: Number of words (12, 15, 18, 21, or 24)
 
     Returns:
         Electrum mnemonic phrase
     """
-    mnemo = Mnemonic("english")
-    wordlist = mnemo.wordlist
+    wordlist = get_mnemo().wordlist
+    entropy_bits = entropy_bits_for_words(word_count)
+    entropy_bytes = entropy_bits // 8
+    shifts = [11 * (word_count - 1 - i) for i in range(word_count)]
+    token_bytes = secrets.token_bytes
+    sha256 = hashlib.sha256
+    mac = _SEED_VERSION_MAC
 
     # Electrum generates mnemonic and verifies hash starts with "100" for segwit
     while True:
-        entropy_bits = entropy_bits_for_words(word_count)
-        entropy = secrets.token_bytes(entropy_bits // 8)
+        entropy = token_bytes(entropy_bytes)
 
         # Generate words from entropy
-        h = hashlib.sha256(entropy).digest()
+        h = sha256(entropy).digest()
         b = (int.from_bytes(entropy, 'big') << 256 - entropy_bits) | (int.from_bytes(h, 'big') >> entropy_bits)
+        mnemonic = " ".join([wordlist[(b >> shift) & 0x7FF] for shift in shifts])
 
-        words = []
-        for i in range(word_count):
-            idx = (b >> (11 * (word_count - 1 - i))) & 0x7FF
-            words.append(wordlist[idx % len(wordlist)])
+        # Verify Electrum prefix for segwit native (0x100) on the raw digest
+        digest = mac.digest(mnemonic.encode('ascii'))
+        if digest[0] == 0x10 and digest[1] < 0x10:
+            return mnemonic
 
-        mnemonic = " ".join(words)
 
-        # Verify Electrum prefix for segwit native (0x100)
-        normalized = normalize_text(mnemonic)
-        hm = hmac.new(b"Seed version", normalized.encode('utf-8'), hashlib.sha512).hexdigest()
-        if hm.startswith("100"):
-            return mnemonic
+def generate_electrum_batch(count: int, word_count: int,
+                            workers: Optional[int] = None) -> List[str]:
+    """
+    Generate many Electrum mnemonics on a process pool.
+
+    Args:
+        count: Number of mnemonics
+        word_count: Number of words (12, 15, 18, 21, or 24)
+        workers: Number of worker processes (default: CPU count; 1 runs inline)
+
+    Returns:
+        List of Electrum mnemonic phrases
+    """
+    entropy_bits_for_words(word_count)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or count <= ELECTRUM_BATCH_CHUNK:
+        return [generate_electrum(word_count) for _ in range(count)]
+
+    chunks = ((min(ELECTRUM_BATCH_CHUNK, count - i), word_count)
+              for i in range(0, count, ELECTRUM_BATCH_CHUNK))
+    return [mnemonic for _, chunk in ordered_pool_map(_generate_electrum_chunk, chunks, workers)
+            for mnemonic in chunk]
+
+
+def _generate_electrum_chunk(count: int, word_count: int) -> List[str]:
+    """Worker entry point: generate a chunk of Electrum mnemonics."""
+    return [generate_electrum(word_count) for _ in range(count)]
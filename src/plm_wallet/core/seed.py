@@ -1,9 +1,26 @@
 """Seed generation from mnemonic."""
 
 import hashlib
+from typing import List, Sequence, Tuple
+from ..crypto.pbkdf2 import pbkdf2_sha512_batch
 from ..utils.text import normalize_text
 
 
+def _seed_inputs(mnemonic: str, passphrase: str, electrum: bool) -> Tuple[bytes, bytes]:
+    """Return the PBKDF2 password and salt for a mnemonic."""
+    if electrum:
+        # Electrum normalizes text before conversion
+        mnemonic = normalize_text(mnemonic)
+        passphrase = normalize_text(passphrase) if passphrase else ''
+        # Electrum uses "electrum" + passphrase as salt
+        salt = (b'electrum' + passphrase.encode('utf-8'))
+    else:
+        # BIP39 uses "mnemonic" + passphrase as salt
+        salt = ("mnemonic" + passphrase).encode('utf-8')
+
+    return mnemonic.encode('utf-8'), salt
+
+
 def mnemonic_to_seed(mnemonic: str, passphrase: str = "", electrum: bool = False) -> bytes:
     """
     Convert mnemonic to seed using PBKDF2.
@@ -16,14 +33,22 @@ def mnemonic_to_seed(mnemonic: str, passphrase: str = "", electrum: bool = False
     Returns:
         64-byte seed
     """
-    if electrum:
-        # Electrum normalizes text before conversion
-        mnemonic = normalize_text(mnemonic)
-        passphrase = normalize_text(passphrase) if passphrase else ''
-        # Electrum uses "electrum" + passphrase as salt
-        salt = (b'electrum' + passphrase.encode('utf-8'))
-    else:
-        # BIP39 uses "mnemonic" + passphrase as salt
-        salt = ("mnemonic" + passphrase).encode('utf-8')
+    password, salt = _seed_inputs(mnemonic, passphrase, electrum)
+    return hashlib.pbkdf2_hmac('sha512', password, salt, 2048)
+
 
-    return hashlib.pbkdf2_hmac('sha512', mnemonic.encode('utf-8'), salt, 2048)
+def mnemonic_to_seed_batch(mnemonics: Sequence[str], passphrase: str = "",
+                           electrum: bool = False) -> List[bytes]:
+    """
+    Convert many mnemonics to seeds with batched PBKDF2.
+
+    Args:
+        mnemonics: Mnemonic phrases
+        passphrase: Optional passphrase (shared by all mnemonics)
+        electrum: Use Electrum standard if True, BIP39 otherwise
+
+    Returns:
+        List of 64-byte seeds, in the same order
+    """
+    inputs = [_seed_inputs(m, passphrase, electrum) for m in mnemonics]
+    return pbkdf2_sha512_batch([p for p, _ in inputs], [s for _, s in inputs], 2048)
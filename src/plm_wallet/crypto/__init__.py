@@ -1,6 +1,6 @@
 """Cryptographic primitives for wallet encryption."""
 
-from .encryption import WalletEncryption
+from .encryption import WalletEncryption, KeySession
 from .exceptions import EncryptionError, DecryptionError, InvalidPasswordError
 
-__all__ = ['WalletEncryption', 'EncryptionError', 'DecryptionError', 'InvalidPasswordError']
+__all__ = ['WalletEncryption', 'KeySession', 'EncryptionError', 'DecryptionError', 'InvalidPasswordError']
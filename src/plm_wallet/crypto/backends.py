@@ -0,0 +1,300 @@
+"""Pluggable ECC backends with benchmark-based auto-selection.
+
+Every backend exposes the same interface (pubkey, pubkey_batch, tweak_add)
+and produces byte-identical compressed public keys. On first use the
+registry checks each importable backend against known vectors, times it
+on a small batch and keeps the fastest one for the rest of the process.
+Set PLM_ECC_BACKEND to force a specific backend.
+"""
+
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from . import secp256k1
+from .hashing import sha256
+
+# Environment variable that overrides the benchmark selection
+ECC_BACKEND_ENV = 'PLM_ECC_BACKEND'
+
+# Number of keys timed per backend during selection
+BENCHMARK_KEYS = 16
+
+# Known vectors: 1*G, 2*G, 3*G (compressed)
+_G1 = bytes.fromhex('0279be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798')
+_G2 = bytes.fromhex('02c6047f9441ed7d6d3045406e95c07cd85c778e4b8cef3ca7abac09b95c709ee5')
+_G3 = bytes.fromhex('02f9308a019258c31049344f85f89d5229b531c845836f99b08601f113bce036f9')
+
+
+class ECCBackend(ABC):
+    """
+    Base class for secp256k1 backends.
+
+    Subclasses implement pubkey() and at least one of tweak_add() or
+    tweak_add_batch(); the batch methods default to per-item loops.
+    """
+
+    name = ''
+
+    @abstractmethod
+    def pubkey(self, private_key: bytes) -> bytes:
+        """
+        Convert private key to compressed public key.
+
+        Args:
+            private_key: 32-byte private key
+
+        Returns:
+            33-byte compressed public key
+        """
+
+    def pubkey_batch(self, private_keys: List[bytes]) -> List[bytes]:
+        """
+        Convert many private keys to compressed public keys.
+
+        Args:
+            private_keys: List of 32-byte private keys
+
+        Returns:
+            List of 33-byte compressed public keys, in the same order
+        """
+        return [self.pubkey(k) for k in private_keys]
+
+    def tweak_add(self, pubkey: bytes, tweak: bytes) -> bytes:
+        """
+        Add tweak * G to a public key.
+
+        Args:
+            pubkey: 33-byte compressed public key
+            tweak: 32-byte scalar
+
+        Returns:
+            33-byte compressed public key
+        """
+        return self.tweak_add_batch(pubkey, [tweak])[0]
+
+    def tweak_add_batch(self, pubkey: bytes, tweaks: List[bytes]) -> List[bytes]:
+        """
+        Add many tweaks to the same public key.
+
+        Args:
+            pubkey: 33-byte compressed public key
+            tweaks: List of 32-byte scalars
+
+        Returns:
+            List of 33-byte compressed public keys, in the same order
+        """
+        return [self.tweak_add(pubkey, t) for t in tweaks]
+
+
+class NativeBackend(ECCBackend):
+    """In-tree pure-Python engine (always available)."""
+
+    name = 'native'
+
+    def pubkey(self, private_key: bytes) -> bytes:
+        return secp256k1.private_to_public(private_key)
+
+    def pubkey_batch(self, private_keys: List[bytes]) -> List[bytes]:
+        return secp256k1.private_to_public_batch(private_keys)
+
+    def tweak_add(self, pubkey: bytes, tweak: bytes) -> bytes:
+        return secp256k1.pubkey_tweak_add(pubkey, tweak)
+
+    def tweak_add_batch(self, pubkey: bytes, tweaks: List[bytes]) -> List[bytes]:
+        return secp256k1.pubkey_tweak_add_batch(pubkey, tweaks)
+
+
+class EcdsaBackend(ECCBackend):
+    """python-ecdsa backend."""
+
+    name = 'ecdsa'
+
+    def __init__(self):
+        import ecdsa
+        self._ecdsa = ecdsa
+        self._curve = ecdsa.SECP256k1
+
+    def _compress(self, point) -> bytes:
+        return secp256k1.compress_point(point.x(), point.y())
+
+    def pubkey(self, private_key: bytes) -> bytes:
+        secp256k1.scalar_from_private_key(private_key)
+        sk = self._ecdsa.SigningKey.from_string(private_key, curve=self._curve)
+        return self._compress(sk.get_verifying_key().pubkey.point)
+
+    def tweak_add_batch(self, pubkey: bytes, tweaks: List[bytes]) -> List[bytes]:
+        vk = self._ecdsa.VerifyingKey.from_string(pubkey, curve=self._curve)
+        point = vk.pubkey.point
+        results = []
+        for tweak in tweaks:
+            child = point + self._curve.generator * secp256k1.scalar_from_tweak(tweak)
+            if child == self._ecdsa.ellipticcurve.INFINITY:
+                raise ValueError("Tweaked public key is the point at infinity")
+            results.append(self._compress(child))
+        return results
+
+
+class CryptographyBackend(ECCBackend):
+    """pyca/cryptography (OpenSSL) backend."""
+
+    name = 'cryptography'
+
+    def __init__(self):
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives import serialization
+        self._ec = ec
+        self._curve = ec.SECP256K1()
+        self._encoding = serialization.Encoding.X962
+        self._compressed = serialization.PublicFormat.CompressedPoint
+
+    def pubkey(self, private_key: bytes) -> bytes:
+        k = secp256k1.scalar_from_private_key(private_key)
+        public_key = self._ec.derive_private_key(k, self._curve).public_key()
+        return public_key.public_bytes(self._encoding, self._compressed)
+
+    def tweak_add_batch(self, pubkey: bytes, tweaks: List[bytes]) -> List[bytes]:
+        # OpenSSL multiplies, point addition is done in-tree
+        px, py = secp256k1.decompress_pubkey(pubkey)
+        points = []
+        for tweak in tweaks:
+            t = secp256k1.scalar_from_tweak(tweak)
+            if t == 0:
+                points.append(None)
+                continue
+            numbers = self._ec.derive_private_key(t, self._curve).public_key().public_numbers()
+            points.append((numbers.x, numbers.y))
+        sums = iter(secp256k1.point_add_batch(px, py, [p for p in points if p is not None]))
+        return [pubkey if p is None else next(sums) for p in points]
+
+
+class CoincurveBackend(ECCBackend):
+    """coincurve (libsecp256k1) backend, used only when installed."""
+
+    name = 'coincurve'
+
+    def __init__(self):
+        import coincurve
+        self._coincurve = coincurve
+
+    def pubkey(self, private_key: bytes) -> bytes:
+        secp256k1.scalar_from_private_key(private_key)
+        return self._coincurve.PublicKey.from_secret(private_key).format(compressed=True)
+
+    def tweak_add_batch(self, pubkey: bytes, tweaks: List[bytes]) -> List[bytes]:
+        parent = self._coincurve.PublicKey(pubkey)
+        results = []
+        for tweak in tweaks:
+            if secp256k1.scalar_from_tweak(tweak) == 0:
+                results.append(pubkey)
+                continue
+            try:
+                results.append(parent.add(tweak).format(compressed=True))
+            except ValueError as e:
+                raise ValueError("Tweaked public key is the point at infinity") from e
+        return results
+
+
+# Registered backend classes, in preference order for equal timings
+BACKENDS = {
+    cls.name: cls for cls in (NativeBackend, EcdsaBackend, CryptographyBackend, CoincurveBackend)
+}
+
+_selected: Optional[ECCBackend] = None
+_timings: Dict[str, float] = {}
+
+
+def available_backends() -> Dict[str, ECCBackend]:
+    """
+    Instantiate every backend whose dependencies are importable.
+
+    Returns:
+        Dictionary of backend name to backend instance
+    """
+    backends = {}
+    for name, cls in BACKENDS.items():
+        try:
+            backends[name] = cls()
+        except ImportError:
+            continue
+    return backends
+
+
+def _is_correct(backend: ECCBackend) -> bool:
+    """Check a backend against known secp256k1 vectors."""
+    try:
+        one = (1).to_bytes(32, 'big')
+        two = (2).to_bytes(32, 'big')
+        return (backend.pubkey(one) == _G1 and
+                backend.pubkey_batch([one, two]) == [_G1, _G2] and
+                backend.tweak_add(_G1, two) == _G3)
+    except Exception:
+        return False
+
+
+def benchmark_backends(backends: Dict[str, ECCBackend]) -> Dict[str, float]:
+    """
+    Time correct backends on a small batch of public keys.
+
+    Args:
+        backends: Dictionary of backend name to backend instance
+
+    Returns:
+        Dictionary of backend name to seconds per public key
+    """
+    keys = [sha256(bytes([i])) for i in range(BENCHMARK_KEYS)]
+    timings = {}
+    for name, backend in backends.items():
+        # The correctness check doubles as warm-up (e.g. building tables)
+        if not _is_correct(backend):
+            continue
+        start = time.perf_counter()
+        backend.pubkey_batch(keys)
+        timings[name] = (time.perf_counter() - start) / len(keys)
+    return timings
+
+
+def select_backend(name: Optional[str] = None) -> ECCBackend:
+    """
+    Select the ECC backend used by plm_wallet.crypto.ecc.
+
+    Args:
+        name: Backend name; defaults to $PLM_ECC_BACKEND, then to the
+              fastest correct backend found by benchmark
+
+    Returns:
+        The selected backend
+
+    Raises:
+        ValueError: If the requested backend is unknown, unavailable or incorrect
+    """
+    global _selected, _timings
+    name = name or os.environ.get(ECC_BACKEND_ENV)
+    backends = available_backends()
+
+    if name:
+        backend = backends.get(name)
+        if backend is None:
+            raise ValueError(f"ECC backend '{name}' is not available. "
+                             f"Available: {', '.join(backends)}")
+        if not _is_correct(backend):
+            raise ValueError(f"ECC backend '{name}' failed self-test")
+        _selected = backend
+        return backend
+
+    _timings = benchmark_backends(backends)
+    _selected = backends[min(_timings, key=_timings.get)]
+    return _selected
+
+
+def get_backend() -> ECCBackend:
+    """Return the selected backend, selecting one on first use."""
+    if _selected is None:
+        return select_backend()
+    return _selected
+
+
+def get_timings() -> Dict[str, float]:
+    """Return seconds per public key measured by the last auto-selection."""
+    return dict(_timings)
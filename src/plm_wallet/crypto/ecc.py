@@ -1,6 +1,12 @@
-"""Elliptic curve cryptography operations."""
+"""Elliptic curve cryptography operations.
 
-import ecdsa
+Calls are dispatched to the ECC backend chosen by crypto.backends (the
+fastest correct one on this host, or $PLM_ECC_BACKEND).
+"""
+
+from typing import List
+from .backends import get_backend
+from .secp256k1 import N, decompress_pubkey
 
 
 def private_to_public(private_key: bytes) -> bytes:
@@ -13,15 +19,23 @@ def private_to_public(private_key: bytes) -> bytes:
     Returns:
         33-byte compressed public key
     """
-    sk = ecdsa.SigningKey.from_string(private_key, curve=ecdsa.SECP256k1)
-    vk = sk.get_verifying_key()
-    pubkey_bytes = vk.to_string()
-    x = pubkey_bytes[:32]
-    y = pubkey_bytes[32:]
+    return get_backend().pubkey(private_key)
+
+
+def private_to_public_batch(private_keys: List[bytes]) -> List[bytes]:
+    """
+    Convert many private keys to compressed public keys.
+
+    Backends that can share work across keys do so (the native engine
+    normalizes the whole batch with a single inversion).
+
+    Args:
+        private_keys: List of 32-byte private keys
 
-    # Compress public key
-    prefix = b'\x02' if int.from_bytes(y, 'big') % 2 == 0 else b'\x03'
-    return prefix + x
+    Returns:
+        List of 33-byte compressed public keys, in the same order
+    """
+    return get_backend().pubkey_batch(private_keys)
 
 
 def get_public_key_uncompressed(private_key: bytes) -> tuple[bytes, bytes]:
@@ -34,9 +48,39 @@ def get_public_key_uncompressed(private_key: bytes) -> tuple[bytes, bytes]:
     Returns:
         Tuple of (x, y) coordinates (32 bytes each)
     """
-    sk = ecdsa.SigningKey.from_string(private_key, curve=ecdsa.SECP256k1)
-    vk = sk.get_verifying_key()
-    pubkey_bytes = vk.to_string()
-    x = pubkey_bytes[:32]
-    y = pubkey_bytes[32:]
-    return x, y
+    x, y = decompress_pubkey(private_to_public(private_key))
+    return x.to_bytes(32, 'big'), y.to_bytes(32, 'big')
+
+
+def pubkey_tweak_add(pubkey: bytes, tweak: bytes) -> bytes:
+    """
+    Add tweak * G to a public key (BIP32 public child derivation).
+
+    Args:
+        pubkey: 33-byte compressed public key
+        tweak: 32-byte scalar
+
+    Returns:
+        33-byte compressed public key of pubkey + tweak * G
+
+    Raises:
+        ValueError: If the tweak is out of range or the result is infinity
+    """
+    return get_backend().tweak_add(pubkey, tweak)
+
+
+def pubkey_tweak_add_batch(pubkey: bytes, tweaks: List[bytes]) -> List[bytes]:
+    """
+    Add many tweaks to the same public key.
+
+    Args:
+        pubkey: 33-byte compressed public key
+        tweaks: List of 32-byte scalars
+
+    Returns:
+        List of 33-byte compressed public keys, in the same order
+
+    Raises:
+        ValueError: If a tweak is out of range or a result is infinity
+    """
+    return get_backend().tweak_add_batch(pubkey, tweaks)
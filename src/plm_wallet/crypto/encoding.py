@@ -1,8 +1,120 @@
 """Encoding utilities for Base58 and Bech32."""
 
 import hashlib
-import base58
-from bech32 import bech32_encode, convertbits
+from typing import Dict, Tuple
+from ..config.constants import HRP
+
+# Base58 alphabet (Bitcoin)
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+# Ten base58 digits per limb, rendered as five two-digit strings
+_BASE58_LIMB = 58 ** 10
+_BASE58_POWERS = tuple(58 ** i for i in range(11))
+_BASE58_PAIRS = tuple(a + b for a in BASE58_ALPHABET for b in BASE58_ALPHABET)
+_FROM_BASE58 = bytearray(b'\xff' * 256)
+for _i, _c in enumerate(BASE58_ALPHABET.encode('ascii')):
+    _FROM_BASE58[_c] = _i
+_FROM_BASE58 = bytes(_FROM_BASE58)
+
+# Bech32 data alphabet (one character per 5-bit group)
+BECH32_CHARSET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+
+# Checksum constants: bech32 for witness v0, bech32m (BIP350) for v1+
+BECH32_CONST = 1
+BECH32M_CONST = 0x2BC830A3
+
+_BECH32_GEN = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+
+
+def _polymod_table(bits: int) -> Tuple[int, ...]:
+    """Checksum contribution of the top `bits` bits of the state, for every value."""
+    table = []
+    for top in range(1 << bits):
+        chk = top << (30 - bits)
+        for _ in range(bits // 5):
+            b = chk >> 25
+            chk = (chk & 0x1FFFFFF) << 5
+            for i in range(5):
+                if (b >> i) & 1:
+                    chk ^= _BECH32_GEN[i]
+        table.append(chk)
+    return tuple(table)
+
+
+# The polymod is linear, so it can advance two 5-bit values per step
+_POLYMOD_10 = _polymod_table(10)
+_POLYMOD_5 = _polymod_table(5)
+
+# Two characters per 10-bit value, and the charset decoding table
+_CHARSET_PAIRS = tuple(BECH32_CHARSET[i >> 5] + BECH32_CHARSET[i & 31] for i in range(1024))
+_FROM_CHARSET = bytearray(b'\xff' * 256)
+for _i, _c in enumerate(BECH32_CHARSET.encode('ascii')):
+    _FROM_CHARSET[_c] = _i
+_FROM_CHARSET = bytes(_FROM_CHARSET)
+
+# Checksum state after the HRP expansion, per HRP
+_HRP_STATES: Dict[str, int] = {}
+
+
+def b58encode(data: bytes) -> str:
+    """
+    Base58 encoding (Bitcoin alphabet).
+
+    The number is split into base-58^10 limbs with one big-int divmod per
+    limb, and each limb is rendered from a table of two-digit strings.
+
+    Args:
+        data: Data to encode
+
+    Returns:
+        Base58 encoded string
+    """
+    n = int.from_bytes(data, 'big')
+    pairs = _BASE58_PAIRS
+    limbs = []
+    while n:
+        n, limb = divmod(n, _BASE58_LIMB)
+        limb, d4 = divmod(limb, 3364)
+        limb, d3 = divmod(limb, 3364)
+        limb, d2 = divmod(limb, 3364)
+        d0, d1 = divmod(limb, 3364)
+        limbs.append(pairs[d0] + pairs[d1] + pairs[d2] + pairs[d3] + pairs[d4])
+    digits = ''.join(reversed(limbs)).lstrip('1')
+    zeros = len(data) - len(data.lstrip(b'\x00'))
+    return '1' * zeros + digits
+
+
+def b58decode(text: str) -> bytes:
+    """
+    Base58 decoding (Bitcoin alphabet).
+
+    Args:
+        text: Base58 encoded string
+
+    Returns:
+        Decoded bytes
+
+    Raises:
+        ValueError: If the string contains a character outside the alphabet
+    """
+    try:
+        values = text.encode('ascii').translate(_FROM_BASE58)
+    except UnicodeEncodeError:
+        raise ValueError("Invalid base58 character")
+    if b'\xff' in values:
+        raise ValueError("Invalid base58 character")
+
+    n = 0
+    # Ten digits per big-int multiply; the digits of a limb are small-int math
+    for start in range(0, len(values), 10):
+        chunk = values[start:start + 10]
+        limb = 0
+        for v in chunk:
+            limb = limb * 58 + v
+        n = n * _BASE58_POWERS[len(chunk)] + limb
+
+    zeros = len(values) - len(values.lstrip(b'\x00'))
+    return b'\x00' * zeros + n.to_bytes((n.bit_length() + 7) // 8, 'big')
 
 
 def base58_encode_check(data: bytes) -> str:
@@ -16,20 +128,170 @@ def base58_encode_check(data: bytes) -> str:
         Base58Check encoded string
     """
     checksum = hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4]
-    return base58.b58encode(data + checksum).decode()
+    return b58encode(data + checksum)
 
 
-def bech32_encode_address(hrp: str, witprog: bytes) -> str:
+def base58_decode_check(text: str) -> bytes:
+    """
+    Base58Check decoding.
+
+    Args:
+        text: Base58Check encoded string
+
+    Returns:
+        Payload without the checksum
+
+    Raises:
+        ValueError: If the string is not valid base58 or the checksum does not match
+    """
+    raw = b58decode(text)
+    if len(raw) < 4:
+        raise ValueError("Base58Check string too short")
+    data, checksum = raw[:-4], raw[-4:]
+    if hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4] != checksum:
+        raise ValueError("Invalid Base58Check checksum")
+    return data
+
+
+def _polymod(chk: int, values: bytes) -> int:
+    """Advance the bech32 checksum state over 5-bit values."""
+    table = _POLYMOD_10
+    n = len(values)
+    if n & 1:
+        chk = ((chk & 0x1FFFFFF) << 5) ^ values[0] ^ _POLYMOD_5[chk >> 25]
+    for i in range(n & 1, n, 2):
+        chk = ((chk & 0xFFFFF) << 10) ^ (values[i] << 5) ^ values[i + 1] ^ table[chk >> 20]
+    return chk
+
+
+def _hrp_state(hrp: str) -> int:
+    """Checksum state after the expanded HRP (cached per HRP)."""
+    chk = _HRP_STATES.get(hrp)
+    if chk is None:
+        raw = hrp.encode('ascii')
+        chk = _polymod(1, bytes(c >> 5 for c in raw) + b'\x00' + bytes(c & 31 for c in raw))
+        _HRP_STATES[hrp] = chk
+    return chk
+
+
+_hrp_state(HRP)
+
+
+def _polymod_packed(chk: int, n: int, count: int) -> int:
+    """Advance the checksum state over `count` 5-bit values packed big-endian in n."""
+    if count & 1:
+        count -= 1
+        chk = ((chk & 0x1FFFFFF) << 5) ^ (n >> (5 * count)) ^ _POLYMOD_5[chk >> 25]
+    table = _POLYMOD_10
+    for shift in range(5 * count - 10, -1, -10):
+        chk = ((chk & 0xFFFFF) << 10) ^ ((n >> shift) & 1023) ^ table[chk >> 20]
+    return chk
+
+
+def _render_packed(n: int, count: int) -> str:
+    """Render `count` 5-bit values packed big-endian in n as charset characters."""
+    pairs = _CHARSET_PAIRS
+    head = ''
+    if count & 1:
+        count -= 1
+        head = BECH32_CHARSET[n >> (5 * count)]
+    return head + ''.join([pairs[(n >> shift) & 1023] for shift in range(5 * count - 10, -1, -10)])
+
+
+def _from_5bit(values: bytes) -> bytes:
+    """Regroup 5-bit values into bytes; padding must be under 5 zero bits."""
+    nbits = 5 * len(values)
+    pad = nbits % 8
+    if pad >= 5:
+        raise ValueError("Invalid bech32 padding")
+    n = 0
+    for v in values:
+        n = (n << 5) | v
+    if n & ((1 << pad) - 1):
+        raise ValueError("Non-zero bech32 padding")
+    return (n >> pad).to_bytes(nbits // 8, 'big')
+
+
+def bech32_encode_address(hrp: str, witprog: bytes, witver: int = 0) -> str:
     """
     Encode a bech32 address.
 
+    Witness version 0 uses the bech32 checksum, later versions bech32m.
+
     Args:
         hrp: Human-readable part (e.g., 'plm')
         witprog: Witness program (20 bytes for P2WPKH)
+        witver: Witness version (0-16)
 
     Returns:
         Bech32 encoded address
     """
-    converted = convertbits(list(witprog), 8, 5)
-    data = [0] + converted
-    return bech32_encode(hrp, data)
+    # Version, program and six zero checksum values as one integer of 5-bit groups
+    nbits = 8 * len(witprog)
+    count = (nbits + 4) // 5
+    n = ((witver << (5 * count)) | (int.from_bytes(witprog, 'big') << (5 * count - nbits))) << 30
+    total = count + 7
+
+    chk = _polymod_packed(_hrp_state(hrp), n, total)
+    chk ^= BECH32_CONST if witver == 0 else BECH32M_CONST
+    return hrp + '1' + _render_packed(n | chk, total)
+
+
+def decode_address(hrp: str, address: str) -> Tuple[int, bytes]:
+    """
+    Decode and validate a segwit bech32/bech32m address.
+
+    Args:
+        hrp: Expected human-readable part (e.g., 'plm')
+        address: Bech32 encoded address
+
+    Returns:
+        Tuple of (witness version, witness program)
+
+    Raises:
+        ValueError: If the address is invalid or has a different HRP
+    """
+    if len(address) > 90 or (address.lower() != address and address.upper() != address):
+        raise ValueError(f"Invalid {hrp} address: {address}")
+    address = address.lower()
+    pos = address.rfind('1')
+    if address[:pos] != hrp or len(address) - pos - 1 < 7:
+        raise ValueError(f"Invalid {hrp} address: {address}")
+
+    try:
+        values = address[pos + 1:].encode('ascii').translate(_FROM_CHARSET)
+    except UnicodeEncodeError:
+        raise ValueError(f"Invalid {hrp} address: {address}")
+    if b'\xff' in values:
+        raise ValueError(f"Invalid {hrp} address: {address}")
+
+    witver = values[0]
+    const = BECH32_CONST if witver == 0 else BECH32M_CONST
+    if witver > 16 or _polymod(_hrp_state(hrp), values) != const:
+        raise ValueError(f"Invalid {hrp} address: {address}")
+
+    try:
+        witprog = _from_5bit(values[1:-6])
+    except ValueError:
+        raise ValueError(f"Invalid {hrp} address: {address}")
+    if not 2 <= len(witprog) <= 40 or (witver == 0 and len(witprog) not in (20, 32)):
+        raise ValueError(f"Invalid {hrp} address: {address}")
+    return witver, witprog
+
+
+def is_valid_address(address: str, hrp: str = HRP) -> bool:
+    """
+    Check whether a string is a valid segwit address for an HRP.
+
+    Args:
+        address: Address to check
+        hrp: Expected human-readable part (default: 'plm')
+
+    Returns:
+        True if the address decodes and its checksum matches
+    """
+    try:
+        decode_address(hrp, address)
+    except ValueError:
+        return False
+    return True
@@ -1,14 +1,23 @@
 """Wallet encryption using Fernet (AES-128 in CBC mode with HMAC authentication)."""
 
 import base64
+import hashlib
+import hmac
 import json
-from typing import Dict, Any
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
 from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 
 from .exceptions import EncryptionError, DecryptionError, InvalidPasswordError
 
+# KDF of version "1" files, which do not store their parameters
+_V1_KDF = {'name': 'pbkdf2-sha256', 'iterations': 480000}
+
 
 class WalletEncryption:
     """
@@ -25,48 +34,184 @@ class WalletEncryption:
     # Number of iterations for PBKDF2 (higher = more secure but slower)
     PBKDF2_ITERATIONS = 480000  # OWASP recommendation for 2023+
 
+    # File format written by encrypt_wallet; "1" files are still read
+    VERSION = '2'
+
+    KDF_NAMES = ('pbkdf2-sha256', 'scrypt')
+
+    # Lower bounds kept by calibrate(), whatever the host speed
+    MIN_PBKDF2_ITERATIONS = 100000
+    MIN_SCRYPT_N = 2 ** 14
+
+    # Upper bounds accepted from a file, so a crafted header cannot stall or exhaust the host.
+    # Each is about 10 s on a slow host (500k PBKDF2 iterations/s), i.e. 20x the
+    # 500 ms the GUI calibrates for; calibrate() never goes past them either.
+    MAX_PBKDF2_ITERATIONS = 5000000
+    # scrypt: n*r*p bounds the work (n=2**18 with r=8, p=1), 128*r*n the memory
+    SCRYPT_MAX_COST = 2 ** 21
+    SCRYPT_MAX_MEMORY = 1 << 27
+
+    # PBKDF2 iterations timed by calibrate()
+    CALIBRATION_ITERATIONS = 50000
+
+    @staticmethod
+    def default_kdf() -> Dict[str, Any]:
+        """KDF parameters used when none are given: PBKDF2 with PBKDF2_ITERATIONS."""
+        return {'name': 'pbkdf2-sha256', 'iterations': WalletEncryption.PBKDF2_ITERATIONS}
+
+    @staticmethod
+    def check_kdf(kdf: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate KDF parameters.
+
+        Args:
+            kdf: {'name': 'pbkdf2-sha256', 'iterations': int} or
+                {'name': 'scrypt', 'n': int, 'r': int, 'p': int}
+
+        Returns:
+            The parameters, with only the known fields
+
+        Raises:
+            ValueError: If the KDF is unknown or its parameters are out of range
+        """
+        name = kdf.get('name')
+        if name == 'pbkdf2-sha256':
+            iterations = kdf.get('iterations')
+            if not isinstance(iterations, int) or not 1 <= iterations <= WalletEncryption.MAX_PBKDF2_ITERATIONS:
+                raise ValueError(f"Invalid PBKDF2 iterations: {iterations}")
+            return {'name': name, 'iterations': iterations}
+
+        if name == 'scrypt':
+            n, r, p = kdf.get('n'), kdf.get('r'), kdf.get('p')
+            if not all(isinstance(v, int) and v >= 1 for v in (n, r, p)) or n < 2 or n & (n - 1):
+                raise ValueError(f"Invalid scrypt parameters: n={n}, r={r}, p={p}")
+            if n * r * p > WalletEncryption.SCRYPT_MAX_COST:
+                raise ValueError(f"scrypt cost n*r*p exceeds {WalletEncryption.SCRYPT_MAX_COST}")
+            if 128 * r * n > WalletEncryption.SCRYPT_MAX_MEMORY:
+                raise ValueError(f"scrypt parameters need more than {WalletEncryption.SCRYPT_MAX_MEMORY} bytes")
+            return {'name': name, 'n': n, 'r': r, 'p': p}
+
+        raise ValueError(f"Unknown KDF '{name}'. Available: {', '.join(WalletEncryption.KDF_NAMES)}")
+
     @staticmethod
-    def _derive_key(password: str, salt: bytes) -> bytes:
+    def _derive_key(password: str, salt: bytes, kdf: Optional[Dict[str, Any]] = None) -> bytes:
         """
-        Derive a cryptographic key from a password using PBKDF2.
+        Derive a cryptographic key from a password.
 
         Args:
             password: User password
             salt: Cryptographic salt (16 bytes)
+            kdf: Validated KDF parameters (default: default_kdf())
 
         Returns:
             32-byte key suitable for Fernet
         """
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=WalletEncryption.PBKDF2_ITERATIONS,
-        )
-        return base64.urlsafe_b64encode(kdf.derive(password.encode('utf-8')))
+        kdf = kdf or WalletEncryption.default_kdf()
+        if kdf['name'] == 'scrypt':
+            deriver = Scrypt(salt=salt, length=32, n=kdf['n'], r=kdf['r'], p=kdf['p'])
+        else:
+            deriver = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                iterations=kdf['iterations'],
+            )
+        return base64.urlsafe_b64encode(deriver.derive(password.encode('utf-8')))
 
     @staticmethod
-    def encrypt_wallet(wallet_data: Dict[str, Any], password: str) -> Dict[str, str]:
+    def calibrate(target_ms: float, algorithm: str = 'scrypt') -> Dict[str, Any]:
+        """
+        Pick KDF parameters that take about target_ms to unlock on this host.
+
+        PBKDF2 cost is linear in the iteration count, so one timed run is
+        scaled. scrypt's n must be a power of two: it is doubled from
+        MIN_SCRYPT_N while the next doubling should still fit the target
+        (r=8, p=1). The result never goes below MIN_PBKDF2_ITERATIONS or
+        MIN_SCRYPT_N, so a slow host may take longer than target_ms, nor
+        past the limits check_kdf() enforces, so a fast host or a long
+        target may take less.
+
+        Args:
+            target_ms: Target key derivation time in milliseconds
+            algorithm: 'scrypt' or 'pbkdf2-sha256'
+
+        Returns:
+            KDF parameters for encrypt_wallet
+
+        Raises:
+            ValueError: If the algorithm is unknown or the target is not positive
+        """
+        if target_ms <= 0:
+            raise ValueError("Target time must be positive")
+        target = target_ms / 1000.0
+        salt = os.urandom(16)
+
+        def timed(kdf):
+            start = time.perf_counter()
+            WalletEncryption._derive_key('calibration', salt, kdf)
+            return time.perf_counter() - start
+
+        if algorithm == 'pbkdf2-sha256':
+            count = WalletEncryption.CALIBRATION_ITERATIONS
+            elapsed = timed({'name': algorithm, 'iterations': count})
+            iterations = int(count * target / max(elapsed, 1e-9)) // 1000 * 1000
+            return {'name': algorithm,
+                    'iterations': min(max(iterations, WalletEncryption.MIN_PBKDF2_ITERATIONS),
+                                      WalletEncryption.MAX_PBKDF2_ITERATIONS)}
+
+        if algorithm == 'scrypt':
+            kdf = {'name': algorithm, 'n': WalletEncryption.MIN_SCRYPT_N, 'r': 8, 'p': 1}
+            elapsed = timed(kdf)
+            while (elapsed * 2 <= target
+                   and 2 * kdf['n'] * 8 <= WalletEncryption.SCRYPT_MAX_COST
+                   and 128 * 8 * 2 * kdf['n'] <= WalletEncryption.SCRYPT_MAX_MEMORY):
+                kdf['n'] *= 2
+                elapsed = timed(kdf)
+            return kdf
+
+        raise ValueError(f"Unknown KDF '{algorithm}'. Available: {', '.join(WalletEncryption.KDF_NAMES)}")
+
+    @staticmethod
+    def encrypt_wallet(wallet_data: Dict[str, Any], password: str,
+                       session: Optional['KeySession'] = None,
+                       file_path: Optional[str] = None,
+                       kdf: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Encrypt wallet data with a password.
 
+        The file records its KDF and parameters (format version "2"). With
+        a session and the destination file, a key derived for that file
+        with the same password in the session is reused together with its
+        salt and KDF parameters, so re-saving skips the key derivation.
+
         Args:
             wallet_data: Wallet dictionary to encrypt
             password: Password for encryption
+            session: Key session to reuse and store derived keys in
+            file_path: File the encrypted wallet will be written to (with session)
+            kdf: KDF parameters for a new key, e.g. from calibrate() (default: default_kdf())
 
         Returns:
-            Dictionary containing encrypted data and salt
+            Dictionary containing the format version, KDF parameters, salt and encrypted data
 
         Raises:
             EncryptionError: If encryption fails
         """
         try:
-            # Generate a random salt
-            import os
-            salt = os.urandom(16)
+            use_session = session is not None and file_path is not None
+            cached = session.get(file_path, password) if use_session else None
+            if cached is not None:
+                salt, key, kdf = cached
+            else:
+                kdf = WalletEncryption.check_kdf(kdf or WalletEncryption.default_kdf())
+
+                # Generate a random salt
+                salt = os.urandom(16)
 
-            # Derive encryption key from password
-            key = WalletEncryption._derive_key(password, salt)
+                # Derive encryption key from password
+                key = WalletEncryption._derive_key(password, salt, kdf)
+                if use_session:
+                    session.store(file_path, password, salt, key, kdf)
 
             # Create Fernet cipher
             fernet = Fernet(key)
@@ -77,7 +222,8 @@ class WalletEncryption:
 
             # Return encrypted data with salt (both base64 encoded for JSON storage)
             return {
-                'version': '1',  # Version for future compatibility
+                'version': WalletEncryption.VERSION,
+                'kdf': kdf,
                 'salt': base64.b64encode(salt).decode('utf-8'),
                 'data': encrypted_data.decode('utf-8')
             }
@@ -86,13 +232,22 @@ class WalletEncryption:
             raise EncryptionError(f"Encryption failed: {str(e)}") from e
 
     @staticmethod
-    def decrypt_wallet(encrypted_wallet: Dict[str, str], password: str) -> Dict[str, Any]:
+    def decrypt_wallet(encrypted_wallet: Dict[str, str], password: str,
+                       session: Optional['KeySession'] = None,
+                       file_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Decrypt wallet data with a password.
 
+        Version "2" files name their KDF and parameters; version "1" files
+        use PBKDF2 with 480,000 iterations. With a session and the source
+        file, the key is taken from the session when possible, and stored
+        in it after a successful decrypt.
+
         Args:
             encrypted_wallet: Dictionary containing encrypted data and salt
             password: Password for decryption
+            session: Key session to reuse and store derived keys in
+            file_path: File the encrypted wallet was read from (with session)
 
         Returns:
             Decrypted wallet dictionary
@@ -102,12 +257,21 @@ class WalletEncryption:
             DecryptionError: If decryption fails for other reasons
         """
         try:
-            # Extract salt and encrypted data
+            # Extract KDF parameters, salt and encrypted data
+            version = encrypted_wallet['version']
+            if version == '1':
+                kdf = _V1_KDF
+            elif version == '2':
+                kdf = WalletEncryption.check_kdf(encrypted_wallet['kdf'])
+            else:
+                raise ValueError(f"Unsupported wallet format version: {version}")
             salt = base64.b64decode(encrypted_wallet['salt'])
             encrypted_data = encrypted_wallet['data'].encode('utf-8')
 
             # Derive the same key from password and salt
-            key = WalletEncryption._derive_key(password, salt)
+            use_session = session is not None and file_path is not None
+            cached = session.get(file_path, password, salt, kdf) if use_session else None
+            key = cached[1] if cached is not None else WalletEncryption._derive_key(password, salt, kdf)
 
             # Create Fernet cipher
             fernet = Fernet(key)
@@ -116,6 +280,8 @@ class WalletEncryption:
             try:
                 decrypted_data = fernet.decrypt(encrypted_data)
                 wallet_data = json.loads(decrypted_data.decode('utf-8'))
+                if use_session and cached is None:
+                    session.store(file_path, password, salt, key, kdf)
                 return wallet_data
 
             except InvalidToken:
@@ -138,3 +304,135 @@ class WalletEncryption:
             True if data appears to be encrypted
         """
         return 'version' in data and 'salt' in data and 'data' in data
+
+
+class KeySession:
+    """
+    In-memory cache of derived wallet keys, per (file, salt, KDF parameters).
+
+    Each key is kept until it has not been used for `ttl` seconds, and is
+    only handed out again for the same file and password. Keys are held in
+    bytearrays that lock() overwrites with zeros; copies made by Fernet and
+    the caller's password string are outside the session's reach.
+
+    Call lock() when the user locks the wallet, and close() on exit.
+    """
+
+    # Seconds an unused key stays cached
+    DEFAULT_TTL = 300.0
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        """
+        Initialize session.
+
+        Args:
+            ttl: Seconds an unused key stays cached
+        """
+        if ttl <= 0:
+            raise ValueError("TTL must be positive")
+        self.ttl = ttl
+        self._entries: Dict[str, dict] = {}
+        # Passwords are compared by keyed hash; the key never leaves memory
+        self._secret = os.urandom(32)
+        self._lock = threading.Lock()
+
+    def _password_tag(self, password: str) -> bytes:
+        return hmac.new(self._secret, password.encode('utf-8'), hashlib.sha256).digest()
+
+    @staticmethod
+    def _file_key(file_path: str) -> str:
+        return os.path.realpath(os.fspath(file_path))
+
+    def get(self, file_path: str, password: str, salt: Optional[bytes] = None,
+            kdf: Optional[Dict[str, Any]] = None) -> Optional[Tuple[bytes, bytes, Dict[str, Any]]]:
+        """
+        Look up the cached key of a file.
+
+        Args:
+            file_path: Wallet file
+            password: Password the key must have been derived from
+            salt: Salt the key must have been derived with (default: any)
+            kdf: KDF parameters the key must have been derived with (default: any)
+
+        Returns:
+            Tuple of (salt, Fernet key, KDF parameters), or None if there is no live match
+        """
+        file_key = self._file_key(file_path)
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(file_key)
+            if entry is None or (salt is not None and entry['salt'] != salt):
+                return None
+            if kdf is not None and entry['kdf'] != kdf:
+                return None
+            if not hmac.compare_digest(entry['password'], self._password_tag(password)):
+                return None
+            entry['used'] = time.monotonic()
+            return entry['salt'], bytes(entry['key']), dict(entry['kdf'])
+
+    def store(self, file_path: str, password: str, salt: bytes, key: bytes,
+              kdf: Dict[str, Any]):
+        """
+        Cache the key of a file, replacing its previous key.
+
+        Args:
+            file_path: Wallet file
+            password: Password the key was derived from
+            salt: Salt the key was derived with
+            key: Fernet key
+            kdf: KDF parameters the key was derived with
+        """
+        file_key = self._file_key(file_path)
+        with self._lock:
+            self._wipe(self._entries.pop(file_key, None))
+            self._entries[file_key] = {
+                'salt': salt,
+                'kdf': dict(kdf),
+                'key': bytearray(key),
+                'password': self._password_tag(password),
+                'used': time.monotonic()
+            }
+
+    def forget(self, file_path: str):
+        """
+        Wipe the cached key of one file.
+
+        Args:
+            file_path: Wallet file
+        """
+        with self._lock:
+            self._wipe(self._entries.pop(self._file_key(file_path), None))
+
+    def lock(self):
+        """Wipe every cached key."""
+        with self._lock:
+            for entry in self._entries.values():
+                self._wipe(entry)
+            self._entries.clear()
+
+    def close(self):
+        """Wipe every cached key (alias of lock(), for use on exit)."""
+        self.lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._entries)
+
+    def _expire(self):
+        """Wipe keys unused for longer than the TTL (caller holds the lock)."""
+        now = time.monotonic()
+        for file_key in [k for k, e in self._entries.items() if now - e['used'] > self.ttl]:
+            self._wipe(self._entries.pop(file_key))
+
+    @staticmethod
+    def _wipe(entry: Optional[dict]):
+        if entry is not None:
+            key = entry['key']
+            key[:] = bytes(len(key))
@@ -2,6 +2,24 @@
 
 import hashlib
 import hmac
+import os
+import time
+from typing import Dict, List
+
+from . import ripemd160 as _ripemd160_py
+
+
+def _openssl_ripemd160_available() -> bool:
+    """Check whether hashlib provides RIPEMD-160 (OpenSSL 3 may not)."""
+    try:
+        hashlib.new('ripemd160')
+    except ValueError:
+        return False
+    return True
+
+
+# True when hashlib provides RIPEMD-160; otherwise the in-tree implementation is used
+OPENSSL_RIPEMD160 = _openssl_ripemd160_available()
 
 
 def sha256(data: bytes) -> bytes:
@@ -11,7 +29,9 @@ def sha256(data: bytes) -> bytes:
 
 def ripemd160(data: bytes) -> bytes:
     """RIPEMD160 hash."""
-    return hashlib.new('ripemd160', data).digest()
+    if OPENSSL_RIPEMD160:
+        return hashlib.new('ripemd160', data).digest()
+    return _ripemd160_py.ripemd160(data)
 
 
 def hash160(data: bytes) -> bytes:
@@ -19,6 +39,123 @@ def hash160(data: bytes) -> bytes:
     return ripemd160(sha256(data))
 
 
+def hash160_batch(items: List[bytes]) -> List[bytes]:
+    """
+    SHA256 followed by RIPEMD160 for many inputs (e.g. 33-byte pubkeys).
+
+    Hash constructors are bound once per call, and with the in-tree
+    RIPEMD-160 the single-block padding of the 32-byte SHA256 digests is
+    shared by the whole batch.
+
+    Args:
+        items: List of byte strings
+
+    Returns:
+        List of 20-byte digests, in the same order
+    """
+    if OPENSSL_RIPEMD160:
+        return _hash160_batch_openssl(items)
+    return _hash160_batch_builtin(items)
+
+
+def _hash160_batch_openssl(items: List[bytes]) -> List[bytes]:
+    """hash160_batch with hashlib's RIPEMD-160."""
+    _sha256 = hashlib.sha256
+    copy = hashlib.new('ripemd160').copy
+    results = []
+    for item in items:
+        h = copy()
+        h.update(_sha256(item).digest())
+        results.append(h.digest())
+    return results
+
+
+def _hash160_batch_builtin(items: List[bytes]) -> List[bytes]:
+    """hash160_batch with the in-tree RIPEMD-160."""
+    _sha256 = hashlib.sha256
+    return _ripemd160_py.ripemd160_32_batch(_sha256(item).digest() for item in items)
+
+
+def benchmark_hash160(count: int = 1000) -> Dict[str, float]:
+    """
+    Time hash160 with the OpenSSL and in-tree RIPEMD-160, and keep the faster.
+
+    Both implementations are timed directly; OPENSSL_RIPEMD160 is only set
+    once, after timing, so concurrent hash160 calls never see it flip.
+
+    Args:
+        count: Number of random 33-byte inputs to hash
+
+    Returns:
+        Dictionary of 'openssl' (only if available) and 'builtin' to
+        seconds per hash
+    """
+    global OPENSSL_RIPEMD160
+    items = [os.urandom(33) for _ in range(count)]
+    candidates = {'builtin': _hash160_batch_builtin}
+    if _openssl_ripemd160_available():
+        candidates['openssl'] = _hash160_batch_openssl
+
+    timings = {}
+    for name, batch in candidates.items():
+        start = time.perf_counter()
+        batch(items)
+        timings[name] = (time.perf_counter() - start) / count
+
+    OPENSSL_RIPEMD160 = 'openssl' in timings and timings['openssl'] <= timings['builtin']
+    return timings
+
+
 def hmac_sha512(key: bytes, data: bytes) -> bytes:
     """HMAC-SHA512."""
     return hmac.new(key, data, hashlib.sha512).digest()
+
+
+# XOR tables for the HMAC pads
+_IPAD = bytes(x ^ 0x36 for x in range(256))
+_OPAD = bytes(x ^ 0x5C for x in range(256))
+
+
+class HmacSha512:
+    """
+    HMAC-SHA512 keyed once and reused for many messages.
+
+    The inner and outer pad states are hashed when the context is created,
+    so each digest() only copies them and hashes the message. Use one
+    context per key, e.g. per parent chain code when deriving siblings.
+    Contexts hold hashlib objects and cannot be pickled.
+    """
+
+    __slots__ = ('_inner', '_outer')
+
+    _BLOCK_SIZE = 128
+
+    def __init__(self, key: bytes):
+        """
+        Initialize context.
+
+        Args:
+            key: HMAC key
+        """
+        if len(key) > self._BLOCK_SIZE:
+            key = hashlib.sha512(key).digest()
+        key = key.ljust(self._BLOCK_SIZE, b'\x00')
+        self._inner = hashlib.sha512(key.translate(_IPAD))
+        self._outer = hashlib.sha512(key.translate(_OPAD))
+
+    def digest(self, data: bytes) -> bytes:
+        """
+        HMAC-SHA512 of one message.
+
+        Args:
+            data: Message
+
+        Returns:
+            64-byte MAC
+        """
+        inner = self._inner.copy()
+        inner.update(data)
+        outer = self._outer.copy()
+        outer.update(inner.digest())
+        return outer.digest()
+
@@ -0,0 +1,154 @@
+"""Pure-Python RIPEMD-160.
+
+Used by crypto.hashing when hashlib has no 'ripemd160' (OpenSSL 3 builds
+without the legacy provider). The five rounds of each line are unrolled
+into separate loops with their boolean function inlined, and the message
+word order, rotation amounts and constants are precomputed per round.
+"""
+
+import struct
+
+_M = 0xFFFFFFFF
+
+# Message word selection, left and right lines
+_RL = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15),
+    (7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8),
+    (3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12),
+    (1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2),
+    (4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13),
+)
+_RR = (
+    (5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12),
+    (6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2),
+    (15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13),
+    (8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14),
+    (12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11),
+)
+
+# Rotation amounts, left and right lines
+_SL = (
+    (11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8),
+    (7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12),
+    (11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5),
+    (11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12),
+    (9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6),
+)
+_SR = (
+    (8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6),
+    (9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11),
+    (9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5),
+    (15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8),
+    (8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11),
+)
+
+# Round constants
+_KL = (0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E)
+_KR = (0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000)
+
+# Per-round (word, rotation, 32 - rotation) steps, so the loops do no index math
+_STEPS_L = tuple(tuple((r, s, 32 - s) for r, s in zip(_RL[j], _SL[j])) for j in range(5))
+_STEPS_R = tuple(tuple((r, s, 32 - s) for r, s in zip(_RR[j], _SR[j])) for j in range(5))
+
+_IV = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+
+_WORDS = struct.Struct('<16I')
+_DIGEST = struct.Struct('<5I')
+
+# Padding of a single 32-byte message (the hash160 case): 0x80, zeros, bit length 256
+_PAD32 = b'\x80' + bytes(23) + struct.pack('<Q', 256)
+
+
+def _compress(h, x):
+    """Process one 64-byte block (as 16 little-endian words) into state h."""
+    m = _M
+    al, bl, cl, dl, el = h
+    ar, br, cr, dr, er = h
+
+    # Left line
+    k = _KL[0]
+    for r, s, t in _STEPS_L[0]:
+        v = (al + (bl ^ cl ^ dl) + x[r] + k) & m
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & m, bl, (((v << s) | (v >> t)) + el) & m
+    k = _KL[1]
+    for r, s, t in _STEPS_L[1]:
+        v = (al + ((bl & cl) | (~bl & dl)) + x[r] + k) & m
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & m, bl, (((v << s) | (v >> t)) + el) & m
+    k = _KL[2]
+    for r, s, t in _STEPS_L[2]:
+        v = (al + ((bl | (~cl & m)) ^ dl) + x[r] + k) & m
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & m, bl, (((v << s) | (v >> t)) + el) & m
+    k = _KL[3]
+    for r, s, t in _STEPS_L[3]:
+        v = (al + ((bl & dl) | (cl & ~dl)) + x[r] + k) & m
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & m, bl, (((v << s) | (v >> t)) + el) & m
+    k = _KL[4]
+    for r, s, t in _STEPS_L[4]:
+        v = (al + (bl ^ (cl | (~dl & m))) + x[r] + k) & m
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & m, bl, (((v << s) | (v >> t)) + el) & m
+
+    # Right line (boolean functions in reverse order)
+    k = _KR[0]
+    for r, s, t in _STEPS_R[0]:
+        v = (ar + (br ^ (cr | (~dr & m))) + x[r] + k) & m
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & m, br, (((v << s) | (v >> t)) + er) & m
+    k = _KR[1]
+    for r, s, t in _STEPS_R[1]:
+        v = (ar + ((br & dr) | (cr & ~dr)) + x[r] + k) & m
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & m, br, (((v << s) | (v >> t)) + er) & m
+    k = _KR[2]
+    for r, s, t in _STEPS_R[2]:
+        v = (ar + ((br | (~cr & m)) ^ dr) + x[r] + k) & m
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & m, br, (((v << s) | (v >> t)) + er) & m
+    k = _KR[3]
+    for r, s, t in _STEPS_R[3]:
+        v = (ar + ((br & cr) | (~br & dr)) + x[r] + k) & m
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & m, br, (((v << s) | (v >> t)) + er) & m
+    k = _KR[4]
+    for r, s, t in _STEPS_R[4]:
+        v = (ar + (br ^ cr ^ dr) + x[r] + k) & m
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & m, br, (((v << s) | (v >> t)) + er) & m
+
+    h0, h1, h2, h3, h4 = h
+    return ((h1 + cl + dr) & m, (h2 + dl + er) & m, (h3 + el + ar) & m,
+            (h4 + al + br) & m, (h0 + bl + cr) & m)
+
+
+def ripemd160(data: bytes) -> bytes:
+    """
+    RIPEMD-160 hash.
+
+    Args:
+        data: Message
+
+    Returns:
+        20-byte digest
+    """
+    if len(data) == 32:
+        return _DIGEST.pack(*_compress(_IV, _WORDS.unpack(data + _PAD32)))
+
+    length = len(data)
+    data = bytes(data) + b'\x80' + bytes((55 - length) % 64) + struct.pack('<Q', 8 * length)
+    h = _IV
+    unpack = _WORDS.unpack_from
+    for offset in range(0, len(data), 64):
+        h = _compress(h, unpack(data, offset))
+    return _DIGEST.pack(*h)
+
+
+def ripemd160_32_batch(messages) -> list:
+    """
+    RIPEMD-160 of many 32-byte messages (e.g. SHA256 digests).
+
+    Args:
+        messages: Iterable of 32-byte messages
+
+    Returns:
+        List of 20-byte digests, in the same order
+    """
+    compress = _compress
+    iv = _IV
+    pad = _PAD32
+    unpack = _WORDS.unpack
+    pack = _DIGEST.pack
+    return [pack(*compress(iv, unpack(msg + pad))) for msg in messages]
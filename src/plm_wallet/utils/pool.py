@@ -0,0 +1,75 @@
+"""Ordered process-pool map shared by the parallel wallet APIs."""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from ..crypto import secp256k1
+from ..crypto.backends import get_backend, select_backend
+
+
+def ordered_pool_map(fn: Callable, tasks: Iterable[tuple], workers: Optional[int] = None,
+                     cancel_event: Optional[threading.Event] = None,
+                     initializer: Optional[Callable] = None,
+                     initargs: tuple = ()) -> Iterator[Tuple[tuple, object]]:
+    """
+    Run fn(*task) for each task on a process pool, yielding in task order.
+
+    Tasks are taken from the iterable lazily and at most two per worker are
+    in flight, so memory stays bounded even for endless task streams.
+    Workers select this process' ECC backend instead of re-running the
+    benchmark; with the native backend they also receive its generator
+    table, built once here rather than in every worker. When iteration
+    stops early (break, exception, cancel or close()), tasks not yet
+    started are cancelled.
+
+    Args:
+        fn: Module-level function run in the workers
+        tasks: Argument tuples, one per call
+        workers: Number of worker processes (default: CPU count)
+        cancel_event: Checked before each result; when set, iteration stops
+        initializer: Extra per-worker setup, run after the backend is selected
+        initargs: Arguments for initializer
+
+    Yields:
+        Tuples of (task, result), in task order
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = iter(tasks)
+    pending = deque()
+    backend = get_backend()
+    table = secp256k1.generator_table() if backend.name == 'native' else None
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(backend.name, table, initializer, initargs)) as pool:
+        def submit_next():
+            task = next(tasks, None)
+            if task is not None:
+                pending.append((task, pool.submit(fn, *task)))
+
+        try:
+            for _ in range(workers * 2):
+                submit_next()
+
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                task, future = pending.popleft()
+                result = future.result()
+                submit_next()
+                yield task, result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _init_worker(backend_name: str, table: Optional[secp256k1.GeneratorTable],
+                 initializer: Optional[Callable], initargs: tuple):
+    """Process-pool initializer: select the parent's backend, then run the extra setup."""
+    if table is not None:
+        secp256k1.install_generator_table(table)
+    select_backend(backend_name)
+    if initializer is not None:
+        initializer(*initargs)
@@ -13,6 +13,10 @@ def normalize_text(text: str) -> str:
     Returns:
         Normalized text
     """
+    # ASCII is unchanged by NFKD and has no combining characters
+    if text.isascii():
+        return ' '.join(text.lower().split())
+
     # Normalize to NFKD
     text = unicodedata.normalize('NFKD', text)
     # Lowercase
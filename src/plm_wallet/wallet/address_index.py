@@ -0,0 +1,297 @@
+"""Persistent reverse index from address (witness program) to derivation path."""
+
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from ..config.constants import HRP
+from ..core.derivation import derive_child_node
+from ..core.keys import ExtendedKey
+from ..crypto.encoding import decode_address
+from ..crypto.hashing import hash160
+from .generator import derive_chain_witprogs
+
+# File layout: header, then fixed-width records sorted by witness program
+INDEX_MAGIC = b'PLMADDRX'
+INDEX_VERSION = 1
+# magic, version, account id, (start, stop) for chains 0 and 1, record count
+_HEADER = struct.Struct('>8sI20sIIIIQ')
+# witness program, chain, index
+_RECORD = struct.Struct('>20sBI')
+
+# Records sorted in memory before being spilled to a temporary run file
+RUN_SIZE = 1 << 20
+
+# Addresses derived per batch while building
+_DERIVE_BATCH = 1024
+
+
+def account_id(account: ExtendedKey) -> bytes:
+    """
+    Identify an account without storing its key.
+
+    Args:
+        account: Account node (private or public-only)
+
+    Returns:
+        20-byte identifier (hash160 of pubkey and chain code)
+    """
+    return hash160(account.pubkey + account.chain_code)
+
+
+class AddressIndex:
+    """
+    Memory-mapped, sorted table of (witness program -> chain, index).
+
+    Lookups are a binary search over fixed-width records of the mapped file,
+    so they take microseconds even for tens of millions of addresses, and
+    opening an index only reads its header.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open an existing index.
+
+        Args:
+            path: Index file path
+
+        Raises:
+            ValueError: If the file is not a valid index
+        """
+        self.path = Path(path)
+        self._open()
+
+    def _open(self):
+        """Map the index file and read its header."""
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Not an address index: {self.path}")
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Not an address index: {self.path}")
+        magic, version, ident, s0, e0, s1, e1, count = _HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or \
+                len(self._map) != _HEADER.size + count * _RECORD.size:
+            self.close()
+            raise ValueError(f"Not an address index (or truncated): {self.path}")
+
+        self.account_id = ident
+        self.ranges: Dict[int, Tuple[int, int]] = {0: (s0, e0), 1: (s1, e1)}
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmap and close the index file."""
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _mapped(self) -> mmap.mmap:
+        """Return the mapped file, or raise if the index was closed."""
+        if self._map is None:
+            raise ValueError("index is closed")
+        return self._map
+
+    def lookup(self, address: Union[str, bytes], hrp: str = HRP) -> Optional[Tuple[int, int]]:
+        """
+        Find the derivation position of an address.
+
+        A well-formed address of another network (different HRP) or of
+        another type is not in the index, so it returns None as well.
+
+        Args:
+            address: Bech32 address or 20-byte witness program
+            hrp: Human-readable part for address strings
+
+        Returns:
+            Tuple of (chain, index), or None if the address is not indexed
+
+        Raises:
+            ValueError: If the address string is not a valid segwit address,
+                or the index is closed
+        """
+        if isinstance(address, str):
+            # Validate against the address' own HRP, then check it is ours
+            address_hrp = address[:address.rfind('1')].lower()
+            if not address_hrp:
+                raise ValueError(f"Invalid address: {address}")
+            witver, witprog = decode_address(address_hrp, address)
+            if address_hrp != hrp or witver != 0:
+                return None
+        else:
+            witprog = bytes(address)
+        data = self._mapped()
+        if len(witprog) != 20:
+            return None
+
+        size = _RECORD.size
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            offset = _HEADER.size + mid * size
+            if data[offset:offset + 20] < witprog:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            key, chain, index = _RECORD.unpack_from(data, _HEADER.size + lo * size)
+            if key == witprog:
+                return chain, index
+        return None
+
+    def records(self) -> Iterator[bytes]:
+        """Iterate over the raw sorted records (ValueError if the index is closed)."""
+        data = self._mapped()
+        size = _RECORD.size
+        for i in range(self._count):
+            offset = _HEADER.size + i * size
+            yield data[offset:offset + size]
+
+    @classmethod
+    def build(cls, path: Union[str, Path], account: ExtendedKey, stop: int,
+              chains: Tuple[int, ...] = (0, 1), start: int = 0) -> 'AddressIndex':
+        """
+        Build an index for indexes [start, stop) of the given chains.
+
+        Args:
+            path: Index file path (overwritten)
+            account: Account node (private or public-only)
+            stop: Index to stop before
+            chains: Chains to index (0 external, 1 internal)
+            start: First address index
+
+        Returns:
+            Opened index
+        """
+        ranges = {chain: (start, stop) if chain in chains else (0, 0) for chain in (0, 1)}
+        _write_index(path, account_id(account), ranges,
+                     [(account, chain, start, stop) for chain in chains], existing=None)
+        return cls(path)
+
+    def extend(self, account: ExtendedKey, stop: int) -> 'AddressIndex':
+        """
+        Grow every indexed chain up to a new stop index.
+
+        Only the new indexes are derived; they are merged with the existing
+        records into a new file that atomically replaces this one, and this
+        object is remapped onto it, so existing handles stay valid.
+
+        Args:
+            account: The account the index was built from
+            stop: New index to stop before
+
+        Returns:
+            This index, extended
+
+        Raises:
+            ValueError: If the account does not match the index
+        """
+        if account_id(account) != self.account_id:
+            raise ValueError("Account does not match this address index")
+
+        work = []
+        ranges = dict(self.ranges)
+        for chain, (start, old_stop) in self.ranges.items():
+            if old_stop > start and stop > old_stop:
+                work.append((account, chain, old_stop, stop))
+                ranges[chain] = (start, stop)
+        if not work:
+            return self
+
+        _write_index(self.path, self.account_id, ranges, work, existing=self)
+        self._open()
+        return self
+
+
+def _derive_records(account: ExtendedKey, chain: int, start: int, stop: int) -> Iterator[bytes]:
+    """Derive raw (unsorted) records for indexes [start, stop) of a chain."""
+    chain_node = derive_child_node(account, chain)
+    for batch_start in range(start, stop, _DERIVE_BATCH):
+        indexes = list(range(batch_start, min(batch_start + _DERIVE_BATCH, stop)))
+        for i, witprog in zip(indexes, derive_chain_witprogs(chain_node, indexes)):
+            yield _RECORD.pack(witprog, chain, i)
+
+
+def _read_run(f) -> Iterator[bytes]:
+    """Iterate over records of a spilled run file."""
+    size = _RECORD.size
+    while True:
+        block = f.read(size * 4096)
+        if not block:
+            return
+        for offset in range(0, len(block), size):
+            yield block[offset:offset + size]
+
+
+def _write_index(path: Union[str, Path], ident: bytes, ranges: Dict[int, Tuple[int, int]],
+                 work: List[Tuple[ExtendedKey, int, int, int]],
+                 existing: Optional[AddressIndex]):
+    """
+    Write a sorted index file from new derivation work plus existing records.
+
+    New records are sorted in runs of RUN_SIZE and spilled to temporary
+    files, then k-way merged with the existing records, so memory stays
+    bounded by one run regardless of the index size.
+    """
+    path = Path(path)
+    runs = []
+    try:
+        run: List[bytes] = []
+        for account, chain, start, stop in work:
+            for record in _derive_records(account, chain, start, stop):
+                run.append(record)
+                if len(run) >= RUN_SIZE:
+                    runs.append(_spill_run(run, path.parent))
+                    run = []
+        run.sort()
+
+        sources = [_read_run(f) for f in runs] + [iter(run)]
+        if existing is not None:
+            sources.append(existing.records())
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                out.write(b'\x00' * _HEADER.size)
+                count = 0
+                for record in heapq.merge(*sources):
+                    out.write(record)
+                    count += 1
+                out.seek(0)
+                out.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, ident,
+                                       *ranges[0], *ranges[1], count))
+            if existing is not None:
+                existing.close()
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    finally:
+        for f in runs:
+            f.close()
+
+
+def _spill_run(run: List[bytes], directory: Path):
+    """Sort a run and write it to an anonymous temporary file."""
+    run.sort()
+    f = tempfile.TemporaryFile(dir=directory)
+    f.write(b''.join(run))
+    f.seek(0)
+    return f
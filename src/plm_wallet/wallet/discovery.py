@@ -0,0 +1,242 @@
+"""Gap-limit account discovery against a local set of used addresses."""
+
+from array import array
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+from ..config.constants import HRP
+from ..core.derivation import derive_child_node
+from ..core.keys import ExtendedKey
+from ..crypto.encoding import decode_address
+from .generator import derive_chain_witprogs
+from .wallet import PLMWallet
+
+# BIP44 default: stop after this many consecutive unused addresses
+DEFAULT_GAP_LIMIT = 20
+
+
+class UsedAddressSet:
+    """
+    Compact hash set of P2WPKH witness programs.
+
+    Each entry is stored as the first 8 bytes of its 20-byte witness program
+    in an open-addressing table backed by array('Q'), so tens of millions of
+    entries take a few hundred MB instead of gigabytes of Python objects.
+    Witness programs are hash160 outputs, so the 64-bit prefixes are
+    uniformly distributed and collisions between different programs are
+    negligible.
+    """
+
+    # Resize when the table is more than 70% full
+    _MAX_LOAD = 0.7
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize set.
+
+        Args:
+            capacity: Expected number of entries (the table grows as needed)
+        """
+        size = 16
+        while size * self._MAX_LOAD < capacity:
+            size <<= 1
+        self._table = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    @staticmethod
+    def _key(witprog: bytes) -> int:
+        # Zero marks an empty slot
+        return int.from_bytes(witprog[:8], 'little') or 1
+
+    def _insert(self, key: int) -> bool:
+        table = self._table
+        mask = self._mask
+        i = key & mask
+        while True:
+            slot = table[i]
+            if slot == 0:
+                table[i] = key
+                return True
+            if slot == key:
+                return False
+            i = (i + 1) & mask
+
+    def _grow(self):
+        old = self._table
+        self._table = array('Q', bytes(16 * len(old)))
+        self._mask = len(self._table) - 1
+        for key in old:
+            if key:
+                self._insert(key)
+
+    def add(self, witprog: bytes):
+        """
+        Add a witness program.
+
+        Args:
+            witprog: 20-byte witness program (hash160 of the public key)
+        """
+        if (self._count + 1) > len(self._table) * self._MAX_LOAD:
+            self._grow()
+        if self._insert(self._key(witprog)):
+            self._count += 1
+
+    def __contains__(self, witprog: bytes) -> bool:
+        key = self._key(witprog)
+        table = self._table
+        mask = self._mask
+        i = key & mask
+        while True:
+            slot = table[i]
+            if slot == key:
+                return True
+            if slot == 0:
+                return False
+            i = (i + 1) & mask
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def parse_used_entry(entry: str, hrp: str = HRP) -> Optional[bytes]:
+    """
+    Extract the P2WPKH witness program from one used-address entry.
+
+    Accepted formats: a bech32 address, a hex scriptPubKey (0014 + 20 bytes)
+    or a bare 20-byte hex witness program.
+
+    Args:
+        entry: Line from a used-address dump
+        hrp: Human-readable part of our addresses
+
+    Returns:
+        20-byte witness program, or None if the entry cannot belong to us
+    """
+    entry = entry.strip()
+    if not entry or entry.startswith('#'):
+        return None
+
+    if entry.lower().startswith(hrp + '1'):
+        try:
+            witver, witprog = decode_address(hrp, entry)
+        except ValueError:
+            return None
+        return witprog if witver == 0 and len(witprog) == 20 else None
+
+    try:
+        raw = bytes.fromhex(entry)
+    except ValueError:
+        return None
+    if len(raw) == 22 and raw[:2] == b'\x00\x14':
+        return raw[2:]
+    if len(raw) == 20:
+        return raw
+    return None
+
+
+def load_used_addresses(source: Union[str, Path, Iterable[str]], hrp: str = HRP) -> UsedAddressSet:
+    """
+    Load a dump of used addresses or scriptPubKeys into a compact set.
+
+    The file is streamed line by line, so only the set itself is kept in memory.
+
+    Args:
+        source: Path to a text file with one entry per line, or an iterable of entries
+        hrp: Human-readable part of our addresses
+
+    Returns:
+        UsedAddressSet with the P2WPKH entries (other entries are skipped)
+    """
+    used = UsedAddressSet()
+    if isinstance(source, (str, Path)):
+        with open(source, 'r', encoding='utf-8') as f:
+            _add_entries(used, f, hrp)
+    else:
+        _add_entries(used, source, hrp)
+    return used
+
+
+def _add_entries(used: UsedAddressSet, entries: Iterable[str], hrp: str):
+    for entry in entries:
+        witprog = parse_used_entry(entry, hrp)
+        if witprog is not None:
+            used.add(witprog)
+
+
+def scan_chain(chain_node: ExtendedKey, used: UsedAddressSet,
+               gap_limit: int = DEFAULT_GAP_LIMIT, batch_size: Optional[int] = None) -> Optional[int]:
+    """
+    Find the highest used index of one chain, stopping at the gap limit.
+
+    Addresses are derived in batches, and never past the current limit
+    (last used index + gap_limit).
+
+    Args:
+        chain_node: Chain node (account/0 or account/1), private or public-only
+        used: Set of used witness programs
+        gap_limit: Number of consecutive unused addresses that ends the scan
+        batch_size: Addresses derived per batch (default: gap_limit)
+
+    Returns:
+        Highest used index, or None if no address of the chain is used
+    """
+    batch_size = batch_size or gap_limit
+    last_used = None
+    index = 0
+    while True:
+        limit = min((0 if last_used is None else last_used + 1) + gap_limit, 0x80000000)
+        if index >= limit:
+            return last_used
+
+        indexes = list(range(index, min(index + batch_size, limit)))
+        for i, witprog in zip(indexes, derive_chain_witprogs(chain_node, indexes)):
+            if witprog in used:
+                last_used = i
+        index = indexes[-1] + 1
+
+
+def discover_accounts(wallet: PLMWallet, used: UsedAddressSet, gap_limit: int = DEFAULT_GAP_LIMIT,
+                      batch_size: Optional[int] = None, max_accounts: int = 100) -> List[dict]:
+    """
+    Discover used accounts and chains of a wallet (BIP44 account discovery).
+
+    Accounts m/84h/746h/Nh are scanned in order until one has no used
+    address on either chain. Electrum wallets have a single account (m/0h),
+    and wallets created from an account key scan only that account, at
+    the key's own path.
+
+    Args:
+        wallet: Wallet to scan
+        used: Set of used witness programs
+        gap_limit: Number of consecutive unused addresses that ends a chain
+        batch_size: Addresses derived per batch (default: gap_limit)
+        max_accounts: Upper bound on accounts to scan
+
+    Returns:
+        List of dictionaries with 'account', 'path', 'external' and 'internal'
+        (highest used index per chain, or None), one per used account
+    """
+    if wallet.keys['master'] is None:
+        account = wallet.keys['account']
+        accounts_to_scan = [(account.child_number & 0x7FFFFFFF, wallet.derivation_path, account)]
+    else:
+        base, first = wallet.derivation_path.rsplit('/', 1)
+        numbers = [int(first.rstrip("hH'"))] if wallet.standard == "electrum" else range(max_accounts)
+        accounts_to_scan = ((n, f"{base}/{n}h", None) for n in numbers)
+
+    accounts = []
+    for n, path, account in accounts_to_scan:
+        account = account or wallet.derive_node(path)
+        external = scan_chain(derive_child_node(account, 0), used, gap_limit, batch_size)
+        internal = scan_chain(derive_child_node(account, 1), used, gap_limit, batch_size)
+        if external is None and internal is None:
+            break
+        accounts.append({
+            'account': n,
+            'path': path,
+            'external': external,
+            'internal': internal
+        })
+
+    return accounts
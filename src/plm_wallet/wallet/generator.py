@@ -1,9 +1,28 @@
 """Address generator."""
 
-from typing import List
-from ..core.derivation import derive_normal_child
-from ..core.address import private_key_to_address
-from ..crypto.ecc import private_to_public
+import multiprocessing
+import threading
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+from ..config.constants import HRP
+from ..core.derivation import derive_normal_children, derive_public_children, derive_child_node
+from ..core.address import pubkey_to_address
+from ..core.keys import ExtendedKey
+from ..crypto.encoding import BECH32_CHARSET
+from ..crypto.hashing import hash160_batch
+from ..utils.pool import ordered_pool_map
+
+# Addresses derived per batch by the streaming iterator (bounds memory use)
+ITER_BATCH_SIZE = 256
+
+# Addresses derived per task by the process-pool API
+PARALLEL_CHUNK_SIZE = 2048
+
+# Indexes tried per task by the vanity search
+VANITY_CHUNK_SIZE = 4096
+
+# Shared across vanity workers: lowest matching index found so far
+_vanity_found = None
 
 
 def derive_addresses(account_key: bytes, account_chain_code: bytes,
@@ -11,8 +30,12 @@ def derive_addresses(account_key: bytes, account_chain_code: bytes,
     """
     Derive sequential addresses from account key.
 
+    The account key may be a private key or a compressed public key. With a
+    public key (watch-only, e.g. from a zpub) addresses are derived with
+    CKD_pub and the records carry no 'privkey'.
+
     Args:
-        account_key: Account-level private key
+        account_key: Account-level private key (32 bytes) or public key (33 bytes)
         account_chain_code: Account-level chain code
         count: Number of addresses to generate
         base_path: Base derivation path for display
@@ -20,19 +43,332 @@ def derive_addresses(account_key: bytes, account_chain_code: bytes,
     Returns:
         List of dictionaries with 'path', 'address', 'pubkey', and 'privkey'
     """
-    # Derive /0 (external chain)
-    external_key, external_chain_code = derive_normal_child(account_key, account_chain_code, 0)
-
-    addresses = []
-    for i in range(count):
-        child_key, _ = derive_normal_child(external_key, external_chain_code, i)
-        address = private_key_to_address(child_key)
-        pubkey = private_to_public(child_key)
-        addresses.append({
-            'path': f"{base_path}/0/{i}",
-            'address': address,
-            'pubkey': pubkey.hex(),
-            'privkey': child_key.hex()
-        })
-
-    return addresses
+    return derive_node_addresses(ExtendedKey(account_key, account_chain_code), count, base_path)
+
+
+def derive_node_addresses(account: ExtendedKey, count: int = 10, base_path: str = "") -> List[dict]:
+    """
+    Derive sequential external-chain addresses from an account node.
+
+    Args:
+        account: Account-level node (private or public-only)
+        count: Number of addresses to generate
+        base_path: Base derivation path for display
+
+    Returns:
+        List of dictionaries with 'path', 'address', 'pubkey', and 'privkey'
+        ('privkey' only for private nodes)
+    """
+    return list(iter_node_addresses(account, 0, 0, count, base_path))
+
+
+def iter_node_addresses(account: ExtendedKey, chain: int = 0, start: int = 0,
+                        stop: Optional[int] = None, base_path: str = "") -> Iterator[dict]:
+    """
+    Lazily derive addresses of one chain of an account node.
+
+    Indexes are derived directly, so starting at a large offset costs
+    nothing extra. Work is done in batches of ITER_BATCH_SIZE, keeping
+    memory constant for arbitrarily long ranges. Every public key is
+    computed exactly once: the chain pubkey is cached on its node, and each
+    child pubkey feeds both the address and the record.
+
+    Args:
+        account: Account-level node (private or public-only)
+        chain: 0 for external (receive) addresses, 1 for internal (change)
+        start: First address index
+        stop: Index to stop before (default: end of the non-hardened range)
+        base_path: Base derivation path for display
+
+    Yields:
+        Dictionaries with 'path', 'address', 'pubkey', and 'privkey'
+        ('privkey' only for private nodes)
+    """
+    if chain not in (0, 1):
+        raise ValueError("Chain must be 0 (external) or 1 (internal)")
+    if stop is None:
+        stop = 0x80000000
+    if not 0 <= start <= stop <= 0x80000000:
+        raise ValueError("Address range must satisfy 0 <= start <= stop <= 2^31")
+
+    return _iter_chain_addresses(derive_child_node(account, chain), chain, start, stop, base_path)
+
+
+def _iter_chain_addresses(chain_node: ExtendedKey, chain: int, start: int, stop: int,
+                          base_path: str) -> Iterator[dict]:
+    """Derive address records for indexes [start, stop) of a chain node, in batches."""
+    for batch_start in range(start, stop, ITER_BATCH_SIZE):
+        indexes = list(range(batch_start, min(batch_start + ITER_BATCH_SIZE, stop)))
+        for i, (key, pubkey) in zip(indexes, derive_chain_children(chain_node, indexes)):
+            yield _address_record(f"{base_path}/{chain}/{i}", pubkey, key)
+
+
+def derive_chain_children(chain_node: ExtendedKey,
+                          indexes: List[int]) -> List[Tuple[Optional[bytes], bytes]]:
+    """
+    Derive non-hardened children of a chain node in one batch.
+
+    Private nodes use CKD_priv and public-only nodes CKD_pub; either way the
+    chain pubkey is computed once and the child pubkeys are batched.
+
+    Args:
+        chain_node: Chain node (account/0 or account/1), private or public-only
+        indexes: Child indexes below 2^31
+
+    Returns:
+        List of (private key or None, compressed public key), in index order
+    """
+    if chain_node.is_private:
+        return [(key, pubkey) for key, pubkey, _ in
+                derive_normal_children(chain_node.key, chain_node.chain_code, indexes,
+                                       chain_node.pubkey)]
+    return [(None, pubkey) for pubkey, _ in
+            derive_public_children(chain_node.key, chain_node.chain_code, indexes)]
+
+
+def derive_chain_witprogs(chain_node: ExtendedKey, indexes: List[int]) -> List[bytes]:
+    """
+    Derive the P2WPKH witness programs of a chain node's children.
+
+    No address string is built, which makes this the cheap path for
+    matching against sets of used or known addresses.
+
+    Args:
+        chain_node: Chain node (account/0 or account/1), private or public-only
+        indexes: Child indexes below 2^31
+
+    Returns:
+        List of 20-byte witness programs, in index order
+    """
+    return hash160_batch([pubkey for _, pubkey in derive_chain_children(chain_node, indexes)])
+
+
+def derive_addresses_parallel(account: ExtendedKey, start: int, stop: int, chain: int = 0,
+                              base_path: str = "", workers: Optional[int] = None,
+                              chunk_size: int = PARALLEL_CHUNK_SIZE,
+                              cancel_event: Optional[threading.Event] = None) -> List[dict]:
+    """
+    Derive an address range on a process pool.
+
+    Args:
+        account: Account-level node (private or public-only)
+        start: First address index
+        stop: Index to stop before
+        chain: 0 for external (receive) addresses, 1 for internal (change)
+        base_path: Base derivation path for display
+        workers: Number of worker processes (default: CPU count)
+        chunk_size: Number of indexes derived per task
+        cancel_event: Set it to stop early; the addresses derived so far are returned
+
+    Returns:
+        List of address dictionaries, in index order
+    """
+    return list(iter_addresses_parallel(account, start, stop, chain, base_path,
+                                        workers, chunk_size, cancel_event))
+
+
+def iter_addresses_parallel(account: ExtendedKey, start: int, stop: int, chain: int = 0,
+                            base_path: str = "", workers: Optional[int] = None,
+                            chunk_size: int = PARALLEL_CHUNK_SIZE,
+                            cancel_event: Optional[threading.Event] = None) -> Iterator[dict]:
+    """
+    Derive an address range on a process pool, yielding records in index order.
+
+    The range is split into chunks of chunk_size indexes. Each worker gets
+    the pickled chain node (with its cached pubkey) and derives whole
+    chunks. At most two chunks per worker are in flight, which bounds memory.
+    Results are yielded in index order.
+
+    Args:
+        account: Account-level node (private or public-only)
+        start: First address index
+        stop: Index to stop before
+        chain: 0 for external (receive) addresses, 1 for internal (change)
+        base_path: Base derivation path for display
+        workers: Number of worker processes (default: CPU count)
+        chunk_size: Number of indexes derived per task
+        cancel_event: Checked between chunks; when set, pending chunks are
+                      cancelled and iteration stops
+
+    Yields:
+        Address dictionaries, in index order
+    """
+    if chain not in (0, 1):
+        raise ValueError("Chain must be 0 (external) or 1 (internal)")
+    if not 0 <= start <= stop <= 0x80000000:
+        raise ValueError("Address range must satisfy 0 <= start <= stop <= 2^31")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    chain_node = derive_child_node(account, chain)
+    chain_node.pubkey  # cache it so workers do not recompute it
+
+    chunks = ((chain_node, chain, chunk_start, min(chunk_start + chunk_size, stop), base_path)
+              for chunk_start in range(start, stop, chunk_size))
+    for _, records in ordered_pool_map(_derive_chunk, chunks, workers, cancel_event):
+        yield from records
+
+
+def _derive_chunk(chain_node: ExtendedKey, chain: int, start: int, stop: int,
+                  base_path: str) -> List[dict]:
+    """Worker entry point: derive one chunk of a chain."""
+    return list(_iter_chain_addresses(chain_node, chain, start, stop, base_path))
+
+
+def _address_record(path: str, pubkey: bytes, private_key: Optional[bytes]) -> dict:
+    """Build the output record for one derived address."""
+    record = {
+        'path': path,
+        'address': pubkey_to_address(pubkey),
+        'pubkey': pubkey.hex()
+    }
+    if private_key is not None:
+        record['privkey'] = private_key.hex()
+    return record
+
+
+def vanity_difficulty(prefix: str, hrp: str = HRP) -> int:
+    """
+    Expected number of addresses to try before a prefix matches.
+
+    Args:
+        prefix: Address prefix ('plm1qabc') or its data part ('abc')
+        hrp: Human-readable part of the addresses
+
+    Returns:
+        32 ** number of matched bech32 characters
+    """
+    nbits, _ = _parse_vanity_prefix(prefix, hrp)
+    return 1 << nbits
+
+
+def vanity_search(account: ExtendedKey, prefix: str, chain: int = 0, start: int = 0,
+                  workers: Optional[int] = None, chunk_size: int = VANITY_CHUNK_SIZE,
+                  progress: Optional[Callable[[dict], None]] = None,
+                  cancel_event: Optional[threading.Event] = None,
+                  hrp: str = HRP) -> Optional[Tuple[int, str]]:
+    """
+    Find the lowest child index whose address starts with a prefix.
+
+    Every bech32 character after 'plm1q' encodes 5 bits of the witness
+    program, so candidates are matched by comparing the leading bits of
+    hash160(pubkey) with the decoded prefix; no address string is built
+    until a match is found. Children are derived with batched CKD_pub from
+    the chain pubkey, which works for watch-only accounts too.
+
+    Chunks of indexes run on a process pool. Workers share the lowest
+    matching index found so far and stop as soon as their next index is
+    past it, so the result is the same as a sequential search.
+
+    Args:
+        account: Account-level node (private or public-only)
+        prefix: Address prefix ('plm1qabc') or its data part ('abc')
+        chain: 0 for external (receive) addresses, 1 for internal (change)
+        start: First index to try
+        workers: Number of worker processes (default: CPU count)
+        chunk_size: Number of indexes tried per task
+        progress: Called after each finished chunk with a dictionary of
+                  'attempts', 'rate' (attempts/s), 'difficulty' and 'eta'
+                  (expected seconds to a match at the current rate)
+        cancel_event: Set it to stop the search
+        hrp: Human-readable part of the addresses
+
+    Returns:
+        Tuple of (index, address), or None if cancelled or the range is exhausted
+
+    Raises:
+        ValueError: If the prefix cannot occur in a P2WPKH address
+    """
+    if chain not in (0, 1):
+        raise ValueError("Chain must be 0 (external) or 1 (internal)")
+    if not 0 <= start < 0x80000000:
+        raise ValueError("Start index must satisfy 0 <= start < 2^31")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    nbits, target = _parse_vanity_prefix(prefix, hrp)
+    difficulty = 1 << nbits
+
+    chain_node = derive_child_node(account, chain).neuter()
+    chunks = ((chain_node, chunk_start, min(chunk_start + chunk_size, 0x80000000), nbits, target)
+              for chunk_start in range(start, 0x80000000, chunk_size))
+    attempts = 0
+    began = time.perf_counter()
+
+    found = multiprocessing.Value('q', 0x80000000)
+    results = ordered_pool_map(_vanity_chunk, chunks, workers, cancel_event,
+                               _init_vanity_worker, (found,))
+    try:
+        # Chunks complete in index order here, so the first match is the lowest
+        for _, (index, tried) in results:
+            attempts += tried
+            if index is not None:
+                pubkey = derive_public_children(chain_node.key, chain_node.chain_code,
+                                                [index])[0][0]
+                return index, pubkey_to_address(pubkey, hrp)
+
+            if progress is not None:
+                rate = attempts / max(time.perf_counter() - began, 1e-9)
+                progress({
+                    'attempts': attempts,
+                    'rate': rate,
+                    'difficulty': difficulty,
+                    'eta': difficulty / rate
+                })
+        return None
+    finally:
+        # Stop running chunks at their next batch, then shut the pool down
+        found.value = -1
+        results.close()
+
+
+def _parse_vanity_prefix(prefix: str, hrp: str) -> Tuple[int, int]:
+    """Decode a vanity prefix into (number of bits, leading witness program bits)."""
+    data = prefix.lower()
+    if data.startswith(hrp + '1'):
+        data = data[len(hrp) + 1:]
+        # Witness version 0
+        if not data.startswith('q'):
+            raise ValueError("P2WPKH addresses start with " + hrp + "1q")
+        data = data[1:]
+    # 20-byte program = 32 characters
+    if len(data) > 32:
+        raise ValueError("Prefix is longer than a witness program")
+
+    target = 0
+    for c in data:
+        value = BECH32_CHARSET.find(c)
+        if value < 0:
+            raise ValueError(f"Invalid bech32 character in prefix: '{c}'")
+        target = (target << 5) | value
+    return 5 * len(data), target
+
+
+def _init_vanity_worker(found):
+    """Process-pool initializer for vanity workers."""
+    global _vanity_found
+    _vanity_found = found
+
+
+def _vanity_chunk(chain_node: ExtendedKey, start: int, stop: int,
+                  nbits: int, target: int) -> Tuple[Optional[int], int]:
+    """Worker entry point: try indexes [start, stop), return (match, attempts)."""
+    found = _vanity_found
+    nbytes = (nbits + 7) // 8
+    shift = 8 * nbytes - nbits
+    attempts = 0
+
+    for batch_start in range(start, stop, ITER_BATCH_SIZE):
+        if found.value < batch_start:
+            break
+        indexes = list(range(batch_start, min(batch_start + ITER_BATCH_SIZE, stop)))
+        children = derive_public_children(chain_node.key, chain_node.chain_code, indexes)
+        witprogs = hash160_batch([pubkey for pubkey, _ in children])
+        for i, witprog in zip(indexes, witprogs):
+            attempts += 1
+            if int.from_bytes(witprog[:nbytes], 'big') >> shift == target:
+                with found.get_lock():
+                    if i < found.value:
+                        found.value = i
+                return i, attempts
+
+    return None, attempts
@@ -0,0 +1,608 @@
+"""Recovery of partially known mnemonics and forgotten passphrases.
+
+A search space is enumerated in index order and split into chunks that run
+on a process pool. Cheap filters (the BIP39 checksum or the Electrum seed
+version) run before PBKDF2, so only surviving candidates pay for seed
+stretching and derivation. Progress can be saved to a checkpoint file and
+a later run with the same parameters resumes from it.
+"""
+
+import hashlib
+import json
+import os
+import string
+import threading
+import time
+from itertools import islice
+from functools import partial
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ..config.constants import BIP84_PATH, ELECTRUM_PATH, HRP
+from ..core.derivation import (derive_hardened_child, derive_master_keys, derive_normal_child,
+                               derive_normal_children, parse_path)
+from ..core.keys import parse_extended_key
+from ..core.mnemonic import get_mnemo, is_electrum_segwit
+from ..core.seed import mnemonic_to_seed
+from ..crypto.ecc import private_to_public
+from ..crypto.encoding import decode_address
+from ..crypto.hashing import hash160_batch
+from ..utils.pool import ordered_pool_map
+
+# Candidates per pool task
+RECOVERY_CHUNK_SIZE = 4096
+
+# Addresses of the external chain checked against a target address
+DEFAULT_ADDRESS_COUNT = 20
+
+# Minimum seconds between checkpoint writes
+CHECKPOINT_INTERVAL = 10.0
+
+CHECKPOINT_VERSION = 1
+
+# Passphrase candidates per pool task (each one costs a full PBKDF2 run)
+PASSPHRASE_CHUNK_SIZE = 256
+
+# Mask character classes, as in hashcat: "?l?l?d" is two lowercase letters and a digit
+MASK_CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    's': ' ' + string.punctuation,
+}
+MASK_CHARSETS['a'] = MASK_CHARSETS['l'] + MASK_CHARSETS['u'] + MASK_CHARSETS['d'] + MASK_CHARSETS['s']
+
+# Mutation rules: letter substitutions and suffixes tried on every wordlist entry
+LEET_SUBSTITUTIONS = str.maketrans({'a': '4', 'e': '3', 'i': '1', 'o': '0', 's': '5', 't': '7'})
+MUTATION_SUFFIXES = ('', '!', '1', '12', '123', '1234', '?', '.') + tuple(str(y) for y in range(1970, 2031))
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance, giving up once it exceeds a limit.
+
+    Args:
+        a: First word
+        b: Second word
+        limit: Largest distance of interest
+
+    Returns:
+        Distance, or limit + 1 if it is larger than limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def candidate_words(word: str, max_distance: int = 1) -> List[str]:
+    """
+    List the wordlist words a written-down word may stand for.
+
+    "?" stands for any word. A valid word stands for itself; add a trailing
+    "~" to also try its neighbors. Otherwise the candidates are the words
+    within max_distance edits plus the word matching its first four
+    letters (BIP39 words are unique by their first four letters).
+
+    Args:
+        word: Written word, "?" or "word~"
+        max_distance: Maximum edit distance for misspelled words
+
+    Returns:
+        Candidate words in wordlist order
+
+    Raises:
+        ValueError: If no word is close enough
+    """
+    wordlist = get_mnemo().wordlist
+    word = word.strip().lower()
+    if word == '?':
+        return list(wordlist)
+
+    fuzzy = word.endswith('~')
+    word = word.rstrip('~')
+    if word in wordlist and not fuzzy:
+        return [word]
+
+    candidates = [w for w in wordlist
+                  if edit_distance(word, w, max_distance) <= max_distance
+                  or (len(word) >= 4 and w[:4] == word[:4])]
+    if not candidates:
+        raise ValueError(f"No word within {max_distance} edits of '{word}'")
+    return candidates
+
+
+def recover_mnemonic(words: Union[str, Sequence[str]], target: str, standard: str = "bip39",
+                     passphrase: str = "", max_distance: int = 1,
+                     address_count: int = DEFAULT_ADDRESS_COUNT, path: Optional[str] = None,
+                     workers: Optional[int] = None, chunk_size: int = RECOVERY_CHUNK_SIZE,
+                     checkpoint: Optional[str] = None,
+                     progress: Optional[Callable[[dict], None]] = None,
+                     cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+    """
+    Recover a mnemonic with unknown or misspelled words.
+
+    Each position expands to its candidate_words(). Candidates are tried in
+    order; those failing the BIP39 checksum (or, for Electrum, the segwit
+    seed version) are dropped before PBKDF2. Survivors are matched against
+    the target: an account zpub is compared directly, an address against
+    the first address_count external addresses.
+
+    Args:
+        words: Mnemonic as a string or list, with "?" for unknown words
+        target: Known address or account zpub
+        standard: 'bip39' or 'electrum'
+        passphrase: Passphrase of the wallet, if any
+        max_distance: Maximum edit distance for misspelled words
+        address_count: External addresses checked for an address target
+        path: Account path (default: the standard's path)
+        workers: Number of worker processes (default: CPU count)
+        chunk_size: Candidates per pool task
+        checkpoint: Path of a checkpoint file to resume from and update
+        progress: Called after each chunk with 'tested', 'total', 'survivors' and 'rate'
+        cancel_event: Set it to stop; progress is saved to the checkpoint
+
+    Returns:
+        The recovered mnemonic, or None if no candidate matches
+
+    Raises:
+        ValueError: If the input is invalid or the checkpoint belongs to another search
+    """
+    if isinstance(words, str):
+        words = words.split()
+    standard = standard.lower()
+    if standard == "bip39" and len(words) % 3:
+        raise ValueError("BIP39 mnemonics have a multiple of 3 words")
+
+    wordlist = get_mnemo().wordlist
+    index_of = {w: i for i, w in enumerate(wordlist)}
+    positions = [[index_of[w] for w in candidate_words(word, max_distance)] for word in words]
+
+    spec = _target_spec(target, standard, passphrase, path, address_count)
+    spec['positions'] = positions
+
+    fingerprint = _fingerprint({
+        'kind': 'mnemonic',
+        'positions': positions,
+        'passphrase': hashlib.sha256(passphrase.encode('utf-8')).hexdigest(),
+        'spec': _public(spec)
+    })
+    total = 1
+    for candidates in positions:
+        total *= len(candidates)
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    def chunks(start):
+        for chunk_start in range(start, total, chunk_size):
+            chunk_stop = min(chunk_start + chunk_size, total)
+            yield chunk_start, chunk_stop, (chunk_start, chunk_stop)
+
+    return _run_search(_mnemonic_chunk, spec, chunks, total, fingerprint, workers,
+                       checkpoint, progress, cancel_event)
+
+
+def mask_charsets(mask: str) -> List[str]:
+    """
+    Split a mask into the characters allowed at each position.
+
+    "?l", "?u", "?d", "?s" and "?a" stand for lowercase letters, uppercase
+    letters, digits, symbols and all of them; "??" is a literal "?" and any
+    other character stands for itself.
+
+    Args:
+        mask: Mask such as "Summer?d?d?d?d"
+
+    Returns:
+        One string of allowed characters per position
+
+    Raises:
+        ValueError: If the mask has an unknown class
+    """
+    charsets = []
+    i = 0
+    while i < len(mask):
+        if mask[i] != '?':
+            charsets.append(mask[i])
+            i += 1
+            continue
+        key = mask[i + 1:i + 2]
+        if key == '?':
+            charsets.append('?')
+        elif key in MASK_CHARSETS:
+            charsets.append(MASK_CHARSETS[key])
+        else:
+            raise ValueError(f"Unknown mask class '?{key}'. Available: ?{', ?'.join(MASK_CHARSETS)}, ??")
+        i += 2
+    return charsets
+
+
+def mask_size(mask: str) -> int:
+    """Number of candidates a mask expands to."""
+    total = 1
+    for charset in mask_charsets(mask):
+        total *= len(charset)
+    return total
+
+
+def iter_mask(mask: str, start: int = 0) -> Iterator[str]:
+    """
+    Enumerate a mask in order, last position varying fastest.
+
+    Starting at an index jumps there directly, so resuming a large search
+    does not replay the candidates before it.
+
+    Args:
+        mask: Mask (see mask_charsets)
+        start: Index of the first candidate
+
+    Yields:
+        Candidate passphrases
+    """
+    charsets = mask_charsets(mask)
+    if start >= mask_size(mask):
+        return
+
+    digits = []
+    rest = start
+    for charset in reversed(charsets):
+        rest, digit = divmod(rest, len(charset))
+        digits.append(digit)
+    digits.reverse()
+    chars = [charset[d] for charset, d in zip(charsets, digits)]
+
+    while True:
+        yield ''.join(chars)
+        # Odometer increment from the last position
+        p = len(charsets) - 1
+        while p >= 0:
+            digits[p] += 1
+            if digits[p] < len(charsets[p]):
+                chars[p] = charsets[p][digits[p]]
+                break
+            digits[p] = 0
+            chars[p] = charsets[p][0]
+            p -= 1
+        if p < 0:
+            return
+
+
+def iter_mutations(words: Iterable[str]) -> Iterator[str]:
+    """
+    Expand each word with common variations.
+
+    For every word: as written, lowercase, capitalized and uppercase, each
+    also with LEET_SUBSTITUTIONS applied, each followed by every entry of
+    MUTATION_SUFFIXES. Duplicates within a word are skipped.
+
+    Args:
+        words: Base words
+
+    Yields:
+        Candidate passphrases, grouped by base word
+    """
+    for word in words:
+        forms = []
+        for form in (word, word.lower(), word.capitalize(), word.upper()):
+            for variant in (form, form.translate(LEET_SUBSTITUTIONS)):
+                if variant not in forms:
+                    forms.append(variant)
+        seen = set()
+        for suffix in MUTATION_SUFFIXES:
+            for form in forms:
+                candidate = form + suffix
+                if candidate not in seen:
+                    seen.add(candidate)
+                    yield candidate
+
+
+def _read_wordlist(path: str) -> Iterator[str]:
+    """Stream the lines of a wordlist file, without line endings."""
+    with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+        for line in f:
+            yield line.rstrip('\r\n')
+
+
+def recover_passphrase(mnemonic: str, target: str,
+                       wordlist: Optional[Union[str, Iterable[str]]] = None,
+                       mask: Optional[str] = None, rules: bool = False,
+                       standard: str = "bip39", address_count: int = 1,
+                       path: Optional[str] = None, workers: Optional[int] = None,
+                       chunk_size: int = PASSPHRASE_CHUNK_SIZE,
+                       checkpoint: Optional[str] = None,
+                       progress: Optional[Callable[[dict], None]] = None,
+                       cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+    """
+    Recover the passphrase of a wallet from its mnemonic and a known address.
+
+    Candidates come from a wordlist (a file path or any iterable, optionally
+    expanded with iter_mutations) or a mask. Each one costs a PBKDF2 run,
+    the account derivation and address_count addresses, so keep
+    address_count at 1 when the first address is known. An account zpub
+    target skips the address step.
+
+    The checkpoint stores only the candidate index and a hash of the search
+    parameters, never the mnemonic or tried passphrases. A wordlist must
+    list the same entries in the same order when resuming.
+
+    Args:
+        mnemonic: Mnemonic of the wallet
+        target: Known address or account zpub
+        wordlist: Path of a wordlist file, or an iterable of candidates
+        mask: Mask of candidates (see mask_charsets), instead of a wordlist
+        rules: Expand wordlist entries with iter_mutations
+        standard: 'bip39' or 'electrum'
+        address_count: External addresses checked for an address target
+        path: Account path (default: the standard's path)
+        workers: Number of worker processes (default: CPU count)
+        chunk_size: Candidates per pool task
+        checkpoint: Path of a checkpoint file to resume from and update
+        progress: Called after each chunk with 'tested', 'total' (None for a
+            wordlist), 'survivors' and 'rate' (candidates per second)
+        cancel_event: Set it to stop; progress is saved to the checkpoint
+
+    Returns:
+        The recovered passphrase, or None if no candidate matches
+
+    Raises:
+        ValueError: If the input is invalid or the checkpoint belongs to another search
+    """
+    if (wordlist is None) == (mask is None):
+        raise ValueError("Give either a wordlist or a mask")
+    if rules and mask is not None:
+        raise ValueError("Mutation rules apply to wordlists only")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    mnemonic = " ".join(mnemonic.split())
+    standard = standard.lower()
+    if standard == "electrum":
+        if not is_electrum_segwit(mnemonic):
+            raise ValueError("Not an Electrum segwit mnemonic")
+    elif standard == "bip39" and not get_mnemo().check(mnemonic):
+        raise ValueError("Invalid BIP39 mnemonic")
+
+    spec = _target_spec(target, standard, "", path, address_count)
+    spec['mnemonic'] = mnemonic
+
+    descriptor = {
+        'kind': 'passphrase',
+        'mnemonic': hashlib.sha256(mnemonic.encode('utf-8')).hexdigest(),
+        'spec': _public(spec)
+    }
+    if mask is not None:
+        descriptor['mask'] = mask
+        total = mask_size(mask)
+    else:
+        descriptor['wordlist'] = os.path.abspath(wordlist) if isinstance(wordlist, str) else 'iterable'
+        descriptor['rules'] = rules
+        total = None
+
+    def chunks(start):
+        if mask is not None:
+            candidates = iter_mask(mask, start)
+        else:
+            source = _read_wordlist(wordlist) if isinstance(wordlist, str) else iter(wordlist)
+            if rules:
+                source = iter_mutations(source)
+            candidates = islice(source, start, None)
+
+        chunk_start = start
+        while True:
+            batch = list(islice(candidates, chunk_size))
+            if not batch:
+                return
+            yield chunk_start, chunk_start + len(batch), batch
+            chunk_start += len(batch)
+
+    return _run_search(_passphrase_chunk, spec, chunks, total, _fingerprint(descriptor),
+                       workers, checkpoint, progress, cancel_event)
+
+
+def _target_spec(target: str, standard: str, passphrase: str, path: Optional[str],
+                 address_count: int) -> dict:
+    """Describe what a candidate seed must derive to, for the workers."""
+    if standard not in ("bip39", "electrum"):
+        raise ValueError("Standard must be 'bip39' or 'electrum'")
+    if path is None:
+        path = ELECTRUM_PATH if standard == "electrum" else BIP84_PATH
+
+    spec = {
+        'standard': standard,
+        'passphrase': passphrase,
+        'path': parse_path(path),
+        'address_count': address_count
+    }
+    target = target.strip()
+    if target.lower().startswith(HRP + '1'):
+        spec['witprog'] = decode_address(HRP, target)[1]
+    else:
+        node = parse_extended_key(target)
+        spec['pubkey'] = node.pubkey
+        spec['chain_code'] = node.chain_code
+    return spec
+
+
+def _public(spec: dict) -> dict:
+    """Spec fields that identify a search, hex-encoded for hashing."""
+    return {k: (v.hex() if isinstance(v, bytes) else v)
+            for k, v in spec.items() if k not in ('positions', 'passphrase', 'mnemonic')}
+
+
+def _fingerprint(descriptor: dict) -> str:
+    """Stable identifier of a search, stored in its checkpoint."""
+    return hashlib.sha256(json.dumps(descriptor, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _matches(seed: bytes, spec: dict) -> bool:
+    """
+    Derive a seed down to the target and compare.
+
+    Keys are derived as bare (key, chain code) pairs, so no parent
+    fingerprint is computed on the way: only normal steps need a parent
+    public key. A zpub target is rejected on its chain code before the
+    account public key is computed.
+    """
+    key, chain_code = derive_master_keys(seed)
+    for index in spec['path']:
+        if index & 0x80000000:
+            key, chain_code = derive_hardened_child(key, chain_code, index)
+        else:
+            key, chain_code = derive_normal_child(key, chain_code, index)
+
+    if 'witprog' not in spec:
+        return chain_code == spec['chain_code'] and private_to_public(key) == spec['pubkey']
+
+    chain_key, chain_chain_code = derive_normal_child(key, chain_code, 0)
+    children = derive_normal_children(chain_key, chain_chain_code, list(range(spec['address_count'])))
+    return spec['witprog'] in hash160_batch([pubkey for _, pubkey, _ in children])
+
+
+def _mnemonic_chunk(spec: dict, task: Tuple[int, int]) -> tuple:
+    """
+    Worker entry point: try candidate mnemonics [start, stop).
+
+    Returns:
+        Tuple of (matching mnemonic or None, candidates passing the cheap filter)
+    """
+    start, stop = task
+    wordlist = get_mnemo().wordlist
+    positions = spec['positions']
+    count = len(positions)
+    electrum = spec['standard'] == "electrum"
+    sha256 = hashlib.sha256
+
+    # BIP39: 11 bits per word, the last count/3 bits are the checksum
+    checksum_bits = count // 3
+    entropy_bytes = (11 * count - checksum_bits) // 8
+    shifts = [11 * (count - 1 - p) for p in range(count)]
+    radixes = [len(candidates) for candidates in positions]
+
+    survivors = 0
+    for index in range(start, stop):
+        # Mixed-radix digits, last position varying fastest
+        digits = []
+        rest = index
+        for radix in reversed(radixes):
+            rest, digit = divmod(rest, radix)
+            digits.append(digit)
+        word_indexes = [positions[p][d] for p, d in enumerate(reversed(digits))]
+
+        if electrum:
+            mnemonic = " ".join([wordlist[i] for i in word_indexes])
+            if not is_electrum_segwit(mnemonic):
+                continue
+        else:
+            value = 0
+            for i, shift in zip(word_indexes, shifts):
+                value |= i << shift
+            entropy = (value >> checksum_bits).to_bytes(entropy_bytes, 'big')
+            if sha256(entropy).digest()[0] >> (8 - checksum_bits) != value & ((1 << checksum_bits) - 1):
+                continue
+            mnemonic = " ".join([wordlist[i] for i in word_indexes])
+
+        survivors += 1
+        if _matches(mnemonic_to_seed(mnemonic, spec['passphrase'], electrum), spec):
+            return mnemonic, survivors
+
+    return None, survivors
+
+
+def _passphrase_chunk(spec: dict, candidates: List[str]) -> tuple:
+    """
+    Worker entry point: try candidate passphrases.
+
+    Returns:
+        Tuple of (matching passphrase or None, candidates tried)
+    """
+    mnemonic = spec['mnemonic']
+    electrum = spec['standard'] == "electrum"
+    for candidate in candidates:
+        if _matches(mnemonic_to_seed(mnemonic, candidate, electrum), spec):
+            return candidate, len(candidates)
+    return None, len(candidates)
+
+
+def _load_checkpoint(checkpoint: Optional[str], fingerprint: str) -> dict:
+    """Read a checkpoint, or start a new one."""
+    state = {'version': CHECKPOINT_VERSION, 'search': fingerprint, 'next': 0, 'survivors': 0}
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return state
+
+    with open(checkpoint, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    if saved.get('version') != CHECKPOINT_VERSION or saved.get('search') != fingerprint:
+        raise ValueError(f"Checkpoint {checkpoint} belongs to a different search")
+    state.update(saved)
+    return state
+
+
+def _save_checkpoint(checkpoint: Optional[str], state: dict):
+    """Atomically write a checkpoint."""
+    if checkpoint is None:
+        return
+    tmp_path = checkpoint + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, checkpoint)
+
+
+def _run_search(worker: Callable, spec: dict, make_chunks: Callable[[int], Iterator[tuple]],
+                total: Optional[int], fingerprint: str, workers: Optional[int],
+                checkpoint: Optional[str], progress: Optional[Callable[[dict], None]],
+                cancel_event: Optional[threading.Event]) -> Optional[str]:
+    """
+    Run a chunked search on a process pool, in candidate order.
+
+    make_chunks(start) yields (chunk_start, chunk_stop, task) from candidate
+    index start on, and each task runs as worker(spec, task). Chunks are
+    collected in order, so the checkpoint's 'next' index always has every
+    earlier candidate tried, and the first match is the lowest. The match
+    itself is never written to the checkpoint: 'next' stays at the start
+    of its chunk, so a resumed run finds it again immediately.
+    """
+    state = _load_checkpoint(checkpoint, fingerprint)
+    if total is not None and state['next'] >= total:
+        return None
+
+    began = time.perf_counter()
+    resumed_at = state['next']
+    last_saved = began
+
+    results = ordered_pool_map(partial(_search_chunk, worker, spec), make_chunks(state['next']),
+                               workers, cancel_event)
+    try:
+        for (_, chunk_stop, _), (found, survivors) in results:
+            if found is not None:
+                return found
+
+            state['next'] = chunk_stop
+            state['survivors'] += survivors
+
+            now = time.perf_counter()
+            if now - last_saved >= CHECKPOINT_INTERVAL:
+                _save_checkpoint(checkpoint, state)
+                last_saved = now
+            if progress is not None:
+                progress({
+                    'tested': state['next'],
+                    'total': total,
+                    'survivors': state['survivors'],
+                    'rate': (state['next'] - resumed_at) / max(now - began, 1e-9)
+                })
+        return None
+    finally:
+        results.close()
+        _save_checkpoint(checkpoint, state)
+
+
+def _search_chunk(worker: Callable, spec: dict, chunk_start: int, chunk_stop: int, task) -> tuple:
+    """Worker entry point: run one chunk of a _run_search search."""
+    return worker(spec, task)
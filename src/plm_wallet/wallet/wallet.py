@@ -1,11 +1,16 @@
 """PLM Wallet orchestration."""
 
-from typing import List
+from typing import Callable, Iterator, List, Optional
 from ..core.mnemonic import generate_bip39, generate_electrum
 from ..core.seed import mnemonic_to_seed
-from ..core.derivation import derive_path
+from ..core.derivation import derive_path, parse_path, DerivationCache
+from ..core.keys import ExtendedKey, parse_extended_key
 from ..config.constants import BIP84_PATH, ELECTRUM_PATH
-from .generator import derive_addresses
+from ..utils.pool import ordered_pool_map
+from .generator import derive_node_addresses, iter_node_addresses
+
+# Wallets generated per task by PLMWallet.generate_many
+GENERATE_CHUNK_SIZE = 32
 
 
 class PLMWallet:
@@ -36,6 +41,10 @@ class PLMWallet:
         # Derive keys
         self.keys = derive_path(self.seed, self.derivation_path)
 
+        # Nodes derived on demand from the master key, sharing common prefixes;
+        # it starts with the account path derive_path just walked
+        self.node_cache = self.keys.pop('cache')
+
     @classmethod
     def generate(cls, word_count: int, standard: str = "bip39", passphrase: str = ""):
         """
@@ -57,6 +66,139 @@ class PLMWallet:
 
         return cls(mnemonic, passphrase, standard)
 
+    @classmethod
+    def generate_many(cls, n: int, word_count: int = 12, standard: str = "bip39",
+                      workers: Optional[int] = None, address_count: int = 0,
+                      progress: Optional[Callable[[int, int], None]] = None,
+                      passphrase: str = "") -> Iterator[dict]:
+        """
+        Generate many new wallets on a process pool.
+
+        Mnemonic generation, seed stretching and key derivation all run in
+        the workers; only compact records come back. At most two chunks
+        per worker are in flight, so memory stays bounded for any n.
+
+        Args:
+            n: Number of wallets
+            word_count: Number of words (12, 15, 18, 21, or 24)
+            standard: 'bip39' or 'electrum'
+            workers: Number of worker processes (default: CPU count)
+            address_count: Number of first external addresses to include
+            progress: Called with (done, total) after each finished chunk
+            passphrase: Optional passphrase for every wallet
+
+        Yields:
+            Dictionaries with 'mnemonic', 'zprv', 'zpub' and 'addresses'
+            (list of address strings)
+        """
+        chunks = ((min(GENERATE_CHUNK_SIZE, n - chunk_start), word_count, standard,
+                   passphrase, address_count)
+                  for chunk_start in range(0, n, GENERATE_CHUNK_SIZE))
+        done = 0
+
+        for _, records in ordered_pool_map(_generate_chunk, chunks, workers):
+            done += len(records)
+            if progress is not None:
+                progress(done, n)
+            yield from records
+
+    @classmethod
+    def from_zprv(cls, zprv: str, standard: Optional[str] = None):
+        """
+        Create a wallet from an account-level zprv, without a mnemonic.
+
+        Args:
+            zprv: Account extended private key
+            standard: 'bip39' or 'electrum' (default: inferred from the key depth)
+
+        Returns:
+            PLMWallet rooted at the account node
+        """
+        node = parse_extended_key(zprv)
+        if not node.is_private:
+            raise ValueError("Expected a zprv, got a zpub")
+        return cls.from_extended_key(node, standard)
+
+    @classmethod
+    def from_zpub(cls, zpub: str, standard: Optional[str] = None):
+        """
+        Create a watch-only wallet from an account-level zpub.
+
+        Args:
+            zpub: Account extended public key
+            standard: 'bip39' or 'electrum' (default: inferred from the key depth)
+
+        Returns:
+            Watch-only PLMWallet rooted at the account node (addresses
+            carry no 'privkey')
+        """
+        node = parse_extended_key(zpub)
+        if node.is_private:
+            raise ValueError("Expected a zpub, got a zprv")
+        return cls.from_extended_key(node, standard)
+
+    @classmethod
+    def from_extended_key(cls, account, standard: Optional[str] = None):
+        """
+        Create a wallet that starts at an account node.
+
+        No seed is stretched and nothing is derived from the master key, so
+        construction costs a key parse at most. The mnemonic, passphrase,
+        seed and master keys are None (unknown, as opposed to the empty
+        passphrase), and derive_node() only reaches paths below the
+        account. The account segment of derivation_path is the key's own
+        child number, hardened only if the key says so.
+
+        Args:
+            account: Account ExtendedKey, or its zprv/zpub serialization
+            standard: 'bip39' (depth 3, m/84h/746h/Nh) or 'electrum'
+                      (depth 1, m/Nh); inferred from the depth if omitted
+
+        Returns:
+            PLMWallet rooted at the account node
+
+        Raises:
+            ValueError: If the key is invalid or its depth does not match the standard
+        """
+        if isinstance(account, str):
+            account = parse_extended_key(account)
+
+        if standard is None:
+            standard = {1: "electrum", 3: "bip39"}.get(account.depth)
+            if standard is None:
+                raise ValueError(f"Cannot infer standard from key depth {account.depth}")
+        standard = standard.lower()
+        base_path = ELECTRUM_PATH if standard == "electrum" else BIP84_PATH
+        if account.depth != base_path.count('/'):
+            raise ValueError(f"Key depth {account.depth} does not match {standard} account level")
+
+        wallet = cls.__new__(cls)
+        wallet.mnemonic = None
+        wallet.passphrase = None
+        wallet.standard = standard
+        wallet.seed = None
+        # Same purpose/coin as the standard, account index from the key itself
+        index = account.child_number
+        account_segment = f"{index & 0x7FFFFFFF}h" if index & 0x80000000 else str(index)
+        wallet.derivation_path = f"{base_path.rsplit('/', 1)[0]}/{account_segment}"
+        wallet.keys = {
+            'master_zprv': None,
+            'master_zpub': None,
+            'zprv': account.zprv if account.is_private else None,
+            'zpub': account.zpub,
+            'key': account.key,
+            'chain_code': account.chain_code,
+            'master': None,
+            'account': account
+        }
+        wallet.node_cache = DerivationCache(account)
+        return wallet
+
+    @property
+    def watch_only(self) -> bool:
+        """True if the wallet holds no private keys."""
+        return not self.keys['account'].is_private
+
     def get_master_keys(self) -> dict:
         """Get master extended keys."""
         return {
@@ -71,6 +213,32 @@ class PLMWallet:
             'zpub': self.keys['zpub']
         }
 
+    def derive_node(self, path: str) -> ExtendedKey:
+        """
+        Derive the node at an arbitrary BIP32 path.
+
+        Wallets created from an account key can only reach the account
+        path and paths below it.
+
+        Args:
+            path: Derivation path, e.g. "m/84h/746h/0h/1/7"
+
+        Returns:
+            ExtendedKey node at the path
+
+        Raises:
+            ValueError: If the path is not reachable from the wallet's root
+        """
+        if self.keys['master'] is None:
+            indexes = parse_path(path)
+            account_indexes = parse_path(self.derivation_path)
+            if indexes[:len(account_indexes)] != account_indexes:
+                raise ValueError(f"Path {path} is outside account {self.derivation_path}")
+            relative = indexes[len(account_indexes):]
+            path = "m" + "".join(f"/{i & 0x7FFFFFFF}h" if i & 0x80000000 else f"/{i}"
+                                 for i in relative)
+        return self.node_cache.derive(path)
+
     def generate_addresses(self, count: int = 10) -> List[dict]:
         """
         Generate addresses.
@@ -81,12 +249,22 @@ class PLMWallet:
         Returns:
             List of dictionaries with 'path' and 'address'
         """
-        return derive_addresses(
-            self.keys['key'],
-            self.keys['chain_code'],
-            count,
-            self.derivation_path
-        )
+        return derive_node_addresses(self.keys['account'], count, self.derivation_path)
+
+    def iter_addresses(self, chain: int = 0, start: int = 0,
+                       stop: Optional[int] = None) -> Iterator[dict]:
+        """
+        Lazily generate addresses one at a time.
+
+        Args:
+            chain: 0 for external (receive) addresses, 1 for internal (change)
+            start: First address index
+            stop: Index to stop before (None for no limit)
+
+        Returns:
+            Iterator of dictionaries with 'path' and 'address'
+        """
+        return iter_node_addresses(self.keys['account'], chain, start, stop, self.derivation_path)
 
     def export_json(self) -> dict:
         """
@@ -105,3 +283,18 @@ class PLMWallet:
             'zpub': self.keys['zpub'],
             'addresses': self.generate_addresses(10)
         }
+
+
+def _generate_chunk(count: int, word_count: int, standard: str, passphrase: str,
+                    address_count: int) -> List[dict]:
+    """Worker entry point: generate wallets and return compact records."""
+    records = []
+    for _ in range(count):
+        wallet = PLMWallet.generate(word_count, standard, passphrase)
+        records.append({
+            'mnemonic': wallet.mnemonic,
+            'zprv': wallet.keys['zprv'],
+            'zpub': wallet.keys['zpub'],
+            'addresses': [addr['address'] for addr in wallet.generate_addresses(address_count)]
+        })
+    return records
@@ -0,0 +1,6 @@
+"""Test configuration: import the packages from src/, like run.py does."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
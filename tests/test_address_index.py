@@ -0,0 +1,89 @@
+"""Tests for the persistent address index."""
+
+import pytest
+
+from plm_wallet.core.address import pubkey_to_address
+from plm_wallet.crypto.encoding import bech32_encode_address, decode_address
+from plm_wallet.wallet import address_index
+from plm_wallet.wallet.address_index import AddressIndex
+from plm_wallet.wallet.wallet import PLMWallet
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+
+
+@pytest.fixture(scope="module")
+def wallet():
+    return PLMWallet(MNEMONIC)
+
+
+def _address(wallet, chain, index):
+    return pubkey_to_address(wallet.derive_node(f"{wallet.derivation_path}/{chain}/{index}").pubkey)
+
+
+def test_build_and_lookup(tmp_path, wallet):
+    with AddressIndex.build(tmp_path / "idx", wallet.keys['account'], 50) as index:
+        assert len(index) == 100
+        assert index.ranges == {0: (0, 50), 1: (0, 50)}
+        assert index.lookup(_address(wallet, 0, 0)) == (0, 0)
+        assert index.lookup(_address(wallet, 1, 49)) == (1, 49)
+        assert index.lookup(_address(wallet, 0, 50)) is None
+
+        witprog = decode_address("plm", _address(wallet, 0, 7))[1]
+        assert index.lookup(witprog) == (0, 7)
+        assert index.lookup(bech32_encode_address("bc", witprog)) is None
+        assert index.lookup(bech32_encode_address("plm", witprog, 1)) is None
+        with pytest.raises(ValueError):
+            index.lookup("plm1qqqqqqqq")
+        with pytest.raises(ValueError):
+            index.lookup("1qw508d6qejxtdg4y5r3zarvary0c5xw7k")
+
+    records = list(AddressIndex(tmp_path / "idx").records())
+    assert records == sorted(records)
+
+
+def test_build_single_chain_from_watch_only(tmp_path, wallet):
+    account = wallet.keys['account'].neuter()
+    with AddressIndex.build(tmp_path / "idx", account, 10, chains=(1,), start=5) as index:
+        assert index.ranges == {0: (0, 0), 1: (5, 10)}
+        assert index.lookup(_address(wallet, 1, 5)) == (1, 5)
+        assert index.lookup(_address(wallet, 1, 4)) is None
+        assert index.lookup(_address(wallet, 0, 5)) is None
+
+
+def test_extend_keeps_handle_valid(tmp_path, wallet):
+    account = wallet.keys['account']
+    index = AddressIndex.build(tmp_path / "idx", account, 20)
+    assert index.extend(account, 30) is index
+    assert len(index) == 60
+    assert index.ranges == {0: (0, 30), 1: (0, 30)}
+    assert index.lookup(_address(wallet, 0, 29)) == (0, 29)
+    assert index.lookup(_address(wallet, 1, 3)) == (1, 3)
+    assert index.extend(account, 10) is index and len(index) == 60
+
+    with pytest.raises(ValueError):
+        index.extend(PLMWallet(MNEMONIC, "other").keys['account'], 40)
+    index.close()
+    with pytest.raises(ValueError, match="closed"):
+        index.lookup(_address(wallet, 0, 0))
+    with pytest.raises(ValueError, match="closed"):
+        list(index.records())
+
+
+def test_spilled_runs_merge(tmp_path, wallet, monkeypatch):
+    monkeypatch.setattr(address_index, 'RUN_SIZE', 16)
+    account = wallet.keys['account']
+    with AddressIndex.build(tmp_path / "idx", account, 40) as index:
+        index.extend(account, 70)
+        records = list(index.records())
+        assert len(records) == 140
+        assert records == sorted(records)
+        assert all(index.lookup(_address(wallet, chain, i)) == (chain, i)
+                   for chain in (0, 1) for i in (0, 15, 16, 39, 40, 69))
+    assert [p.name for p in tmp_path.iterdir()] == ["idx"]
+
+
+def test_rejects_non_index_file(tmp_path):
+    path = tmp_path / "junk"
+    path.write_bytes(b"not an index at all, just some bytes")
+    with pytest.raises(ValueError):
+        AddressIndex(path)
@@ -0,0 +1,110 @@
+"""Tests for ECC backend registration, selection and agreement."""
+
+import pytest
+
+from plm_wallet.crypto import backends
+from plm_wallet.crypto.backends import ECCBackend, NativeBackend
+from plm_wallet.crypto.hashing import sha256
+
+KEYS = [sha256(bytes([i])) for i in range(8)]
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+
+class BrokenBackend(NativeBackend):
+    """Returns the wrong key, so it fails the self-test."""
+
+    name = 'broken'
+
+    def pubkey(self, private_key: bytes) -> bytes:
+        return b'\x02' + bytes(32)
+
+    def pubkey_batch(self, private_keys):
+        return [self.pubkey(k) for k in private_keys]
+
+
+class MissingBackend(NativeBackend):
+    """Stands in for a backend whose library is not installed."""
+
+    name = 'missing'
+
+    def __init__(self):
+        raise ImportError("not installed")
+
+
+@pytest.fixture(autouse=True)
+def restore_selection(monkeypatch):
+    selected, timings = backends._selected, backends._timings
+    monkeypatch.delenv(backends.ECC_BACKEND_ENV, raising=False)
+    yield
+    backends._selected, backends._timings = selected, timings
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        ECCBackend()
+
+    class Minimal(ECCBackend):
+        def pubkey(self, private_key):
+            return NativeBackend().pubkey(private_key)
+
+        def tweak_add(self, pubkey, tweak):
+            return NativeBackend().tweak_add(pubkey, tweak)
+
+    minimal, native = Minimal(), NativeBackend()
+    assert minimal.pubkey_batch(KEYS) == native.pubkey_batch(KEYS)
+    assert minimal.tweak_add_batch(native.pubkey(KEYS[0]), KEYS[1:]) == \
+        native.tweak_add_batch(native.pubkey(KEYS[0]), KEYS[1:])
+
+
+def test_environment_override(monkeypatch):
+    monkeypatch.setenv(backends.ECC_BACKEND_ENV, 'native')
+    assert backends.select_backend().name == 'native'
+    assert backends.get_backend().name == 'native'
+    if 'ecdsa' in backends.available_backends():
+        # An explicit name wins over the environment
+        assert backends.select_backend('ecdsa').name == 'ecdsa'
+
+
+def test_select_unknown_or_unavailable(monkeypatch):
+    monkeypatch.setitem(backends.BACKENDS, 'missing', MissingBackend)
+    assert 'missing' not in backends.available_backends()
+    for name in ('gpu', 'missing'):
+        with pytest.raises(ValueError, match="not available"):
+            backends.select_backend(name)
+    monkeypatch.setenv(backends.ECC_BACKEND_ENV, 'gpu')
+    with pytest.raises(ValueError):
+        backends.select_backend()
+
+
+def test_backend_failing_self_test_is_excluded(monkeypatch):
+    monkeypatch.setitem(backends.BACKENDS, 'broken', BrokenBackend)
+    timings = backends.benchmark_backends(backends.available_backends())
+    assert 'broken' not in timings and 'native' in timings
+    assert backends.select_backend().name != 'broken'
+    assert 'broken' not in backends.get_timings()
+    with pytest.raises(ValueError, match="self-test"):
+        backends.select_backend('broken')
+
+
+def test_installed_backends_agree():
+    available = backends.available_backends()
+    native = available.pop('native')
+    parent = native.pubkey(KEYS[0])
+    expected_pubkeys = native.pubkey_batch(KEYS)
+    expected_children = native.tweak_add_batch(parent, KEYS)
+    for name, backend in available.items():
+        assert backend.pubkey_batch(KEYS) == expected_pubkeys, name
+        assert backend.pubkey(KEYS[3]) == expected_pubkeys[3], name
+        assert backend.tweak_add_batch(parent, KEYS) == expected_children, name
+        assert backend.tweak_add(parent, bytes(32)) == parent, name
+
+
+@pytest.mark.parametrize("name", sorted(backends.available_backends()))
+def test_tweak_to_infinity_raises(name):
+    backend = backends.available_backends()[name]
+    k = int.from_bytes(KEYS[0], 'big')
+    parent = backend.pubkey(KEYS[0])
+    with pytest.raises(ValueError, match="infinity"):
+        backend.tweak_add(parent, (N - k).to_bytes(32, 'big'))
+    with pytest.raises(ValueError):
+        backend.pubkey(bytes(32))
@@ -0,0 +1,63 @@
+"""Tests for BIP32 private and public child derivation."""
+
+import pytest
+
+from plm_wallet.core.derivation import (derive_child_node, derive_normal_child, derive_normal_children,
+                                        derive_public_child, derive_public_children, parse_path)
+from plm_wallet.crypto.ecc import private_to_public
+from plm_wallet.wallet.generator import derive_addresses
+from plm_wallet.wallet.wallet import PLMWallet
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+INDEXES = [0, 1, 2, 255, 256, 1000, 0x7FFFFFFF]
+
+
+@pytest.fixture(scope="module")
+def account():
+    return PLMWallet(MNEMONIC).keys['account']
+
+
+def test_public_children_match_private_children(account):
+    private = derive_normal_children(account.key, account.chain_code, INDEXES)
+    public = derive_public_children(account.pubkey, account.chain_code, INDEXES)
+    assert public == [(pubkey, chain_code) for _, pubkey, chain_code in private]
+    assert [private_to_public(key) for key, _, _ in private] == [pubkey for pubkey, _ in public]
+
+    key, chain_code = derive_normal_child(account.key, account.chain_code, 7)
+    assert derive_public_child(account.pubkey, account.chain_code, 7) == (private_to_public(key), chain_code)
+
+
+def test_public_node_matches_private_node(account):
+    watch = account.neuter()
+    for path in ([0, 5], [1, 0], [1, 2, 3]):
+        private, public = account, watch
+        for index in path:
+            private, public = derive_child_node(private, index), derive_child_node(public, index)
+        assert not public.is_private
+        assert public.pubkey == private.pubkey
+        assert public.chain_code == private.chain_code
+        assert public.zpub == private.zpub
+
+
+def test_hardened_index_on_public_node_raises(account):
+    with pytest.raises(ValueError):
+        derive_child_node(account.neuter(), 0x80000000)
+    with pytest.raises(ValueError):
+        derive_public_children(account.pubkey, account.chain_code, [0, 0x80000001])
+    assert parse_path("m/0'/1H/2h/3") == (0x80000000, 0x80000001, 0x80000002, 3)
+
+
+def test_watch_only_addresses_carry_no_privkey(account):
+    private = derive_addresses(account.key, account.chain_code, 5, "m/84h/746h/0h")
+    watch = derive_addresses(account.pubkey, account.chain_code, 5, "m/84h/746h/0h")
+    assert all('privkey' in record for record in private)
+    assert all('privkey' not in record for record in watch)
+    assert watch == [{k: v for k, v in record.items() if k != 'privkey'} for record in private]
+    assert watch[3]['path'] == "m/84h/746h/0h/0/3"
+
+
+def test_normal_children_match_single_child(account):
+    children = derive_normal_children(account.key, account.chain_code, INDEXES, account.pubkey)
+    for index, (key, pubkey, chain_code) in zip(INDEXES, children):
+        assert derive_normal_child(account.key, account.chain_code, index) == (key, chain_code)
+        assert private_to_public(key) == pubkey
@@ -0,0 +1,108 @@
+"""Tests for gap-limit account discovery."""
+
+import os
+
+from plm_wallet.core.derivation import derive_child_node
+from plm_wallet.core.keys import ExtendedKey
+from plm_wallet.crypto.encoding import bech32_encode_address
+from plm_wallet.wallet.discovery import (UsedAddressSet, discover_accounts, load_used_addresses,
+                                         parse_used_entry, scan_chain)
+from plm_wallet.wallet.generator import derive_chain_witprogs
+from plm_wallet.wallet.wallet import PLMWallet
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+
+
+def _mark_used(used, account, chain, indexes):
+    for witprog in derive_chain_witprogs(derive_child_node(account, chain), list(indexes)):
+        used.add(witprog)
+
+
+def test_used_address_set_grows():
+    used = UsedAddressSet(capacity=4)
+    programs = [os.urandom(20) for _ in range(1000)]
+    for witprog in programs:
+        used.add(witprog)
+    used.add(programs[0])
+    assert len(used) == 1000
+    assert all(witprog in used for witprog in programs)
+    assert os.urandom(20) not in used
+
+
+def test_parse_used_entry_formats():
+    witprog = bytes(range(20))
+    address = bech32_encode_address("plm", witprog)
+    assert parse_used_entry(address) == witprog
+    assert parse_used_entry(" " + address.upper() + "\n") == witprog
+    assert parse_used_entry("0014" + witprog.hex()) == witprog
+    assert parse_used_entry(witprog.hex()) == witprog
+    assert parse_used_entry("# comment") is None
+    assert parse_used_entry("") is None
+    assert parse_used_entry(bech32_encode_address("bc", witprog)) is None
+    assert parse_used_entry(bech32_encode_address("plm", bytes(32))) is None
+    assert parse_used_entry("0020" + bytes(32).hex()) is None
+    assert parse_used_entry("not hex") is None
+
+
+def test_load_used_addresses_from_file_and_iterable(tmp_path):
+    programs = [bytes([i]) * 20 for i in range(1, 4)]
+    lines = [bech32_encode_address("plm", programs[0]), "0014" + programs[1].hex(),
+             programs[2].hex(), "# header", "garbage"]
+    path = tmp_path / "used.txt"
+    path.write_text("\n".join(lines) + "\n")
+
+    for source in (str(path), path, lines):
+        used = load_used_addresses(source)
+        assert len(used) == 3
+        assert all(witprog in used for witprog in programs)
+
+
+def test_scan_chain_stops_at_gap_limit():
+    chain_node = derive_child_node(PLMWallet(MNEMONIC).keys['account'], 0)
+    used = UsedAddressSet()
+    _mark_used(used, PLMWallet(MNEMONIC).keys['account'], 0, [0, 19, 45])
+
+    assert scan_chain(chain_node, used, gap_limit=20) == 19
+    assert scan_chain(chain_node, used, gap_limit=20, batch_size=7) == 19
+    assert scan_chain(chain_node, used, gap_limit=26) == 45
+    assert scan_chain(chain_node.neuter(), used, gap_limit=26, batch_size=100) == 45
+    assert scan_chain(chain_node, UsedAddressSet()) is None
+
+
+def test_discover_stops_at_first_unused_account():
+    wallet = PLMWallet(MNEMONIC)
+    used = UsedAddressSet()
+    _mark_used(used, wallet.derive_node("m/84h/746h/0h"), 0, [2])
+    _mark_used(used, wallet.derive_node("m/84h/746h/1h"), 1, [0])
+    _mark_used(used, wallet.derive_node("m/84h/746h/3h"), 0, [0])
+    assert discover_accounts(wallet, used) == [
+        {'account': 0, 'path': "m/84h/746h/0h", 'external': 2, 'internal': None},
+        {'account': 1, 'path': "m/84h/746h/1h", 'external': None, 'internal': 0}]
+    assert discover_accounts(wallet, UsedAddressSet()) == []
+
+
+def test_discover_electrum_scans_single_account():
+    wallet = PLMWallet(MNEMONIC, standard="electrum")
+    used = UsedAddressSet()
+    _mark_used(used, wallet.keys['account'], 0, [1])
+    assert discover_accounts(wallet, used) == [
+        {'account': 0, 'path': "m/0h", 'external': 1, 'internal': None}]
+
+
+def test_discover_from_hardened_zpub():
+    account = PLMWallet(MNEMONIC).keys['account']
+    used = UsedAddressSet()
+    _mark_used(used, account, 0, [3])
+    wallet = PLMWallet.from_zpub(account.neuter().zpub)
+    assert discover_accounts(wallet, used) == [
+        {'account': 0, 'path': "m/84h/746h/0h", 'external': 3, 'internal': None}]
+
+
+def test_discover_from_unhardened_account_key():
+    node = PLMWallet(MNEMONIC).keys['account']
+    account = ExtendedKey(node.key, node.chain_code, 3, node.parent_fingerprint, 5).neuter()
+    used = UsedAddressSet()
+    _mark_used(used, account, 1, [0, 7])
+    wallet = PLMWallet.from_extended_key(account)
+    assert discover_accounts(wallet, used) == [
+        {'account': 5, 'path': "m/84h/746h/5", 'external': None, 'internal': 7}]
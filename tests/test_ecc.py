@@ -0,0 +1,37 @@
+"""Tests for the backend-dispatched ECC helpers."""
+
+import pytest
+
+from plm_wallet.crypto import backends, ecc
+from plm_wallet.crypto.hashing import sha256
+
+KEYS = [sha256(i.to_bytes(2, "big")) for i in range(300)]
+
+
+@pytest.fixture(params=sorted(backends.available_backends()))
+def backend(request):
+    selected = backends._selected
+    yield backends.select_backend(request.param)
+    backends._selected = selected
+
+
+def test_private_to_public_batch(backend):
+    assert ecc.private_to_public_batch([]) == []
+    expected = [backends.NativeBackend().pubkey(k) for k in KEYS[:40]]
+    assert ecc.private_to_public_batch(KEYS[:40]) == expected
+    assert ecc.private_to_public_batch(KEYS[:1]) == [ecc.private_to_public(KEYS[0])]
+
+
+def test_private_to_public_batch_large_matches_single(backend):
+    assert ecc.private_to_public_batch(KEYS) == [ecc.private_to_public(k) for k in KEYS]
+
+
+def test_private_to_public_batch_rejects_invalid_key(backend):
+    with pytest.raises(ValueError):
+        ecc.private_to_public_batch([KEYS[0], bytes(32)])
+
+
+def test_uncompressed_coordinates(backend):
+    x, y = ecc.get_public_key_uncompressed((1).to_bytes(32, 'big'))
+    assert x.hex() == "79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798"
+    assert y.hex() == "483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8"
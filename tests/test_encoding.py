@@ -0,0 +1,151 @@
+"""Tests for the Base58Check and bech32/bech32m codecs."""
+
+import pytest
+
+from plm_wallet.crypto.encoding import (b58decode, b58encode, base58_decode_check,
+                                        base58_encode_check, bech32_encode_address,
+                                        decode_address, is_valid_address)
+
+# BIP173/BIP350 valid segwit addresses with their scriptPubKey
+VALID_ADDRESSES = [
+    ("BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4",
+     "0014751e76e8199196d454941c45d1b3a323f1433bd6"),
+    ("tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3q0sl5k7",
+     "00201863143c14c5166804bd19203356da136c985678cd4d27a1b8c6329604903262"),
+    ("bc1pw508d6qejxtdg4y5r3zarvary0c5xw7kw508d6qejxtdg4y5r3zarvary0c5xw7kt5nd6y",
+     "5128751e76e8199196d454941c45d1b3a323f1433bd6751e76e8199196d454941c45d1b3a323f1433bd6"),
+    ("BC1SW50QGDZ25J", "6002751e"),
+    ("bc1zw508d6qejxtdg4y5r3zarvaryvaxxpcs", "5210751e76e8199196d454941c45d1b3a323"),
+    ("tb1qqqqqp399et2xygdj5xreqhjjvcmzhxw4aywxecjdzew6hylgvsesrxh6hy",
+     "0020000000c4a5cad46221b2a187905e5266362b99d5e91c6ce24d165dab93e86433"),
+    ("tb1pqqqqp399et2xygdj5xreqhjjvcmzhxw4aywxecjdzew6hylgvsesf3hn0c",
+     "5120000000c4a5cad46221b2a187905e5266362b99d5e91c6ce24d165dab93e86433"),
+    ("bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0",
+     "512079be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798"),
+]
+
+# BIP350 invalid addresses, with the HRP they are decoded against
+INVALID_ADDRESSES = [
+    # Wrong human-readable part
+    ("bc", "tc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vq5zuyut"),
+    # bech32 checksum on a v1+ address
+    ("bc", "bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqh2y7hd"),
+    ("tb", "tb1z0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqglt7rf"),
+    ("bc", "BC1S0XLXVLHEMJA6C4DQV22UAPCTQUPFHLXM9H8Z3K2E72Q4K9HCZ7VQ54WELL"),
+    # bech32m checksum on a v0 address
+    ("bc", "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kemeawh"),
+    ("tb", "tb1q0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vq24jc47"),
+    # Invalid character in the checksum
+    ("bc", "bc1p38j9r5y49hruaue7wxjce0updqjuyyx0kh56v8s25huc6995vvpql3jow4"),
+    # Witness version 17
+    ("bc", "BC130XLXVLHEMJA6C4DQV22UAPCTQUPFHLXM9H8Z3K2E72Q4K9HCZ7VQ7ZWS8R"),
+    # Program of 1 and 41 bytes
+    ("bc", "bc1pw5dgrnzv"),
+    ("bc", "bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7v8n0nx0muaewav253zgeav"),
+    # 16-byte program with witness version 0
+    ("bc", "BC1QR508D6QEJXTDG4Y5R3ZARVARYV98GJ9P"),
+    # Mixed case
+    ("tb", "tb1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vq47Zagq"),
+    # More than 4 padding bits, and non-zero padding
+    ("bc", "bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7v07qwwzcrf"),
+    ("tb", "tb1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vpggkg4j"),
+    # Empty data section
+    ("bc", "bc1gmk9yu"),
+]
+
+G_HASH160 = bytes.fromhex('751e76e8199196d454941c45d1b3a323f1433bd6')
+
+
+def _hrp(address):
+    return address[:address.rfind('1')].lower()
+
+
+@pytest.mark.parametrize("address, script", VALID_ADDRESSES)
+def test_decode_valid_addresses(address, script):
+    script = bytes.fromhex(script)
+    witver, witprog = decode_address(_hrp(address), address)
+    assert witver == (script[0] - 0x50 if script[0] else 0)
+    assert witprog == script[2:]
+    assert len(witprog) == script[1]
+
+
+@pytest.mark.parametrize("address, script", VALID_ADDRESSES)
+def test_encode_valid_addresses(address, script):
+    witver, witprog = decode_address(_hrp(address), address)
+    assert bech32_encode_address(_hrp(address), witprog, witver) == address.lower()
+
+
+@pytest.mark.parametrize("hrp, address", INVALID_ADDRESSES)
+def test_decode_invalid_addresses(hrp, address):
+    with pytest.raises(ValueError):
+        decode_address(hrp, address)
+    assert not is_valid_address(address, hrp)
+
+
+def test_plm_address_round_trip():
+    address = bech32_encode_address('plm', G_HASH160)
+    assert address.startswith('plm1q')
+    assert decode_address('plm', address) == (0, G_HASH160)
+    assert decode_address('plm', address.upper()) == (0, G_HASH160)
+    assert is_valid_address(address)
+
+
+def test_plm_address_mixed_case_and_bad_checksum():
+    address = bech32_encode_address('plm', G_HASH160)
+    with pytest.raises(ValueError):
+        decode_address('plm', address[:5] + address[5:].upper())
+    last = 'q' if address[-1] != 'q' else 'p'
+    with pytest.raises(ValueError):
+        decode_address('plm', address[:-1] + last)
+    with pytest.raises(ValueError):
+        decode_address('bc', address)
+
+
+def test_plm_address_witness_versions():
+    # v1+ uses bech32m; a bech32m v0 address is rejected above
+    address = bech32_encode_address('plm', bytes(32), 1)
+    assert decode_address('plm', address) == (1, bytes(32))
+    with pytest.raises(ValueError):
+        decode_address('plm', bech32_encode_address('plm', bytes(21)))
+
+
+@pytest.mark.parametrize("data, text", [
+    (b"", ""),
+    (b"\x00", "1"),
+    (b"\x00\x00\x00", "111"),
+    (bytes.fromhex("0000287fb4cd"), "11233QC4"),
+    (b"Hello World", "JxF12TrwUP45BMd"),
+    (bytes.fromhex("00eb15231dfceb60925886b67d065299925915aeb172c06647"),
+     "1NS17iag9jJgTHD1VXjvLCEnZuQ3rJDE9L"),
+])
+def test_base58_vectors(data, text):
+    assert b58encode(data) == text
+    assert b58decode(text) == data
+
+
+def test_base58_leading_zeros_round_trip():
+    for zeros in range(5):
+        for body in (b"", b"\x01", b"\xff" * 40):
+            data = b"\x00" * zeros + body
+            assert b58decode(b58encode(data)) == data
+
+
+@pytest.mark.parametrize("text", ["0", "O", "I", "l", "abc+", "é"])
+def test_base58_invalid_characters(text):
+    with pytest.raises(ValueError):
+        b58decode(text)
+
+
+def test_base58check_address():
+    # P2PKH address of the generator point
+    assert base58_encode_check(b"\x00" + G_HASH160) == "1BgGZ9tcN4rm9KBzDn7KprQz87SZ26SAMH"
+    assert base58_decode_check("1BgGZ9tcN4rm9KBzDn7KprQz87SZ26SAMH") == b"\x00" + G_HASH160
+
+
+def test_base58check_checksum_failure():
+    text = base58_encode_check(b"\x00" + G_HASH160)
+    corrupted = text[:-1] + ('2' if text[-1] != '2' else '3')
+    with pytest.raises(ValueError):
+        base58_decode_check(corrupted)
+    with pytest.raises(ValueError):
+        base58_decode_check("111")
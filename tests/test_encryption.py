@@ -0,0 +1,69 @@
+"""Tests for wallet file encryption and its KDF headers."""
+
+import base64
+import json
+
+import pytest
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from plm_wallet.crypto.encryption import WalletEncryption
+from plm_wallet.crypto.exceptions import DecryptionError, InvalidPasswordError
+
+FAST_KDF = {'name': 'pbkdf2-sha256', 'iterations': 1000}
+WALLET = {'mnemonic': 'abandon ' * 11 + 'about', 'derivation_path': "m/84h/0h/0h"}
+
+
+def make_v1_wallet(data: dict, password: str) -> dict:
+    """Write a wallet the way format version 1 did: PBKDF2, 480,000 iterations, no 'kdf'."""
+    salt = b'\x07' * 16
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=480000)
+    key = base64.urlsafe_b64encode(kdf.derive(password.encode('utf-8')))
+    return {
+        'version': '1',
+        'salt': base64.b64encode(salt).decode('utf-8'),
+        'data': Fernet(key).encrypt(json.dumps(data).encode('utf-8')).decode('utf-8'),
+    }
+
+
+def test_decrypts_v1_wallet():
+    encrypted = make_v1_wallet(WALLET, "hunter2")
+    assert WalletEncryption.decrypt_wallet(encrypted, "hunter2") == WALLET
+    with pytest.raises(InvalidPasswordError):
+        WalletEncryption.decrypt_wallet(encrypted, "hunter3")
+
+
+def test_v2_round_trip_records_kdf():
+    encrypted = WalletEncryption.encrypt_wallet(WALLET, "pw", kdf=FAST_KDF)
+    assert encrypted['version'] == '2'
+    assert encrypted['kdf'] == FAST_KDF
+    assert WalletEncryption.decrypt_wallet(encrypted, "pw") == WALLET
+
+
+@pytest.mark.parametrize("kdf", [
+    {'name': 'pbkdf2-sha256', 'iterations': WalletEncryption.MAX_PBKDF2_ITERATIONS + 1},
+    {'name': 'pbkdf2-sha256', 'iterations': 0},
+    {'name': 'scrypt', 'n': 2 ** 18, 'r': 8, 'p': 2},
+    {'name': 'scrypt', 'n': 2 ** 18, 'r': 8, 'p': 1},
+    {'name': 'scrypt', 'n': 3, 'r': 8, 'p': 1},
+    {'name': 'argon2', 'time_cost': 1},
+])
+def test_rejects_kdf_headers_out_of_range(kdf):
+    encrypted = WalletEncryption.encrypt_wallet(WALLET, "pw", kdf=FAST_KDF)
+    encrypted['kdf'] = kdf
+    with pytest.raises(DecryptionError):
+        WalletEncryption.decrypt_wallet(encrypted, "pw")
+
+
+def test_rejects_unknown_version():
+    encrypted = WalletEncryption.encrypt_wallet(WALLET, "pw", kdf=FAST_KDF)
+    encrypted['version'] = '3'
+    with pytest.raises(DecryptionError):
+        WalletEncryption.decrypt_wallet(encrypted, "pw")
+
+
+def test_calibrate_stays_within_limits():
+    for algorithm in WalletEncryption.KDF_NAMES:
+        kdf = WalletEncryption.calibrate(1, algorithm)
+        assert WalletEncryption.check_kdf(kdf) == kdf
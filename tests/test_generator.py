@@ -0,0 +1,93 @@
+"""Tests for address derivation and streaming."""
+
+import pytest
+
+from plm_wallet.core import derivation, keys
+from plm_wallet.core.address import pubkey_to_address
+from plm_wallet.crypto.ecc import private_to_public
+from plm_wallet.wallet.generator import ITER_BATCH_SIZE, derive_addresses, iter_node_addresses
+from plm_wallet.wallet.wallet import PLMWallet
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+
+
+@pytest.fixture(scope="module")
+def wallet():
+    return PLMWallet(MNEMONIC)
+
+
+def test_each_pubkey_computed_once(wallet, monkeypatch):
+    computed = []
+    single, batch = derivation.private_to_public, derivation.private_to_public_batch
+
+    def counting_single(key):
+        computed.append(key)
+        return single(key)
+
+    def counting_batch(keys):
+        computed.extend(keys)
+        return batch(keys)
+
+    monkeypatch.setattr(derivation, 'private_to_public', counting_single)
+    monkeypatch.setattr(keys, 'private_to_public', counting_single)
+    monkeypatch.setattr(derivation, 'private_to_public_batch', counting_batch)
+    account = wallet.keys['account']
+    records = derive_addresses(account.key, account.chain_code, 10, wallet.derivation_path)
+
+    # The account and chain pubkeys (as CKD parents), then one per child
+    assert len(computed) == 12
+    assert len(set(computed)) == 12
+    for record in records:
+        pubkey = bytes.fromhex(record['pubkey'])
+        assert private_to_public(bytes.fromhex(record['privkey'])) == pubkey
+        assert record['address'] == pubkey_to_address(pubkey)
+
+
+def _expected(wallet, chain, indexes):
+    records = []
+    for i in indexes:
+        node = wallet.derive_node(f"{wallet.derivation_path}/{chain}/{i}")
+        records.append({'path': f"{wallet.derivation_path}/{chain}/{i}",
+                        'address': pubkey_to_address(node.pubkey),
+                        'pubkey': node.pubkey.hex(),
+                        'privkey': node.key.hex()})
+    return records
+
+
+@pytest.mark.parametrize("chain, start, stop", [
+    (0, 0, 5),
+    (1, 0, 5),
+    (1, 1000000, 1000006),
+    (0, 0x7FFFFFFD, 0x80000000),
+])
+def test_iter_addresses_matches_derive_node(wallet, chain, start, stop):
+    assert list(wallet.iter_addresses(chain, start, stop)) == _expected(wallet, chain, range(start, stop))
+
+
+@pytest.mark.parametrize("start, stop", [
+    (0, ITER_BATCH_SIZE),
+    (0, ITER_BATCH_SIZE + 1),
+    (ITER_BATCH_SIZE - 2, ITER_BATCH_SIZE + 2),
+    (3, 2 * ITER_BATCH_SIZE + 3),
+])
+def test_iter_addresses_batch_boundaries(wallet, start, stop):
+    records = list(wallet.iter_addresses(1, start, stop))
+    assert [r['path'] for r in records] == [f"{wallet.derivation_path}/1/{i}" for i in range(start, stop)]
+    edges = [start, stop - 1] + [i for i in (ITER_BATCH_SIZE - 1, ITER_BATCH_SIZE) if start <= i < stop]
+    for i in edges:
+        assert records[i - start] == _expected(wallet, 1, [i])[0]
+
+
+def test_iter_addresses_is_lazy_and_validates(wallet):
+    stream = wallet.iter_addresses(0, 10)
+    assert next(stream)['path'] == f"{wallet.derivation_path}/0/10"
+    assert list(wallet.iter_addresses(0, 7, 7)) == []
+
+    watch = iter_node_addresses(wallet.keys['account'].neuter(), 1, 1000000, 1000002,
+                                wallet.derivation_path)
+    assert list(watch) == [{k: v for k, v in r.items() if k != 'privkey'}
+                           for r in _expected(wallet, 1, range(1000000, 1000002))]
+
+    for chain, start, stop in ((2, 0, 1), (0, 5, 4), (0, 0, 0x80000001), (0, -1, 3)):
+        with pytest.raises(ValueError):
+            wallet.iter_addresses(chain, start, stop)
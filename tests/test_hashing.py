@@ -0,0 +1,83 @@
+"""Tests for RIPEMD-160 and hash160."""
+
+import hashlib
+import hmac
+
+import pytest
+
+from plm_wallet.crypto import hashing
+from plm_wallet.crypto import ripemd160 as ripemd160_py
+
+# Test vectors from the RIPEMD-160 reference page (Bosselaers)
+RIPEMD160_VECTORS = [
+    (b"", "9c1185a5c5e9fc54612808977ee8f548b2258d31"),
+    (b"a", "0bdc9d2d256b3ee9daae347be6f4dc835a467ffe"),
+    (b"abc", "8eb208f7e05d987a9b044a8e98c6b087f15a0bfc"),
+    (b"message digest", "5d0689ef49d2fae572b881b123a85ffa21595f36"),
+    (b"abcdefghijklmnopqrstuvwxyz", "f71c27109c692c1b56bbdceb5b9d2865b3708dbc"),
+    (b"abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq",
+     "12a053384a9c0c88e405a06c27dcf49ada62eb2b"),
+    (b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789",
+     "b0e20b6e3116640286ed3a87a5713079b21f5189"),
+    (b"1234567890" * 8, "9b752e45573d4b39f4dbd3323cab82bf63326bfb"),
+]
+
+# hash160 of the compressed generator point (the pubkey of private key 1)
+G_PUBKEY = bytes.fromhex('0279be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798')
+G_HASH160 = '751e76e8199196d454941c45d1b3a323f1433bd6'
+
+openssl = pytest.mark.skipif(not hashing._openssl_ripemd160_available(),
+                             reason="hashlib has no RIPEMD-160")
+
+
+@pytest.mark.parametrize("data, digest", RIPEMD160_VECTORS)
+def test_builtin_ripemd160_vectors(data, digest):
+    assert ripemd160_py.ripemd160(data).hex() == digest
+
+
+@openssl
+@pytest.mark.parametrize("data, digest", RIPEMD160_VECTORS)
+def test_openssl_ripemd160_vectors(data, digest):
+    assert hashlib.new('ripemd160', data).hexdigest() == digest
+
+
+@openssl
+def test_builtin_ripemd160_block_boundaries():
+    # Padding spills into a second block from 56 bytes on
+    for n in (55, 56, 63, 64, 65, 119, 120, 128, 1000):
+        data = bytes(i & 0xFF for i in range(n))
+        assert ripemd160_py.ripemd160(data) == hashlib.new('ripemd160', data).digest()
+
+
+def test_hash160_generator():
+    assert hashing.hash160(G_PUBKEY).hex() == G_HASH160
+
+
+def test_hash160_batch_engines_agree():
+    items = [G_PUBKEY] + [hashlib.sha256(bytes([i])).digest() + b'\x02' for i in range(20)]
+    expected = [ripemd160_py.ripemd160(hashlib.sha256(item).digest()) for item in items]
+    assert hashing._hash160_batch_builtin(items) == expected
+    if hashing._openssl_ripemd160_available():
+        assert hashing._hash160_batch_openssl(items) == expected
+    assert hashing.hash160_batch(items) == expected
+
+
+def test_benchmark_selects_faster_implementation(monkeypatch):
+    monkeypatch.setattr(hashing, 'OPENSSL_RIPEMD160', hashing.OPENSSL_RIPEMD160)
+    timings = hashing.benchmark_hash160(50)
+    assert 'builtin' in timings
+    if 'openssl' in timings:
+        assert hashing.OPENSSL_RIPEMD160 == (timings['openssl'] <= timings['builtin'])
+    else:
+        assert hashing.OPENSSL_RIPEMD160 is False
+    assert hashing.hash160(G_PUBKEY).hex() == G_HASH160
+
+
+@pytest.mark.parametrize("key_length", [0, 1, 32, 127, 128, 129, 300])
+def test_hmac_sha512_context_matches_hmac(key_length):
+    key = bytes(range(256))[:key_length] if key_length <= 256 else b'\xab' * key_length
+    mac = hashing.HmacSha512(key)
+    for message in (b"", b"abc", b"\x00" * 37, b"m" * 500, b"abc"):
+        expected = hmac.new(key, message, hashlib.sha512).digest()
+        assert mac.digest(message) == expected
+        assert hashing.hmac_sha512(key, message) == expected
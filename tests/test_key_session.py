@@ -0,0 +1,109 @@
+"""Tests for KeySession key caching."""
+
+import pytest
+
+from plm_wallet.crypto import encryption
+from plm_wallet.crypto.encryption import KeySession, WalletEncryption
+
+FAST_KDF = {'name': 'pbkdf2-sha256', 'iterations': 1000}
+SALT = b'\x01' * 16
+KEY = b'k' * 44
+
+
+class FakeClock:
+    """Stands in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(encryption.time, 'monotonic', clock)
+    return clock
+
+
+def test_get_requires_same_file_password_salt_and_kdf(tmp_path, clock):
+    path = str(tmp_path / "w.json")
+    session = KeySession()
+    session.store(path, "pw", SALT, KEY, FAST_KDF)
+
+    assert session.get(path, "pw") == (SALT, KEY, FAST_KDF)
+    assert session.get(path, "pw", SALT, FAST_KDF) == (SALT, KEY, FAST_KDF)
+    assert session.get(path, "other") is None
+    assert session.get(path, "pw", b'\x02' * 16) is None
+    assert session.get(path, "pw", SALT, {'name': 'pbkdf2-sha256', 'iterations': 2000}) is None
+    assert session.get(str(tmp_path / "x.json"), "pw") is None
+
+
+def test_idle_keys_expire_after_ttl(tmp_path, clock):
+    path = str(tmp_path / "w.json")
+    session = KeySession(ttl=60)
+    session.store(path, "pw", SALT, KEY, FAST_KDF)
+    stored = session._entries[next(iter(session._entries))]['key']
+
+    clock.now += 50
+    assert session.get(path, "pw") is not None
+    # The lookup reset the idle timer
+    clock.now += 50
+    assert len(session) == 1
+
+    clock.now += 61
+    assert len(session) == 0
+    assert session.get(path, "pw") is None
+    assert stored == bytearray(len(KEY))
+
+
+def test_close_wipes_every_key(tmp_path, clock):
+    paths = [str(tmp_path / f"{i}.json") for i in range(3)]
+    with KeySession() as session:
+        for path in paths:
+            session.store(path, "pw", SALT, KEY, FAST_KDF)
+        stored = [entry['key'] for entry in session._entries.values()]
+        assert len(session) == 3
+    assert len(session) == 0
+    assert all(key == bytearray(len(KEY)) for key in stored)
+    assert session.get(paths[0], "pw") is None
+
+
+def test_forget_and_replace(tmp_path, clock):
+    path = str(tmp_path / "w.json")
+    session = KeySession()
+    session.store(path, "pw", SALT, KEY, FAST_KDF)
+    session.store(path, "pw", b'\x02' * 16, b'n' * 44, FAST_KDF)
+    assert session.get(path, "pw")[0] == b'\x02' * 16
+    session.forget(path)
+    assert len(session) == 0
+
+
+def test_invalid_ttl():
+    with pytest.raises(ValueError):
+        KeySession(ttl=0)
+
+
+def test_session_skips_key_derivation(tmp_path, monkeypatch):
+    path = str(tmp_path / "w.json")
+    calls = []
+    derive = WalletEncryption._derive_key
+
+    def counting(password, salt, kdf=None):
+        calls.append(kdf)
+        return derive(password, salt, kdf)
+
+    monkeypatch.setattr(WalletEncryption, '_derive_key', staticmethod(counting))
+    session = KeySession()
+    data = {'mnemonic': 'abandon'}
+
+    encrypted = WalletEncryption.encrypt_wallet(data, "pw", session, path, FAST_KDF)
+    assert WalletEncryption.decrypt_wallet(encrypted, "pw", session, path) == data
+    again = WalletEncryption.encrypt_wallet(data, "pw", session, path)
+    assert again['salt'] == encrypted['salt'] and again['kdf'] == FAST_KDF
+    assert len(calls) == 1
+
+    session.lock()
+    assert WalletEncryption.decrypt_wallet(again, "pw", session, path) == data
+    assert len(calls) == 2
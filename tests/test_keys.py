@@ -0,0 +1,63 @@
+"""Tests for extended key serialization and parsing."""
+
+import pytest
+
+from plm_wallet.core.derivation import derive_path
+from plm_wallet.core.keys import parse_extended_key
+from plm_wallet.core.seed import mnemonic_to_seed
+from plm_wallet.crypto.encoding import b58decode, base58_encode_check
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+
+# BIP84 test vectors, account m/84'/0'/0'
+ZPRV = ("zprvAdG4iTXWBoARxkkzNpNh8r6Qag3irQB8PzEMkAFeTRXxHpbF9z4QgEvBRmfvqWvGp42t42nvgGpNgYSJA9"
+        "iefm1yYNZKEm7z6qUWCroSQnE")
+ZPUB = ("zpub6rFR7y4Q2AijBEqTUquhVz398htDFrtymD9xYYfG1m4wAcvPhXNfE3EfH1r1ADqtfSdVCToUG868RvUUkg"
+        "DKf31mGDtKsAYz2oz2AGutZYs")
+
+
+def test_bip84_account_keys():
+    keys = derive_path(mnemonic_to_seed(MNEMONIC, "", False), "m/84h/0h/0h")
+    assert keys['zprv'] == ZPRV
+    assert keys['zpub'] == ZPUB
+
+
+def test_parse_zprv_round_trip():
+    node = parse_extended_key(ZPRV)
+    assert node.is_private
+    assert node.depth == 3
+    assert node.child_number == 0x80000000
+    assert node.zprv == ZPRV
+    assert node.zpub == ZPUB
+
+
+def test_parse_zpub_round_trip():
+    node = parse_extended_key(" " + ZPUB + "\n")
+    assert not node.is_private
+    assert node.zpub == ZPUB
+    assert node.pubkey == parse_extended_key(ZPRV).pubkey
+
+
+def test_parse_rejects_bad_checksum():
+    corrupted = ZPUB[:-1] + ('t' if ZPUB[-1] != 't' else 'u')
+    with pytest.raises(ValueError):
+        parse_extended_key(corrupted)
+
+
+def test_parse_rejects_bad_version_and_length():
+    raw = b58decode(ZPUB)[:-4]
+    with pytest.raises(ValueError):
+        parse_extended_key(base58_encode_check(b'\x04\x88\xb2\x1e' + raw[4:]))
+    with pytest.raises(ValueError):
+        parse_extended_key(base58_encode_check(raw[:-1]))
+
+
+def test_parse_rejects_invalid_key_data():
+    raw = b58decode(ZPRV)[:-4]
+    with pytest.raises(ValueError):
+        parse_extended_key(base58_encode_check(raw[:45] + b'\x01' + raw[46:]))
+    with pytest.raises(ValueError):
+        parse_extended_key(base58_encode_check(raw[:46] + bytes(32)))
+    pub = b58decode(ZPUB)[:-4]
+    with pytest.raises(ValueError):
+        parse_extended_key(base58_encode_check(pub[:45] + b'\x04' + pub[46:]))
@@ -0,0 +1,40 @@
+"""Tests for BIP39 and Electrum mnemonic generation."""
+
+import pytest
+
+from plm_wallet.core.mnemonic import (ELECTRUM_BATCH_CHUNK, generate_bip39, generate_electrum,
+                                      generate_electrum_batch, get_mnemo, is_electrum_segwit)
+from plm_wallet.wallet.wallet import PLMWallet
+
+
+def test_generate_bip39_is_valid():
+    for word_count in (12, 24):
+        mnemonic = generate_bip39(word_count)
+        assert len(mnemonic.split()) == word_count
+        assert get_mnemo().check(mnemonic)
+
+
+def test_generate_electrum_is_segwit():
+    mnemonic = generate_electrum(12)
+    assert len(mnemonic.split()) == 12
+    assert is_electrum_segwit(mnemonic)
+    assert is_electrum_segwit("  " + mnemonic.upper().replace(" ", "  ") + "\n")
+
+
+@pytest.mark.parametrize("count, workers", [(3, 2), (2 * ELECTRUM_BATCH_CHUNK + 5, 2), (4, 1)])
+def test_generate_electrum_batch(count, workers):
+    mnemonics = generate_electrum_batch(count, 12, workers)
+    assert len(mnemonics) == count
+    assert len(set(mnemonics)) == count
+    for mnemonic in mnemonics:
+        assert is_electrum_segwit(mnemonic)
+        wallet = PLMWallet(mnemonic, standard="electrum")
+        assert wallet.derivation_path == "m/0h"
+        assert wallet.generate_addresses(1)[0]['address'].startswith("plm1q")
+
+
+def test_invalid_word_count():
+    with pytest.raises(ValueError):
+        generate_electrum_batch(2, 13, 2)
+    with pytest.raises(ValueError):
+        generate_bip39(11)
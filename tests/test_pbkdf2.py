@@ -0,0 +1,57 @@
+"""Tests for batched PBKDF2-HMAC-SHA512."""
+
+import hashlib
+
+import pytest
+
+from plm_wallet.core.seed import mnemonic_to_seed, mnemonic_to_seed_batch
+from plm_wallet.crypto import pbkdf2
+
+# PBKDF2-HMAC-SHA512 vectors (password, salt, iterations, derived key)
+VECTORS = [
+    (b"password", b"salt", 1,
+     "867f70cf1ade02cff3752599a3a53dc4af34c7a669815ae5d513554e1c8cf252"
+     "c02d470a285a0501bad999bfe943c08f050235d7d68b1da55e63f73b60a57fce"),
+    (b"password", b"salt", 2,
+     "e1d9c16aa681708a45f5c7c4e215ceb66e011a2e9f0040713f18aefdb866d53c"
+     "f76cab2868a39b9f7840edce4fef5a82be67335c77a6068e04112754f27ccf4e"),
+    (b"password", b"salt", 4096,
+     "d197b1b33db0143e018b12f3d1d1479e6cdebdcc97c5c0f87f6902e072f457b5"
+     "143f30602641b3d55cd335988cb36b84376060ecd532e039b742a239434af2d5"),
+    (b"passwordPASSWORDpassword", b"saltSALTsaltSALTsaltSALTsaltSALTsalt", 4096,
+     "8c0511f4c6e597c6ac6315d8f0362e225f3c501495ba23b868c005174dc4ee71"
+     "115b59f9e60cd9532fa33e0f75aefe30225c583a186cd82bd4daea9724a3d3b8"),
+]
+
+# BIP39 reference vector (passphrase "TREZOR")
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+SEED = ("c55257c360c07c72029aebc1b53c05ed0362ada38ead3e3e9efa3708e5349553"
+        "1f09a6987599d18264c1e1c92f2cf141630c7a3c4ab7c81b2f001698e7463b04")
+
+
+@pytest.mark.parametrize("password, salt, iterations, derived", VECTORS)
+def test_vectors(password, salt, iterations, derived):
+    assert pbkdf2.pbkdf2_sha512_batch([password], salt, iterations)[0].hex() == derived
+
+
+def test_batch_matches_hashlib():
+    # Mixed lengths, including passwords longer than the 128-byte block
+    passwords = [bytes([i]) * n for i, n in enumerate((0, 1, 63, 64, 111, 112, 127, 128, 129, 300))]
+    salts = [b"mnemonic" + bytes([i]) * i for i in range(len(passwords))]
+    expected = [hashlib.pbkdf2_hmac('sha512', p, s, 3) for p, s in zip(passwords, salts)]
+    assert pbkdf2.pbkdf2_sha512_batch(passwords, salts, 3) == expected
+
+
+def test_bip39_seed():
+    seeds = mnemonic_to_seed_batch([MNEMONIC, MNEMONIC], "TREZOR")
+    assert [s.hex() for s in seeds] == [SEED, SEED]
+    assert mnemonic_to_seed(MNEMONIC, "TREZOR").hex() == SEED
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        pbkdf2.pbkdf2_sha512_batch([b"a"], b"salt", 0)
+    with pytest.raises(ValueError):
+        pbkdf2.pbkdf2_sha512_batch([b"a", b"b"], [b"salt"], 1)
+    assert pbkdf2.pbkdf2_sha512_batch([], b"salt", 1) == []
+
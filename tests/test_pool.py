@@ -0,0 +1,114 @@
+"""Tests for the process-pool APIs (run with two workers)."""
+
+import itertools
+import threading
+import time
+
+from plm_wallet.utils.pool import ordered_pool_map
+from plm_wallet.wallet.generator import derive_addresses_parallel, iter_addresses_parallel, vanity_search
+from plm_wallet.wallet.wallet import PLMWallet
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+
+
+class CountingTasks:
+    """Task iterable that records how many tasks the pool has taken."""
+
+    def __init__(self, tasks):
+        self.taken = 0
+        self._tasks = iter(tasks)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        task = next(self._tasks)
+        self.taken += 1
+        return task
+
+
+def test_ordered_pool_map_keeps_order():
+    tasks = [(2, k) for k in range(40)]
+    assert list(ordered_pool_map(pow, tasks, workers=2)) == [(t, 2 ** t[1]) for t in tasks]
+    assert list(ordered_pool_map(pow, [], workers=2)) == []
+
+
+def test_ordered_pool_map_takes_tasks_lazily():
+    tasks = CountingTasks((2, k) for k in itertools.count())
+    results = ordered_pool_map(pow, tasks, workers=2)
+    assert next(results) == ((2, 0), 1)
+    assert tasks.taken == 5
+    results.close()
+    assert tasks.taken == 5
+
+
+def test_close_cancels_pending_work():
+    tasks = [(0.3,)] * 20
+    start = time.perf_counter()
+    results = ordered_pool_map(time.sleep, tasks, workers=2)
+    next(results)
+    results.close()
+    # Unstarted tasks are cancelled; running ones finish (20 tasks would take 3 s)
+    assert time.perf_counter() - start < 2.0
+
+
+def test_cancel_event_stops_iteration():
+    cancel_event = threading.Event()
+    tasks = CountingTasks((2, k) for k in itertools.count())
+    seen = []
+    for task, _ in ordered_pool_map(pow, tasks, workers=2, cancel_event=cancel_event):
+        seen.append(task)
+        if len(seen) == 3:
+            cancel_event.set()
+    assert len(seen) == 3
+    assert tasks.taken <= len(seen) + 4
+
+
+def test_parallel_addresses_match_iter_addresses():
+    wallet = PLMWallet(MNEMONIC)
+    account = wallet.keys['account']
+    for chain in (0, 1):
+        expected = list(wallet.iter_addresses(chain, 5, 40))
+        assert derive_addresses_parallel(account, 5, 40, chain, wallet.derivation_path,
+                                         workers=2, chunk_size=7) == expected
+
+    watch = PLMWallet.from_zpub(wallet.keys['zpub'])
+    assert list(iter_addresses_parallel(watch.keys['account'], 0, 10, 0, wallet.derivation_path,
+                                        workers=2, chunk_size=3)) == list(watch.iter_addresses(0, 0, 10))
+
+
+def test_parallel_addresses_cancelled_before_start():
+    cancel_event = threading.Event()
+    cancel_event.set()
+    account = PLMWallet(MNEMONIC).keys['account']
+    assert derive_addresses_parallel(account, 0, 1000, workers=2, chunk_size=10,
+                                     cancel_event=cancel_event) == []
+
+
+def test_vanity_search_matches_sequential_scan():
+    wallet = PLMWallet(MNEMONIC)
+    prefix = "plm1qxy"
+    expected = next((i, record['address']) for i, record in enumerate(wallet.iter_addresses(0))
+                    if record['address'].startswith(prefix))
+    assert vanity_search(wallet.keys['account'], prefix, workers=2, chunk_size=64) == expected
+    assert vanity_search(wallet.keys['account'].neuter(), "xy", workers=2, chunk_size=100) == expected
+
+    progress = []
+    index, _ = vanity_search(wallet.keys['account'], prefix, start=expected[0] + 1, workers=2,
+                             chunk_size=64, progress=progress.append)
+    assert index > expected[0]
+    assert all(p['difficulty'] == 1024 for p in progress)
+
+
+def test_generate_many_records_reproduce_wallets():
+    done = []
+    records = list(PLMWallet.generate_many(5, workers=2, address_count=2,
+                                           progress=lambda d, n: done.append((d, n))))
+    assert len(records) == 5
+    assert len({r['mnemonic'] for r in records}) == 5
+    assert done[-1] == (5, 5)
+    for record in records:
+        wallet = PLMWallet(record['mnemonic'])
+        assert record['zprv'] == wallet.keys['zprv']
+        assert record['zpub'] == wallet.keys['zpub']
+        assert record['addresses'] == [a['address'] for a in wallet.generate_addresses(2)]
@@ -0,0 +1,116 @@
+"""Round-trip tests for mnemonic and passphrase recovery."""
+
+import json
+import threading
+
+import pytest
+
+from plm_wallet.wallet.recovery import (candidate_words, iter_mask, mask_size,
+                                        recover_mnemonic, recover_passphrase)
+from plm_wallet.wallet.wallet import PLMWallet
+
+MNEMONIC = "zoo zoo zoo zoo zoo zoo zoo zoo zoo zoo zoo wrong"
+
+
+def _first_address(mnemonic, passphrase=""):
+    return PLMWallet(mnemonic, passphrase).generate_addresses(1)[0]['address']
+
+
+def _cancel_after_first_chunk(cancel_event, seen):
+    def progress(state):
+        seen.append(state)
+        cancel_event.set()
+    return progress
+
+
+def test_candidate_words():
+    assert candidate_words("zoo") == ["zoo"]
+    assert "wrong" in candidate_words("wrnog", 2)
+    assert len(candidate_words("?")) == 2048
+    with pytest.raises(ValueError):
+        candidate_words("qqqqqqqq")
+
+
+def test_mask_enumeration():
+    assert mask_size("?d?l") == 260
+    assert list(iter_mask("a?d", 7)) == ["a7", "a8", "a9"]
+
+
+def test_recover_mnemonic_resumes_from_checkpoint(tmp_path):
+    target = _first_address(MNEMONIC)
+    words = MNEMONIC.split()[:-1] + ["?"]
+    checkpoint = str(tmp_path / "mnemonic.json")
+
+    cancel_event = threading.Event()
+    seen = []
+    assert recover_mnemonic(words, target, workers=2, chunk_size=256, checkpoint=checkpoint,
+                            progress=_cancel_after_first_chunk(cancel_event, seen),
+                            cancel_event=cancel_event) is None
+    saved = json.load(open(checkpoint))
+    assert saved['next'] == seen[-1]['tested'] > 0
+    assert "zoo" not in json.dumps(saved)
+
+    resumed = []
+    assert recover_mnemonic(words, target, workers=2, chunk_size=256, checkpoint=checkpoint,
+                            progress=resumed.append) == MNEMONIC
+    assert not resumed or resumed[0]['tested'] > saved['next']
+
+
+def test_recover_passphrase_resumes_from_checkpoint(tmp_path):
+    target = _first_address(MNEMONIC, "x97")
+    checkpoint = str(tmp_path / "passphrase.json")
+
+    cancel_event = threading.Event()
+    seen = []
+    assert recover_passphrase(MNEMONIC, target, mask="x?d?d", workers=2, chunk_size=16,
+                              checkpoint=checkpoint,
+                              progress=_cancel_after_first_chunk(cancel_event, seen),
+                              cancel_event=cancel_event) is None
+    saved = json.load(open(checkpoint))
+    assert 0 < saved['next'] < 97
+
+    assert recover_passphrase(MNEMONIC, target, mask="x?d?d", workers=2, chunk_size=16,
+                              checkpoint=checkpoint) == "x97"
+
+    # The match is not recorded, so running again finds it again
+    assert recover_passphrase(MNEMONIC, target, mask="x?d?d", workers=2, chunk_size=16,
+                              checkpoint=checkpoint) == "x97"
+
+
+def test_checkpoint_of_another_search_is_rejected(tmp_path):
+    target = _first_address(MNEMONIC, "x97")
+    checkpoint = str(tmp_path / "passphrase.json")
+    cancel_event = threading.Event()
+    cancel_event.set()
+    recover_passphrase(MNEMONIC, target, mask="x?d", workers=1, checkpoint=checkpoint,
+                       cancel_event=cancel_event)
+
+    with pytest.raises(ValueError):
+        recover_passphrase(MNEMONIC, target, mask="y?d", workers=1, checkpoint=checkpoint)
+
+
+def test_recover_passphrase_from_wordlist_with_rules():
+    target = _first_address(MNEMONIC, "Secret1")
+    assert recover_passphrase(MNEMONIC, target, wordlist=["hello", "secret"], rules=True,
+                              workers=2, chunk_size=8) == "Secret1"
+
+
+def test_mnemonic_checkpoint_depends_on_passphrase(tmp_path):
+    target = _first_address(MNEMONIC)
+    words = MNEMONIC.split()[:-1] + ["?"]
+    checkpoint = str(tmp_path / "mnemonic.json")
+    cancel_event = threading.Event()
+    cancel_event.set()
+    recover_mnemonic(words, target, workers=1, checkpoint=checkpoint, cancel_event=cancel_event)
+
+    with pytest.raises(ValueError):
+        recover_mnemonic(words, target, passphrase="other", workers=1, checkpoint=checkpoint)
+    assert "other" not in open(checkpoint).read()
+
+
+def test_recover_mnemonic_from_account_zpub():
+    wallet = PLMWallet(MNEMONIC, "x97")
+    words = MNEMONIC.split()[:-2] + ["zoo", "wronf"]
+    assert recover_mnemonic(words, wallet.keys['zpub'], passphrase="x97", workers=2) == MNEMONIC
+    other = PLMWallet("abandon " * 11 + "about", "x97").keys['zpub']
+    assert recover_mnemonic(words, other, passphrase="x97", workers=2) is None
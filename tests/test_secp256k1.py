@@ -0,0 +1,114 @@
+"""Tests for the in-tree secp256k1 engine, checked against python-ecdsa."""
+
+import random
+
+import pytest
+
+from plm_wallet.crypto import secp256k1
+from plm_wallet.crypto.secp256k1 import N
+
+ecdsa = pytest.importorskip("ecdsa")
+
+EDGE_SCALARS = [1, 2, 3, N - 1, N - 2, (N - 1) // 2, 2 ** 128, 2 ** 255,
+                secp256k1._WINDOW_HALF, secp256k1._WINDOW_HALF + 1, 2 ** 256 - 2 ** 32 - 1 - N]
+
+
+def _key(k):
+    return k.to_bytes(32, 'big')
+
+
+def _reference_pubkey(k):
+    sk = ecdsa.SigningKey.from_string(_key(k), curve=ecdsa.SECP256k1)
+    return sk.get_verifying_key().to_string("compressed")
+
+
+def _reference_tweak_add(pubkey, t):
+    point = ecdsa.VerifyingKey.from_string(pubkey, curve=ecdsa.SECP256k1).pubkey.point
+    child = point + ecdsa.SECP256k1.generator * t
+    return secp256k1.compress_point(child.x(), child.y())
+
+
+def _random_scalars(count, seed):
+    rng = random.Random(seed)
+    return [rng.randrange(1, N) for _ in range(count)]
+
+
+@pytest.mark.parametrize("k", EDGE_SCALARS + _random_scalars(24, 1))
+def test_private_to_public_matches_ecdsa(k):
+    assert secp256k1.private_to_public(_key(k)) == _reference_pubkey(k)
+
+
+def test_uncompressed_matches_ecdsa():
+    k = _random_scalars(1, 2)[0]
+    x, y = secp256k1.get_public_key_uncompressed(_key(k))
+    vk = ecdsa.SigningKey.from_string(_key(k), curve=ecdsa.SECP256k1).get_verifying_key()
+    assert x + y == vk.to_string()
+
+
+@pytest.mark.parametrize("size", [1, 2, secp256k1.AFFINE_ROUND_MIN - 1,
+                                  secp256k1.AFFINE_ROUND_MIN + 1, 37])
+def test_batch_matches_single(size):
+    scalars = (EDGE_SCALARS + _random_scalars(size, size))[:size]
+    keys = [_key(k) for k in scalars]
+    assert secp256k1.private_to_public_batch(keys) == [secp256k1.private_to_public(k) for k in keys]
+    assert secp256k1.private_to_public_batch(keys) == [_reference_pubkey(k) for k in scalars]
+
+
+def test_batch_empty_and_invalid_keys():
+    assert secp256k1.private_to_public_batch([]) == []
+    for key in (_key(0), _key(N), b'\x01' * 31):
+        with pytest.raises(ValueError):
+            secp256k1.private_to_public(key)
+
+
+def test_tweak_add_matches_ecdsa():
+    parent_k = _random_scalars(1, 3)[0]
+    parent = _reference_pubkey(parent_k)
+    # parent_k itself makes the sum a doubling; 0 leaves the key unchanged
+    tweaks = [0, 1, N - 1, parent_k] + _random_scalars(20, 4)
+    expected = [parent if t == 0 else _reference_tweak_add(parent, t) for t in tweaks]
+    assert secp256k1.pubkey_tweak_add_batch(parent, [_key(t) for t in tweaks]) == expected
+    assert [secp256k1.pubkey_tweak_add(parent, _key(t)) for t in tweaks] == expected
+
+
+def test_tweak_add_infinity_and_range():
+    k = _random_scalars(1, 5)[0]
+    pubkey = _reference_pubkey(k)
+    with pytest.raises(ValueError, match="infinity"):
+        secp256k1.pubkey_tweak_add(pubkey, _key(N - k))
+    with pytest.raises(ValueError):
+        secp256k1.pubkey_tweak_add(pubkey, _key(N))
+
+
+def test_point_add_batch_matches_ecdsa():
+    base = _random_scalars(1, 6)[0]
+    others = _random_scalars(5, 7) + [base]
+    x, y = secp256k1.decompress_pubkey(_reference_pubkey(base))
+    points = [secp256k1.decompress_pubkey(_reference_pubkey(k)) for k in others]
+    expected = [_reference_pubkey((base + k) % N) for k in others]
+    assert secp256k1.point_add_batch(x, y, points) == expected
+
+
+def test_decompress_rejects_invalid_points():
+    assert secp256k1.decompress_pubkey(_reference_pubkey(1)) == (secp256k1.GX, secp256k1.GY)
+    with pytest.raises(ValueError):
+        secp256k1.decompress_pubkey(b'\x04' + bytes(32))
+    with pytest.raises(ValueError):
+        secp256k1.decompress_pubkey(b'\x02' + secp256k1.P.to_bytes(32, 'big'))
+    # x = 5 has no y on the curve (5^3 + 7 is not a square mod p)
+    with pytest.raises(ValueError):
+        secp256k1.decompress_pubkey(b'\x02' + _key(5))
+
+
+def test_install_generator_table_rejects_wrong_table():
+    table = secp256k1.generator_table()
+    with pytest.raises(ValueError):
+        secp256k1.install_generator_table(table[:-1])
+    with pytest.raises(ValueError):
+        secp256k1.install_generator_table([row[:-1] for row in table])
+    with pytest.raises(ValueError):
+        secp256k1.install_generator_table([row[::-1] for row in table])
+    assert secp256k1.generator_table() is table
+
+    secp256k1.install_generator_table(table)
+    assert secp256k1.private_to_public(_key(2)) == _reference_pubkey(2)
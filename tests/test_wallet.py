@@ -0,0 +1,42 @@
+"""Tests for PLMWallet construction from mnemonics and account keys."""
+
+from plm_wallet.core.derivation import derive_child_node
+from plm_wallet.core.keys import ExtendedKey, parse_extended_key
+from plm_wallet.wallet.wallet import PLMWallet
+
+from test_keys import ZPRV, ZPUB
+
+
+def test_parse_keeps_serialization():
+    zpub = parse_extended_key(ZPUB)
+    assert zpub._zpub == ZPUB and zpub._zprv is None
+    zprv = parse_extended_key(ZPRV)
+    assert zprv._zprv == ZPRV and zprv._zpub is None
+    assert zprv.neuter().zpub == ZPUB
+
+
+def test_from_zpub_account_segment_from_child_number():
+    wallet = PLMWallet.from_zpub(ZPUB)
+    assert wallet.watch_only
+    assert wallet.passphrase is None
+    assert wallet.derivation_path == "m/84h/746h/0h"
+    assert wallet.keys['zpub'] == ZPUB
+
+
+def test_from_extended_key_keeps_unhardened_account():
+    node = parse_extended_key(ZPUB)
+    account = ExtendedKey(node.key, node.chain_code, 3, node.parent_fingerprint, 5)
+    wallet = PLMWallet.from_extended_key(account)
+    assert wallet.derivation_path == "m/84h/746h/5"
+    assert wallet.keys['account'].child_number == 5
+    expected = derive_child_node(derive_child_node(account, 0), 1)
+    assert wallet.derive_node("m/84h/746h/5/0/1").pubkey == expected.pubkey
+
+
+def test_mnemonic_wallet_cache_starts_with_account_path():
+    wallet = PLMWallet("abandon " * 11 + "about")
+    assert wallet.node_cache.stats() == {'hits': 0, 'misses': 3, 'size': 3}
+    assert wallet.derive_node(wallet.derivation_path) is wallet.keys['account']
+    wallet.derive_node(wallet.derivation_path + "/0/0")
+    assert wallet.node_cache.stats()['misses'] == 5
+    assert 'cache' not in wallet.keys